@@ -0,0 +1,131 @@
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from utils.topology_graph import TopologyGraph
+from utils.logger import get_logger
+
+log = get_logger('devices')
+
+
+def _connection_key(connection):
+    """Return the graph key of a connection, or of the connection ID some managers emit."""
+    if isinstance(connection, str):
+        return connection
+    return getattr(connection, 'id', None) or id(connection)
+
+
+class AnalyticsController(QObject):
+    """Keeps a TopologyGraph in sync with the device and connection managers.
+
+    Device and connection signals update the graph one element at a time;
+    graph queries are cached until the next change. Loading a file adds
+    items without signals, so the graph is rebuilt after loading.
+    """
+
+    # Emitted after the graph changed
+    graph_changed = pyqtSignal()
+
+    def __init__(self, device_manager, connection_manager, parent=None):
+        """Initialize the controller and build the graph of the current topology.
+
+        Args:
+            device_manager: DeviceManager whose devices are the nodes
+            connection_manager: ConnectionManager whose connections are the edges
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.device_manager = device_manager
+        self.connection_manager = connection_manager
+        self.graph = TopologyGraph()
+        self._connections = {}  # graph edge key -> connection
+
+        if hasattr(device_manager, 'device_added'):
+            device_manager.device_added.connect(self._on_device_added)
+        if hasattr(device_manager, 'device_removed'):
+            device_manager.device_removed.connect(self._on_device_removed)
+        if hasattr(connection_manager, 'connection_created'):
+            connection_manager.connection_created.connect(self._on_connection_created)
+        if hasattr(connection_manager, 'connection_removed'):
+            connection_manager.connection_removed.connect(self._on_connection_removed)
+
+        self.rebuild()
+
+    def rebuild(self):
+        """Rebuild the graph from the managers, e.g. after loading a file."""
+        self.graph.clear()
+        self._connections.clear()
+        devices = list(self.device_manager.devices.values())
+        for device in devices:
+            self.graph.add_node(device.id)
+
+        connections = getattr(self.connection_manager, 'connections', None) or ()
+        if isinstance(connections, dict):
+            connections = connections.values()
+        for connection in list(connections) + [c for device in devices for c in getattr(device, 'connections', ())]:
+            self._add_connection(connection)
+
+        log.info("Topology graph rebuilt: %d devices, %d connections",
+                 self.graph.node_count, self.graph.edge_count)
+        self.graph_changed.emit()
+
+    def _add_connection(self, connection):
+        source = getattr(connection, 'source_device', None)
+        target = getattr(connection, 'target_device', None)
+        if source is None or target is None:
+            return False
+        key = _connection_key(connection)
+        self.graph.add_edge(key, source.id, target.id)
+        self._connections[key] = connection
+        return True
+
+    def _on_device_added(self, device):
+        self.graph.add_node(device.id)
+        for connection in getattr(device, 'connections', ()):
+            self._add_connection(connection)
+        self.graph_changed.emit()
+
+    def _on_device_removed(self, device):
+        self.graph.remove_node(device.id)
+        for connection in getattr(device, 'connections', ()):
+            self._connections.pop(_connection_key(connection), None)
+        self.graph_changed.emit()
+
+    def _on_connection_created(self, connection):
+        if self._add_connection(connection):
+            self.graph_changed.emit()
+
+    def _on_connection_removed(self, connection):
+        key = _connection_key(connection)
+        self.graph.remove_edge(key)
+        self._connections.pop(key, None)
+        self.graph_changed.emit()
+
+    def shortest_path(self, source, target):
+        """Return the devices on a shortest path between two devices, or None."""
+        path = self.graph.shortest_path(source.id, target.id)
+        if path is None:
+            return None
+        devices = self.device_manager.devices
+        return [devices[device_id] for device_id in path if device_id in devices]
+
+    def single_points_of_failure(self):
+        """Return (articulation point devices, bridge connections).
+
+        Computed once per change of the graph.
+        """
+        devices = self.device_manager.devices
+        points = [devices[device_id] for device_id in self.graph.articulation_points() if device_id in devices]
+        bridges = [self._connections[key] for key in self.graph.bridges() if key in self._connections]
+        return points, bridges
+
+    def summary(self):
+        """Return a dict of topology statistics."""
+        graph = self.graph
+        components = graph.components()
+        return {
+            'devices': graph.node_count,
+            'connections': graph.edge_count,
+            'components': len(components),
+            'largest_component': len(components[0]) if components else 0,
+            'degree': graph.degree_stats(),
+            'diameter': graph.diameter(),
+        }
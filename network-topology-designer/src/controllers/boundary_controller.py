@@ -1,8 +1,10 @@
 from PyQt5.QtWidgets import QGraphicsRectItem, QGraphicsTextItem, QDialog
-from PyQt5.QtCore import QObject, QRectF, Qt
+from PyQt5.QtCore import QObject, QRectF, Qt, pyqtSignal
 from PyQt5.QtGui import QPen, QBrush, QColor
 from utils.debug_log import debug
-from models.device import Device
+from models.device import Device, is_device
+from models.boundary_hierarchy import BoundaryHierarchy
+from views.boundary_proxy_item import BoundaryProxyItem, BundledEdgeItem
 import uuid
 
 # Import BoundaryItem - adjust the path if needed
@@ -23,9 +25,26 @@ class BoundaryDialog(QDialog):
             "color": QColor(200, 200, 255, 100)
         }
 
+class _CollapsedBoundary:
+    """Everything taken out of the scene when a boundary was collapsed."""
+    
+    def __init__(self, boundary, proxy, boundaries, devices, connections, positions):
+        self.boundary = boundary
+        self.proxy = proxy
+        self.boundaries = boundaries      # The boundary and its nested boundaries
+        self.devices = devices
+        self.connections = connections    # Connections with at least one hidden end
+        self.positions = positions        # Item -> position when collapsed
+        self.proxy_origin = proxy.pos()
+        self.edges = []
+
+
 class BoundaryController(QObject):
     """Controller for creating and managing boundary regions."""
     
+    # Emitted with (device, boundary or None) when a device enters another innermost zone
+    device_zone_changed = pyqtSignal(object, object)
+    
     def __init__(self, parent=None, scene=None, view=None):
         """Initialize the boundary controller."""
         super().__init__()
@@ -36,6 +55,24 @@ class BoundaryController(QObject):
         self.start_point = None
         self.temp_boundary = None
         self.boundaries = {}  # Dictionary of boundaries by ID
+        
+        # Cached membership: boundary ID -> (scene rect, member list, member set)
+        self._membership = {}
+        
+        # Nested boundaries and each device's innermost zone
+        self.hierarchy = BoundaryHierarchy()
+        self._devices = {}  # Devices seen in the scene by ID
+        self._batch_depth = 0
+        
+        # Dragging a boundary moves its members (and nested boundaries) along
+        self.move_members_with_boundary = True
+        
+        # Collapsed boundaries by ID, and bundled edges by the item they end at
+        self._collapsed = {}
+        self._edges_by_endpoint = {}
+        
+        self._watched_scene = None
+        self._watch_scene(scene)
         debug("BoundaryController initialized")
     
     def set_scene_and_view(self, scene, view):
@@ -43,6 +80,191 @@ class BoundaryController(QObject):
         debug("BoundaryController: setting scene and view")
         self.scene = scene
         self.view = view
+        self._watch_scene(scene)
+    
+    def _watch_scene(self, scene):
+        """Invalidate cached membership when items in the scene move or resize."""
+        if scene is self._watched_scene:
+            return
+        if self._watched_scene is not None and hasattr(self._watched_scene, 'geometry_changed'):
+            self._watched_scene.geometry_changed.disconnect(self._on_geometry_changed)
+        self._watched_scene = scene
+        self._membership.clear()
+        self.hierarchy = BoundaryHierarchy()
+        self._devices = {}
+        self._collapsed = {}
+        self._edges_by_endpoint = {}
+        if scene is not None and hasattr(scene, 'geometry_changed'):
+            scene.geometry_changed.connect(self._on_geometry_changed)
+    
+    def _on_geometry_changed(self, item):
+        """Update zones and cached membership after an item was added, removed, moved or resized."""
+        if self._batch_depth:
+            # Batched moves update the hierarchy themselves
+            return
+        
+        if isinstance(item, BoundaryItem):
+            self._membership.pop(item.id, None)
+            self._update_boundary_zone(item)
+            return
+        
+        if not is_device(item):
+            return
+        
+        # Position the hierarchy last saw, before this change
+        old_pos = self.hierarchy.device_positions.get(item.id)
+        
+        self._update_device_zone(item)
+        for edge in self._edges_by_endpoint.get(item, ()):
+            edge.update_position()
+        
+        if not self._membership:
+            return
+        
+        # Only boundaries overlapping the item's old or new rect are affected;
+        # they are found through the hierarchy's grid, not by scanning the cache
+        rect = self._rect_tuple(item.sceneBoundingRect())
+        rects = [rect]
+        if old_pos is not None:
+            pos = item.scenePos()
+            dx, dy = old_pos[0] - pos.x(), old_pos[1] - pos.y()
+            if dx or dy:
+                rects.append((rect[0] + dx, rect[1] + dy, rect[2] + dx, rect[3] + dy))
+        for rect in rects:
+            for boundary_id in self.hierarchy.boundaries_overlapping(rect):
+                self._membership.pop(boundary_id, None)
+    
+    def invalidate_membership(self, boundary=None):
+        """Drop cached membership of one boundary, or of all boundaries."""
+        if boundary is None:
+            self._membership.clear()
+        else:
+            self._membership.pop(boundary.id, None)
+    
+    def register_boundary(self, boundary):
+        """Track a boundary that was added to the scene."""
+        self.boundaries[boundary.id] = boundary
+        self._membership.pop(boundary.id, None)
+        self.hierarchy.add_boundary(boundary.id, self._rect_tuple(boundary.scene_rect()))
+    
+    @staticmethod
+    def _rect_tuple(rect):
+        return (rect.left(), rect.top(), rect.right(), rect.bottom())
+    
+    def _update_device_zone(self, device):
+        """Keep the device's innermost zone up to date."""
+        if device.scene() is None:
+            self._devices.pop(device.id, None)
+            self.hierarchy.remove_device(device.id)
+            return
+        
+        self._devices[device.id] = device
+        pos = device.scenePos()
+        change = self.hierarchy.move_device(device.id, pos.x(), pos.y())
+        if change:
+            self.device_zone_changed.emit(device, self.boundaries.get(change[1]))
+    
+    def _update_boundary_zone(self, boundary):
+        """Follow a boundary that was removed, resized or dragged."""
+        if boundary.id not in self.boundaries:
+            return
+        if boundary.scene() is None:
+            self.hierarchy.remove_boundary(boundary.id)
+            return
+        
+        old = self.hierarchy.rects.get(boundary.id)
+        new = self._rect_tuple(boundary.scene_rect())
+        if old is None or old == new:
+            self.hierarchy.update_boundary(boundary.id, new)
+            return
+        
+        dx, dy = new[0] - old[0], new[1] - old[1]
+        same_size = abs((new[2] - new[0]) - (old[2] - old[0])) < 1e-6 and \
+            abs((new[3] - new[1]) - (old[3] - old[1])) < 1e-6
+        if not same_size or not self.move_members_with_boundary:
+            self.hierarchy.update_boundary(boundary.id, new)
+            return
+        
+        # A selected ancestor is being dragged too and moves this boundary's group
+        parent_id = self.hierarchy.parent.get(boundary.id)
+        while parent_id is not None:
+            parent = self.boundaries.get(parent_id)
+            if parent is not None and parent.isSelected():
+                return
+            parent_id = self.hierarchy.parent.get(parent_id)
+        
+        # The boundary itself (and any selected member) was already moved by the drag
+        self._apply_group_move(boundary, dx, dy, skip_selected=True)
+    
+    def zone_of_device(self, device):
+        """Return the innermost boundary containing a device, or None."""
+        return self.boundaries.get(self.hierarchy.zone_of(device.id))
+    
+    def move_boundary(self, boundary, dx, dy):
+        """Move a boundary with its nested boundaries and member devices in one batch."""
+        self._apply_group_move(boundary, dx, dy, skip_selected=False, move_boundary=True)
+    
+    def _apply_group_move(self, boundary, dx, dy, skip_selected, move_boundary=False):
+        boundary_ids, device_ids = self.hierarchy.move_boundary(boundary.id, dx, dy)
+        
+        self._batch_depth += 1
+        try:
+            for boundary_id in boundary_ids:
+                item = self.boundaries.get(boundary_id)
+                if item is None or (item is boundary and not move_boundary):
+                    continue
+                if skip_selected and item.isSelected():
+                    continue
+                item.moveBy(dx, dy)
+            for device_id in device_ids:
+                device = self._devices.get(device_id)
+                if device is None or (skip_selected and device.isSelected()):
+                    continue
+                device.moveBy(dx, dy)
+        finally:
+            self._batch_depth -= 1
+        
+        # Cached containment results around the group are stale now
+        self._membership.clear()
+    
+    def apply_layout(self, device_manager, device_moves, boundary_rects):
+        """Move devices and move/resize boundaries in one batch, then rebuild the zones.
+        
+        Args:
+            device_manager: DeviceManager that moves the devices
+            device_moves (list): (device, QPointF) pairs
+            boundary_rects (list): (boundary, QRectF in scene coordinates) pairs
+        """
+        self._batch_depth += 1
+        try:
+            for boundary, rect in boundary_rects:
+                # Keep the item-coordinate origin; only size and position change
+                boundary.set_rect(QRectF(boundary.rect.topLeft(), rect.size()))
+                boundary.setPos(rect.topLeft() - boundary.rect.topLeft())
+            device_manager.move_devices(device_moves)
+        finally:
+            self._batch_depth -= 1
+        self.rebuild_hierarchy()
+    
+    def rebuild_hierarchy(self):
+        """Recompute nesting and device zones from the current item positions."""
+        old = self.hierarchy
+        hierarchy = BoundaryHierarchy()
+        for boundary_id, rect in old.rects.items():
+            boundary = self.boundaries.get(boundary_id)
+            hierarchy.add_boundary(boundary_id, self._rect_tuple(boundary.scene_rect()) if boundary else rect)
+        for device_id in old.device_positions:
+            device = self._devices.get(device_id)
+            if device is not None:
+                pos = device.scenePos()
+                hierarchy.move_device(device_id, pos.x(), pos.y())
+        self.hierarchy = hierarchy
+        self._membership.clear()
+        
+        for device_id, device in self._devices.items():
+            zone = hierarchy.zone_of(device_id)
+            if zone != old.zone_of(device_id):
+                self.device_zone_changed.emit(device, self.boundaries.get(zone))
     
     def activate(self):
         """Activate boundary drawing mode."""
@@ -166,7 +388,7 @@ class BoundaryController(QObject):
                     print("WARNING: No scene available to add boundary")
                 
                 # Add to collection
-                self.boundaries[boundary.id] = boundary
+                self.register_boundary(boundary)
                 return boundary
             
             return None
@@ -177,11 +399,187 @@ class BoundaryController(QObject):
             return None
 
     def get_devices_in_boundary(self, boundary):
-        devices = []
-        for item in self.scene.items():
-            if isinstance(item, Device) and boundary.contains(item.sceneBoundingRect()):
-                devices.append(item)
-        return devices
+        """Get the devices inside a boundary, from the membership cache when valid."""
+        collapsed = self._collapsed.get(boundary.id)
+        if collapsed is not None:
+            return list(collapsed.devices)
+        
+        entry = self._membership.get(boundary.id)
+        if entry is None:
+            devices = boundary.get_contained_items(self.scene, is_device)
+            entry = (boundary.scene_rect(), devices, set(devices))
+            self._membership[boundary.id] = entry
+        return list(entry[1])
+    
+    def get_membership(self):
+        """Return a dict mapping every boundary ID to the devices inside it."""
+        return {boundary_id: self.get_devices_in_boundary(boundary)
+                for boundary_id, boundary in self.boundaries.items()}
 
     def get_routers_in_boundary(self, boundary):
-        return [d for d in self.get_devices_in_boundary(boundary) if d.device_type == Device.ROUTER]
\ No newline at end of file
+        return [d for d in self.get_devices_in_boundary(boundary) if d.device_type == Device.ROUTER]
+    
+    # --- Collapsing -------------------------------------------------------
+    
+    def is_collapsed(self, boundary):
+        """Return True if the boundary is currently shown as a proxy node."""
+        return boundary.id in self._collapsed
+    
+    def collapse_boundary(self, boundary):
+        """Replace a boundary and everything inside it with a single proxy node.
+        
+        Member devices, nested boundaries and their connections are removed
+        from the scene (and with that from its index), so they cost nothing
+        to render or hit-test. Links to the outside are drawn as one bundled
+        edge per neighbouring node.
+        """
+        if not self.scene or boundary.id in self._collapsed or boundary.id not in self.boundaries:
+            return None
+        if boundary.scene() is not self.scene:
+            # Already hidden inside a collapsed outer boundary
+            return None
+        
+        # Nested collapsed boundaries are folded into this one
+        for child_id in self.hierarchy.descendants(boundary.id):
+            child = self.boundaries.get(child_id)
+            if child is not None and child.id in self._collapsed:
+                self.expand_boundary(child)
+        
+        boundaries = [boundary] + [self.boundaries[child_id]
+                                   for child_id in self.hierarchy.descendants(boundary.id)
+                                   if child_id in self.boundaries]
+        devices = [self._devices[device_id] for device_id in self.hierarchy.devices_in(boundary.id)
+                   if device_id in self._devices]
+        connections = []
+        seen = set()
+        for device in devices:
+            for connection in getattr(device, 'connections', ()):
+                if connection is not None and id(connection) not in seen:
+                    seen.add(id(connection))
+                    connections.append(connection)
+        
+        positions = {item: item.pos() for item in boundaries + devices}
+        
+        proxy = BoundaryProxyItem(boundary, len(devices), on_expand=self.expand_boundary)
+        proxy.setPos(boundary.scene_rect().center())
+        
+        self._batch_depth += 1
+        try:
+            for connection in connections:
+                if connection.scene() is self.scene:
+                    self.scene.removeItem(connection)
+            for item in devices + boundaries:
+                if item.scene() is self.scene:
+                    self.scene.removeItem(item)
+            self.scene.addItem(proxy)
+        finally:
+            self._batch_depth -= 1
+        
+        self._collapsed[boundary.id] = _CollapsedBoundary(
+            boundary, proxy, boundaries, devices, connections, positions)
+        self._membership.clear()
+        self._rebuild_bundled_edges()
+        return proxy
+    
+    def expand_boundary(self, boundary):
+        """Restore a collapsed boundary and its contents from the cached layout."""
+        collapsed = self._collapsed.pop(boundary.id, None)
+        if collapsed is None or not self.scene:
+            return False
+        
+        # The proxy may have been dragged; the contents follow it
+        delta = collapsed.proxy.pos() - collapsed.proxy_origin
+        
+        self._batch_depth += 1
+        try:
+            self._remove_edges(collapsed)
+            self.scene.removeItem(collapsed.proxy)
+            for item in collapsed.boundaries + collapsed.devices:
+                item.setPos(collapsed.positions[item] + delta)
+                self.scene.addItem(item)
+            for connection in collapsed.connections:
+                # Connections into another collapsed boundary stay hidden
+                if connection.scene() is None and self._endpoints_visible(connection):
+                    self.scene.addItem(connection)
+                    self._refresh_connection(connection)
+                elif connection.scene() is self.scene and (delta.x() or delta.y()):
+                    self._refresh_connection(connection)
+        finally:
+            self._batch_depth -= 1
+        
+        if delta.x() or delta.y():
+            self.hierarchy.move_boundary(boundary.id, delta.x(), delta.y())
+        self._membership.clear()
+        self._rebuild_bundled_edges()
+        return True
+    
+    def _endpoints_visible(self, connection):
+        source = getattr(connection, 'source_device', None)
+        target = getattr(connection, 'target_device', None)
+        return (source is not None and source.scene() is self.scene
+                and target is not None and target.scene() is self.scene)
+    
+    @staticmethod
+    def _refresh_connection(connection):
+        if hasattr(connection, 'update_path'):
+            connection.update_path()
+        elif hasattr(connection, 'update_position'):
+            connection.update_position()
+    
+    def _visible_node(self, device):
+        """Return the item currently representing a device: itself or a proxy."""
+        if device.scene() is self.scene:
+            return device
+        for collapsed in self._collapsed.values():
+            if device in collapsed.positions:
+                return collapsed.proxy
+        return None
+    
+    def _remove_edges(self, collapsed):
+        for edge in collapsed.edges:
+            if edge.scene() is self.scene:
+                self.scene.removeItem(edge)
+        collapsed.edges = []
+    
+    def _rebuild_bundled_edges(self):
+        """Recreate the bundled edges of all collapsed boundaries."""
+        self._edges_by_endpoint = {}
+        drawn = set()
+        
+        self._batch_depth += 1
+        try:
+            for collapsed in self._collapsed.values():
+                self._remove_edges(collapsed)
+                collapsed.proxy.edges = []
+            
+            for collapsed in self._collapsed.values():
+                # Count hidden links per visible neighbour
+                bundles = {}
+                for connection in collapsed.connections:
+                    ends = [self._visible_node(getattr(connection, name, None))
+                            for name in ('source_device', 'target_device')
+                            if getattr(connection, name, None) is not None]
+                    if len(ends) != 2 or None in ends:
+                        continue
+                    if collapsed.proxy not in ends or ends[0] is ends[1]:
+                        continue
+                    other = ends[1] if ends[0] is collapsed.proxy else ends[0]
+                    bundles[other] = bundles.get(other, 0) + 1
+                
+                for other, count in bundles.items():
+                    # Links between two proxies are drawn once
+                    key = frozenset((id(collapsed.proxy), id(other)))
+                    if key in drawn:
+                        continue
+                    drawn.add(key)
+                    
+                    edge = BundledEdgeItem(collapsed.proxy, other, count)
+                    self.scene.addItem(edge)
+                    collapsed.edges.append(edge)
+                    collapsed.proxy.edges.append(edge)
+                    if isinstance(other, BoundaryProxyItem):
+                        other.edges.append(edge)
+                    else:
+                        self._edges_by_endpoint.setdefault(other, []).append(edge)
+        finally:
+            self._batch_depth -= 1
@@ -1,13 +1,17 @@
 from PyQt5.QtCore import QObject, QPointF, Qt, pyqtSignal
-from PyQt5.QtGui import QPen, QColor, QPainterPath, QBrush
-from utils.path_routers import OrthogonalRouter, ManhattanRouter
+from PyQt5.QtGui import QPen, QColor, QPainterPath
 import math
-from PyQt5.QtWidgets import QGraphicsPathItem, QGraphicsLineItem, QGraphicsEllipseItem
+from PyQt5.QtWidgets import QGraphicsPathItem, QGraphicsLineItem
 from PyQt5.QtCore import Qt, QPointF
 from models.connection import Connection
 from models.device import Device
 import uuid
 
+from utils.perf_counters import perf
+from utils.logger import get_logger
+
+log = get_logger('connections')
+
 class Connection(QGraphicsPathItem):
     """A connection between two devices."""
     
@@ -36,6 +40,7 @@ class Connection(QGraphicsPathItem):
         self.source_device.position_changed.connect(self.update_path)
         self.target_device.position_changed.connect(self.update_path)
         
+    @perf.timed('connection.update_path')
     def update_path(self):
         """Update the connection path based on device positions."""
         try:
@@ -163,6 +168,7 @@ class ConnectionItem(QGraphicsPathItem):
         # Create the path
         self.update_path()
     
+    @perf.timed('connection.update_path')
     def update_path(self):
         """Update the connection path based on device positions."""
         if not self.source_device or not self.target_device:
@@ -257,7 +263,7 @@ class ConnectionManager(QObject):
         super().__init__()
         
         self.scene = scene
-        self.connections = []
+        self.connections = {}  # connection ID -> connection
         self.source_device = None  # Used during connection creation
     
     def start_connection(self, device):
@@ -313,7 +319,7 @@ class ConnectionManager(QObject):
     
     def get_connection_at(self, scene_pos, tolerance=5.0):
         """Find a connection at the given scene position."""
-        for connection in self.connections:
+        for connection in self.connections.values():
             line = connection.line_item
             if line and line.contains(line.mapFromScene(scene_pos)):
                 return connection
@@ -326,15 +332,16 @@ class ConnectionManager(QObject):
     
     def clear(self):
         """Remove all connections."""
-        # Make a copy of the list since we'll be modifying it during iteration
-        connections_copy = list(self.connections)
-        for connection in connections_copy:
-            self.remove_connection(connection)
+        # Copy the IDs since we'll be modifying the dict during iteration
+        for connection_id in list(self.connections):
+            self.remove_connection(connection_id)
     
     def register_connection(self, connection):
         """Register a connection with the manager."""
-        if not isinstance(connection, ConnectionItem):
-            print("Error: Connection must be a ConnectionItem instance")
+        # The connection tool has its own ConnectionItem class, so accept
+        # anything that links two devices
+        if getattr(connection, 'source_device', None) is None or getattr(connection, 'target_device', None) is None:
+            log.error("Connection must link a source and a target device")
             return False
         
         # Add to dictionary
@@ -343,7 +350,7 @@ class ConnectionManager(QObject):
         # Emit signal
         self.connection_created.emit(connection)
         
-        print(f"Connection registered: {connection.id}")
+        log.debug("Connection registered: %s", connection.id)
         return True
     
     def create_connection(self, source_device, source_port, target_device, target_port, connection_type="ethernet"):
@@ -758,22 +765,15 @@ class ConnectionManager(QObject):
             # Remove any existing indicators
             self.clear_port_indicators()
             
-            # Create indicators for all devices in the scene
+            # Each device draws all of its port indicators in a single item
             for item in self.scene.items():
                 if isinstance(item, Device):
                     # Don't show indicators for the source device
                     if item == self.source_device:
                         continue
-                        
-                    # Add indicators for each port
-                    for port in item.ports:
-                        if not port.get('connected', False):  # Only show unconnected ports
-                            pos = item.get_port_position(port['name'])
-                            indicator = QGraphicsEllipseItem(pos.x() - 4, pos.y() - 4, 8, 8)
-                            indicator.setPen(QPen(Qt.black, 1))
-                            indicator.setBrush(QBrush(QColor(100, 200, 100)))
-                            self.scene.addItem(indicator)
-                            self.port_indicators.append(indicator)
+                    
+                    item.set_port_indicators_visible(True)
+                    self.port_indicators.append(item)
                             
         except Exception as e:
             print(f"Error showing port indicators: {e}")
@@ -781,9 +781,8 @@ class ConnectionManager(QObject):
     def clear_port_indicators(self):
         """Remove all port indicators."""
         try:
-            if self.scene:
-                for indicator in self.port_indicators:
-                    self.scene.removeItem(indicator)
+            for device in getattr(self, 'port_indicators', []):
+                device.set_port_indicators_visible(False)
             self.port_indicators = []
             
         except Exception as e:
@@ -937,8 +936,7 @@ class ConnectionManager(QObject):
     
     def add_connection(self, connection):
         """Add a connection to the manager."""
-        if connection not in self.connections:
-            self.connections.append(connection)
+        self.connections[connection.id] = connection
         return connection
     
     def start_connection(self, device, port=None):
@@ -985,24 +983,24 @@ class ConnectionManager(QObject):
     
     def update_all_connections(self):
         """Update all connections (useful after device moves)."""
-        for connection in self.connections:
+        for connection in self.connections.values():
             connection.update_path()
     
     def update_connections(self):
         """Update all connection paths."""
-        for connection in self.connections:
+        for connection in self.connections.values():
             if hasattr(connection, 'update_path'):
                 connection.update_path()
     
     def get_device_connections(self, device):
         """Get all connections associated with a device."""
-        return [conn for conn in self.connections 
+        return [conn for conn in self.connections.values() 
                 if conn.source_device == device or conn.target_device == device]
     
     def clear_all_connections(self):
         """Remove all connections from the scene."""
-        for connection in list(self.connections):
-            self.remove_connection(connection)
+        for connection_id in list(self.connections):
+            self.remove_connection(connection_id)
             
     def get_advanced_path(self, source_device, target_device):
         """Calculate an aesthetically pleasing path between devices."""
@@ -1036,6 +1034,9 @@ class ConnectionManager(QObject):
     
     def set_router_type(self, router_type):
         """Change the routing strategy for new connections."""
+        # Routers are only needed once a routing strategy is chosen
+        from utils.path_routers import OrthogonalRouter, ManhattanRouter
+        
         if router_type == "orthogonal":
             self.router = OrthogonalRouter()
         elif router_type == "manhattan":
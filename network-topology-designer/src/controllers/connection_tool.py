@@ -1,6 +1,6 @@
 from PyQt5.QtCore import QObject, QPointF, Qt
 from PyQt5.QtGui import QPen, QColor, QPainterPath
-from PyQt5.QtWidgets import QGraphicsLineItem, QGraphicsPathItem, QGraphicsEllipseItem
+from PyQt5.QtWidgets import QGraphicsLineItem, QGraphicsPathItem
 
 # Import our consolidated Device class
 try:
@@ -10,6 +10,12 @@ except ImportError:
     from ..models.device import Device
 import uuid
 
+from utils.perf_counters import perf
+from utils.logger import get_logger
+from views.port_indicator_item import PortIndicatorOverlay
+
+log = get_logger('connections')
+
 class ConnectionItem(QGraphicsPathItem):
     """A visual connection between two devices."""
     
@@ -41,12 +47,18 @@ class ConnectionItem(QGraphicsPathItem):
         # Update the path
         self.update_path()
         
-        # Connect to device position changed signals
-        if hasattr(source_device, "position_changed"):
+        # Connect to device position changed signals (grouped devices are
+        # not QObjects; they call update_position() when they move instead)
+        if isinstance(source_device, QObject):
             self.source_device.position_changed.connect(self.update_path)
-        if hasattr(target_device, "position_changed"):
+        if isinstance(target_device, QObject):
             self.target_device.position_changed.connect(self.update_path)
     
+    def update_position(self):
+        """Update the path after one of the devices moved."""
+        self.update_path()
+    
+    @perf.timed('connection.update_path')
     def update_path(self):
         """Update the connection path based on current device positions."""
         try:
@@ -122,8 +134,8 @@ class ConnectionCreationTool(QObject):
         self.dragging = False
         self.start_point = None
         
-        # Port indicators for visual feedback
-        self.port_indicators = []
+        # Port indicators for visual feedback, drawn only near the cursor
+        self.port_overlay = None
     
     def handle_press(self, event, scene_pos):
         """Handle mouse press events for connection creation."""
@@ -159,10 +171,10 @@ class ConnectionCreationTool(QObject):
                 self.temp_line.setPen(QPen(QColor(0, 120, 215), 2, Qt.DashLine))
                 self.scene.addItem(self.temp_line)
                 
-                # Show port indicators on other devices
-                self.show_port_indicators()
+                # Show port indicators on devices near the cursor
+                self.show_port_indicators(scene_pos)
                 
-                print(f"Starting connection from {item.name}, port {port['name'] if port else 'default'}")
+                log.debug("Starting connection from %s, port %s", item.name, port['name'] if port else 'default')
                 return True
             
         except Exception as e:
@@ -184,6 +196,9 @@ class ConnectionCreationTool(QObject):
                 source_pos.x(), source_pos.y(),
                 scene_pos.x(), scene_pos.y()
             )
+            
+            if self.port_overlay:
+                self.port_overlay.set_cursor(scene_pos)
             return True
             
         except Exception as e:
@@ -257,7 +272,9 @@ class ConnectionCreationTool(QObject):
             if self.connection_manager:
                 self.connection_manager.register_connection(connection)
                 
-            print(f"Created {connection_type} connection: {self.source_device.name}:{self.source_port['name']} → {target_device.name}:{target_port['name']}")
+            log.debug("Created %s connection: %s:%s → %s:%s", connection_type,
+                      self.source_device.name, self.source_port['name'],
+                      target_device.name, target_port['name'])
             
             return connection
             
@@ -287,8 +304,8 @@ class ConnectionCreationTool(QObject):
         except Exception as e:
             print(f"Error clearing temporary connection: {e}")
     
-    def show_port_indicators(self):
-        """Show visual indicators for available ports on devices."""
+    def show_port_indicators(self, scene_pos=None):
+        """Show port indicators on the devices near the cursor."""
         try:
             if not self.scene:
                 return
@@ -296,24 +313,10 @@ class ConnectionCreationTool(QObject):
             # Clear existing indicators
             self.clear_port_indicators()
             
-            # Find all devices in the scene
-            for item in self.scene.items():
-                if isinstance(item, Device) and item != self.source_device:
-                    # Add indicators for all unconnected ports
-                    for port in item.ports:
-                        if not port.get("connected", False):
-                            # Get port position
-                            pos = item.get_port_position(port["name"])
-                            
-                            # Create indicator
-                            indicator = QGraphicsEllipseItem(pos.x()-4, pos.y()-4, 8, 8)
-                            indicator.setPen(QPen(Qt.black, 1))
-                            indicator.setBrush(QColor(100, 200, 100, 150))
-                            indicator.setZValue(1000)  # Keep above other items
-                            
-                            # Add to scene
-                            self.scene.addItem(indicator)
-                            self.port_indicators.append(indicator)
+            # A single overlay item paints the ports of nearby devices
+            self.port_overlay = PortIndicatorOverlay(exclude=self.source_device)
+            self.scene.addItem(self.port_overlay)
+            self.port_overlay.set_cursor(scene_pos if scene_pos is not None else self.start_point)
                     
         except Exception as e:
             print(f"Error showing port indicators: {e}")
@@ -321,11 +324,10 @@ class ConnectionCreationTool(QObject):
     def clear_port_indicators(self):
         """Remove all port indicators."""
         try:
-            if self.scene:
-                for indicator in self.port_indicators:
-                    if indicator.scene() == self.scene:
-                        self.scene.removeItem(indicator)
-            self.port_indicators = []
+            if self.port_overlay:
+                if self.port_overlay.scene():
+                    self.port_overlay.scene().removeItem(self.port_overlay)
+                self.port_overlay = None
             
         except Exception as e:
-            print(f"Error clearing port indicators: {e}")
\ No newline at end of file
+            print(f"Error clearing port indicators: {e}")
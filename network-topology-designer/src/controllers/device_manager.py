@@ -449,6 +449,12 @@ except ImportError:
 import uuid
 from PyQt5.QtCore import QObject
 
+from utils.search_index import DeviceSearchIndex
+from utils.spatial_hash import SpatialHash
+from utils.logger import get_logger
+
+log = get_logger('devices')
+
 class DeviceManager(QObject):
     """Manages the creation and tracking of devices in the network topology."""
     
@@ -463,6 +469,12 @@ class DeviceManager(QObject):
         self.scene = scene
         self.selected_device = None
         self.selected_device_type = Device.ROUTER  # Default device type
+        self.search_index = DeviceSearchIndex()
+        
+        # Device centers, used to find alignment candidates while dragging
+        self.anchor_index = SpatialHash()
+        if scene is not None and hasattr(scene, 'geometry_changed'):
+            scene.geometry_changed.connect(self._on_geometry_changed)
     
     def create_device(self, device_type, x, y, name=None):
         """Create a device of the specified type at the given position."""
@@ -470,19 +482,21 @@ class DeviceManager(QObject):
             # Use the Device class factory method
             device = Device.create(device_type, x, y, name)
             
-            # Add to devices dictionary
-            self.devices[device.id] = device
+            # Add to devices dictionary and search index
+            self.register_device(device)
             
             # Add to scene if available
             if self.scene:
                 self.scene.addItem(device)
                 
-                # Connect device signals
-                device.selection_changed.connect(self._handle_device_selection)
+                # Connect device signals (a grouped device is a graphics item,
+                # not a QObject, so its class-level signal cannot be bound)
+                if isinstance(device, QObject):
+                    device.selection_changed.connect(self._handle_device_selection)
                 
-                print(f"Created {device_type} at ({x}, {y})")
+                log.debug("Created %s at (%s, %s)", device_type, x, y)
             else:
-                print("Warning: No scene available to add device")
+                log.warning("No scene available to add device")
             
             # Emit signal
             self.device_added.emit(device)
@@ -503,8 +517,10 @@ class DeviceManager(QObject):
             if self.scene and device in self.scene.items():
                 self.scene.removeItem(device)
             
-            # Remove from dictionary
+            # Remove from dictionary and search index
             del self.devices[device_id]
+            self.search_index.remove(device_id)
+            self.anchor_index.remove(device_id)
             
             # Update selected device if needed
             if self.selected_device and self.selected_device.id == device_id:
@@ -513,11 +529,91 @@ class DeviceManager(QObject):
             # Emit signal
             self.device_removed.emit(device)
             
-            print(f"Removed device: {device_id}")
+            log.debug("Removed device: %s", device_id)
             return True
         
         return False
     
+    def move_devices(self, moves):
+        """Move many devices in one pass.
+        
+        Connections are refreshed once after all devices moved, instead of
+        once per moved end point.
+        
+        Args:
+            moves (list): (device, QPointF) pairs
+        """
+        Device.begin_batch_move()
+        try:
+            for device, pos in moves:
+                device.setPos(pos)
+        finally:
+            connections = Device.end_batch_move()
+        
+        for connection in connections:
+            connection.update_position()
+        
+        log.debug("Moved %d devices, refreshed %d connections", len(moves), len(connections))
+    
+    def register_device(self, device):
+        """Track a device that was created outside of create_device (e.g. when loading)."""
+        self.devices[device.id] = device
+        self.search_index.add(device.id, DeviceSearchIndex.fields_for_device(device))
+        pos = device.scenePos()
+        self.anchor_index.insert(device.id, pos.x(), pos.y())
+    
+    def update_device_property(self, device_id, key, value):
+        """Update a device property or name and keep the search index in sync."""
+        device = self.devices.get(device_id)
+        if not device:
+            return False
+        
+        if key == 'name':
+            device.set_name(value)
+        else:
+            device.update_property(key, value)
+        
+        self.reindex_device(device)
+        return True
+    
+    def reindex_device(self, device):
+        """Refresh the search index entry of a device after its fields changed."""
+        if device.id in self.devices:
+            self.search_index.update(device.id, DeviceSearchIndex.fields_for_device(device))
+    
+    def _on_geometry_changed(self, item):
+        """Keep the anchor index in sync with device positions."""
+        device_id = getattr(item, 'id', None)
+        if device_id is None or self.devices.get(device_id) is not item:
+            return
+        if item.scene() is None:
+            # Left the scene, e.g. hidden in a collapsed boundary; it is back
+            # in the index once the scene reports it added again
+            self.anchor_index.remove(device_id)
+            return
+        pos = item.scenePos()
+        self.anchor_index.insert(device_id, pos.x(), pos.y())
+    
+    def rebuild_search_index(self):
+        """Rebuild the search index from scratch, e.g. after devices were replaced."""
+        self.search_index.clear()
+        for device_id, device in self.devices.items():
+            self.search_index.add(device_id, DeviceSearchIndex.fields_for_device(device))
+    
+    def search_devices(self, query, limit=20):
+        """Find devices by name, ID, IP/MAC address or property value.
+        
+        Args:
+            query (str): Search text; prefixes and small typos are matched
+            limit (int): Maximum number of devices to return
+            
+        Returns:
+            list: Matching Device objects, best matches first
+        """
+        return [self.devices[device_id]
+                for device_id in self.search_index.search(query, limit)
+                if device_id in self.devices]
+    
     def _handle_device_selection(self, device, is_selected):
         """Handle device selection changes."""
         if is_selected:
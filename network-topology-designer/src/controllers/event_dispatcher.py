@@ -0,0 +1,237 @@
+"""
+Mode-based dispatch of scene mouse events.
+
+The scene hands each mouse event straight to an EventDispatcher, which
+tracks the current interaction mode and calls the handler registered for
+it: one dict lookup per event instead of a chain of event filters, signal
+emissions and if/elif mode checks.
+
+Mouse moves are coalesced to the display refresh rate. The first move of a
+frame is delivered immediately; further moves within the same frame only
+replace a pending snapshot, which is delivered when the frame interval has
+passed (or right before the next press/release, so ordering is kept).
+Handlers therefore see at most one move per frame no matter how fast the
+pointer reports.
+"""
+import time
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from utils.perf_counters import perf
+from utils.logger import get_logger, DEBUG
+
+log = get_logger('mouse')
+
+# Used when the screen does not report a refresh rate
+DEFAULT_REFRESH_RATE = 60.0
+
+
+def _screen_refresh_rate():
+    """Return the refresh rate of the primary screen in Hz."""
+    from PyQt5.QtGui import QGuiApplication
+
+    screen = QGuiApplication.primaryScreen() if QGuiApplication.instance() else None
+    rate = screen.refreshRate() if screen else 0
+    return rate if rate and rate > 1 else DEFAULT_REFRESH_RATE
+
+
+class PointerEvent:
+    """Copy of a mouse event that stays valid after Qt has deleted the original."""
+
+    __slots__ = ('_scene_pos', '_screen_pos', '_button', '_buttons', '_modifiers')
+
+    def __init__(self, event):
+        self._scene_pos = event.scenePos()
+        self._screen_pos = event.screenPos()
+        self._button = event.button()
+        self._buttons = event.buttons()
+        self._modifiers = event.modifiers()
+
+    def scenePos(self):
+        return self._scene_pos
+
+    def screenPos(self):
+        return self._screen_pos
+
+    def button(self):
+        return self._button
+
+    def buttons(self):
+        return self._buttons
+
+    def modifiers(self):
+        return self._modifiers
+
+    def accept(self):
+        pass
+
+    def ignore(self):
+        pass
+
+
+class ModeHandler:
+    """Callbacks of one interaction mode.
+
+    press/move/release are called with (event, scene_pos) and may return True
+    when they handled the event; enter/exit are called without arguments
+    when the mode becomes active or inactive. Any callback may be None.
+    """
+
+    __slots__ = ('press', 'move', 'release', 'enter', 'exit')
+
+    def __init__(self, press=None, move=None, release=None, enter=None, exit=None):
+        self.press = press
+        self.move = move
+        self.release = release
+        self.enter = enter
+        self.exit = exit
+
+
+class EventDispatcher(QObject):
+    """Interaction-mode state machine that routes scene mouse events."""
+
+    # Emitted with (new mode, previous mode)
+    mode_changed = pyqtSignal(str, str)
+
+    def __init__(self, parent=None, coalesce_moves=True, refresh_rate=None):
+        """Initialize the dispatcher.
+
+        Args:
+            parent: Parent QObject
+            coalesce_moves (bool): Deliver at most one mouse move per frame
+            refresh_rate (float, optional): Frames per second; defaults to the
+                primary screen's refresh rate
+        """
+        super().__init__(parent)
+        self._handlers = {}
+        self._handler = None
+        self.mode = None
+
+        self.coalesce_moves = coalesce_moves
+        self._pending_move = None
+        self._last_move_time = 0.0
+        self._move_timer = QTimer(self)
+        self._move_timer.setSingleShot(True)
+        self._move_timer.timeout.connect(self.flush_move)
+        self.set_refresh_rate(refresh_rate or _screen_refresh_rate())
+
+    def set_refresh_rate(self, refresh_rate):
+        """Set the rate mouse moves are coalesced to, in Hz."""
+        self.refresh_rate = float(refresh_rate)
+        self.frame_interval = 1.0 / self.refresh_rate
+
+    def attach(self, scene):
+        """Receive the mouse events of a TopologyScene."""
+        scene.event_dispatcher = self
+
+    def register_mode(self, mode, handler=None, **callbacks):
+        """Register the handler of a mode.
+
+        Args:
+            mode (str): Mode name
+            handler (ModeHandler, optional): Handler; built from the keyword
+                callbacks (press, move, release, enter, exit) if omitted
+
+        Returns:
+            ModeHandler: The registered handler
+        """
+        handler = handler or ModeHandler(**callbacks)
+        self._handlers[mode] = handler
+        if mode == self.mode:
+            self._handler = handler
+        return handler
+
+    def set_mode(self, mode):
+        """Switch to a registered mode, running the exit/enter callbacks.
+
+        Returns:
+            bool: False if the mode is not registered
+        """
+        handler = self._handlers.get(mode)
+        if handler is None:
+            log.warning("Unknown interaction mode: %s", mode)
+            return False
+        if mode == self.mode:
+            return True
+
+        # A move that has not been delivered yet belongs to the old mode
+        self._move_timer.stop()
+        self._pending_move = None
+
+        previous = self.mode
+        if self._handler is not None:
+            self._call(self._handler.exit)
+        self.mode = mode
+        self._handler = handler
+        self._call(handler.enter)
+
+        if log.isEnabledFor(DEBUG):
+            log.debug("Mode changed from %s to %s", previous, mode)
+        self.mode_changed.emit(mode, previous or "")
+        return True
+
+    def mouse_press(self, event):
+        """Dispatch a mouse press to the current mode."""
+        self.flush_move()
+        handler = self._handler
+        if handler is None or handler.press is None:
+            return False
+        return self._dispatch(handler.press, event)
+
+    def mouse_move(self, event):
+        """Dispatch a mouse move, coalescing moves within one frame."""
+        perf.increment('dispatcher.moves_received')
+        handler = self._handler
+        if handler is None or handler.move is None:
+            return False
+        if not self.coalesce_moves:
+            return self._dispatch(handler.move, event)
+
+        now = time.perf_counter()
+        if self._pending_move is None and now - self._last_move_time >= self.frame_interval:
+            # First move of a frame goes out right away
+            self._last_move_time = now
+            return self._dispatch(handler.move, event)
+
+        # Later moves in the same frame replace each other
+        if self._pending_move is None:
+            remaining = self.frame_interval - (now - self._last_move_time)
+            self._move_timer.start(max(0, int(remaining * 1000)))
+        self._pending_move = PointerEvent(event)
+        return False
+
+    def mouse_release(self, event):
+        """Dispatch a mouse release to the current mode."""
+        self.flush_move()
+        handler = self._handler
+        if handler is None or handler.release is None:
+            return False
+        return self._dispatch(handler.release, event)
+
+    def flush_move(self):
+        """Deliver the pending coalesced mouse move, if any."""
+        self._move_timer.stop()
+        event = self._pending_move
+        if event is None:
+            return
+        self._pending_move = None
+        self._last_move_time = time.perf_counter()
+        handler = self._handler
+        if handler is not None and handler.move is not None:
+            self._dispatch(handler.move, event)
+
+    @perf.timed('dispatcher.dispatch')
+    def _dispatch(self, callback, event):
+        try:
+            return bool(callback(event, event.scenePos()))
+        except Exception as e:
+            log.exception("Error handling mouse event in mode %s: %s", self.mode, e)
+            return False
+
+    def _call(self, callback):
+        if callback is None:
+            return
+        try:
+            callback()
+        except Exception as e:
+            log.exception("Error switching mode %s: %s", self.mode, e)
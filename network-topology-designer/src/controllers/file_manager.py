@@ -83,7 +83,7 @@ class FileManager(QObject):
                 'name': device.name,
                 'x': device.pos().x(),
                 'y': device.pos().y(),
-                'properties': device.properties
+                'properties': dict(device.properties)
             }
             topology_data['devices'].append(device_data)
         
@@ -147,6 +147,7 @@ class FileManager(QObject):
                     # Update properties
                     for key, value in device_data['properties'].items():
                         device.update_property(key, value)
+                    self.device_manager.reindex_device(device)
                     
                     # Store in map for connections
                     device_map[device_data['id']] = device
@@ -254,7 +255,7 @@ class FileManager(QObject):
                 'name': device.name,
                 'x': device.pos().x(),
                 'y': device.pos().y(),
-                'properties': device.properties
+                'properties': dict(device.properties)
             }
             devices_data.append(device_data)
         return devices_data
@@ -282,6 +283,6 @@ class FileManager(QObject):
     def _load_devices(self, devices_data):
         for device_data in devices_data:
             device = Device.from_dict(device_data)
-            self.device_manager.devices[device.id] = device
+            self.device_manager.register_device(device)
             if self.device_manager.scene:
                 self.device_manager.scene.addItem(device)
\ No newline at end of file
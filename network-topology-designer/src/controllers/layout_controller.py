@@ -0,0 +1,355 @@
+import multiprocessing
+import queue
+import time
+
+from PyQt5.QtCore import QObject, QTimer, QPointF, QRectF, pyqtSignal
+
+from controllers.undo_redo_manager import MoveDevicesCommand, LayoutBoundariesCommand
+from utils.logger import get_logger
+
+log = get_logger('devices')
+
+
+class LayoutController(QObject):
+    """Runs automatic layouts of the devices in the scene.
+
+    The force-directed layout runs in a worker process; intermediate
+    positions are streamed back and applied to the scene as they arrive, and
+    the final result is recorded as a single undo step. Selected devices
+    are pinned in place. The layered and boundary-aware layouts are fast
+    enough to run in place.
+    """
+
+    # Emitted with a description of the layout
+    layout_started = pyqtSignal(str)
+    # Emitted with (iterations done, iterations planned)
+    layout_progress = pyqtSignal(int, int)
+    # Emitted with a status message when the layout ends (finished, cancelled or failed)
+    layout_finished = pyqtSignal(str)
+
+    # How often worker results are checked
+    POLL_INTERVAL_MS = 40
+
+    # How long a stopped worker may take to exit before it is terminated
+    EXIT_GRACE_MS = 2000
+
+    def __init__(self, device_manager, undo_redo_manager=None, parent=None):
+        """Initialize the controller.
+
+        Args:
+            device_manager: DeviceManager whose devices are laid out
+            undo_redo_manager (optional): Receives one undo step per finished layout
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.device_manager = device_manager
+        self.undo_redo_manager = undo_redo_manager
+
+        self._process = None
+        self._queue = None
+        self._stop_event = None
+        self._devices = []
+        self._start_positions = []
+        self._last_positions = None
+        self._iterations = 0
+        self._description = ""
+
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setInterval(self.POLL_INTERVAL_MS)
+        self._poll_timer.timeout.connect(self._poll)
+
+        # Stopped workers still exiting: (process, queue, deadline)
+        self._exiting = []
+        self._reap_timer = QTimer(self)
+        self._reap_timer.setInterval(self.POLL_INTERVAL_MS)
+        self._reap_timer.timeout.connect(self._reap)
+
+    @property
+    def running(self):
+        """Whether a layout is in progress."""
+        return self._process is not None
+
+    def build_graph(self, devices=None):
+        """Return (devices, positions, edges) of the device/connection graph.
+
+        Args:
+            devices (list, optional): Devices to include; all managed devices by default
+
+        Returns:
+            tuple: Device list, [(x, y)] positions and [(i, j)] index pairs
+                of the connections between included devices
+        """
+        devices = list(self.device_manager.devices.values()) if devices is None else list(devices)
+        index = {id(device): i for i, device in enumerate(devices)}
+        positions = []
+        edges = []
+        for i, device in enumerate(devices):
+            pos = device.pos()
+            positions.append((pos.x(), pos.y()))
+            for connection in getattr(device, 'connections', None) or ():
+                source = getattr(connection, 'source_device', None)
+                target = getattr(connection, 'target_device', None)
+                other = target if source is device else source
+                j = index.get(id(other))
+                # Each connection is listed by both ends; keep it once
+                if j is not None and i < j:
+                    edges.append((i, j))
+        return devices, positions, edges
+
+    def apply_layered_layout(self, devices=None, **options):
+        """Arrange devices in tiers by type and connections, as one undo step.
+
+        Args:
+            devices (list, optional): Devices to lay out; all managed devices by default
+            **options: Extra layered_layout() options (layer_spacing, node_spacing, sweeps)
+
+        Returns:
+            bool: False if a layout is running or there is nothing to lay out
+        """
+        from utils.layered_layout import layered_layout
+
+        if self.running:
+            return False
+        devices, positions, edges = self.build_graph(devices)
+        if len(devices) < 2:
+            return False
+
+        description = f"Layered layout of {len(devices)} devices"
+        centers = layered_layout([device.device_type for device in devices], edges,
+                                 sizes=[(device.width, device.height) for device in devices],
+                                 positions=positions, **options)
+        moves = [(device, device.pos(), QPointF(x, y)) for device, (x, y) in zip(devices, centers)]
+        if self.undo_redo_manager is not None:
+            self.undo_redo_manager.execute_command(
+                MoveDevicesCommand(self.device_manager, moves, description))
+        else:
+            self.device_manager.move_devices([(device, new) for device, _, new in moves])
+
+        log.info("Applied %s, %d connections", description, len(edges))
+        self.layout_finished.emit("Layout finished")
+        return True
+
+    def apply_boundary_layout(self, boundary_controller, **options):
+        """Lay out each boundary's devices on their own, then pack the boundaries.
+
+        Devices stay in their innermost boundary; boundaries are resized to
+        fit their contents. Everything is recorded as one undo step.
+
+        Args:
+            boundary_controller: BoundaryController providing zones and nesting
+            **options: Extra zone_layout() options (spacing, parallel, layer_spacing, ...)
+
+        Returns:
+            bool: False if a layout is running or there is nothing to lay out
+        """
+        from utils.zone_layout import zone_layout
+
+        if self.running:
+            return False
+        hierarchy = boundary_controller.hierarchy
+        boundaries = {boundary_id: boundary_controller.boundaries[boundary_id]
+                      for boundary_id in hierarchy.rects if boundary_id in boundary_controller.boundaries}
+        devices = list(self.device_manager.devices.values())
+        if not boundaries or not devices:
+            return False
+
+        # Devices by innermost zone
+        members = {None: []}
+        for device in devices:
+            zone = hierarchy.zone_of(device.id)
+            members.setdefault(zone if zone in boundaries else None, []).append(device)
+        # Devices are packed by what they draw (label included), which is
+        # larger than width x height and not centered on pos()
+        footprints = {device: device.sceneBoundingRect() for device in devices}
+        zones = {}
+        for zone, zone_devices in members.items():
+            zone_devices, _, edges = self.build_graph(zone_devices)
+            zones[zone] = ([device.device_type for device in zone_devices], edges,
+                           [(footprints[device].width(), footprints[device].height())
+                            for device in zone_devices])
+
+        # Nested boundaries, packed in reading order of their current positions
+        children = {None: []}
+        for boundary_id in boundaries:
+            parent = hierarchy.parent.get(boundary_id)
+            children.setdefault(parent if parent in boundaries else None, []).append(boundary_id)
+        for child_ids in children.values():
+            child_ids.sort(key=lambda boundary_id: (hierarchy.rects[boundary_id][1], hierarchy.rects[boundary_id][0]))
+
+        left = min([x0 for x0, y0, x1, y1 in hierarchy.rects.values()] +
+                   [rect.left() for rect in footprints.values()])
+        top = min([y0 for x0, y0, x1, y1 in hierarchy.rects.values()] +
+                  [rect.top() for rect in footprints.values()])
+        centers, rects = zone_layout(zones, children, origin=(left, top), **options)
+
+        moves = []
+        for zone, zone_centers in centers.items():
+            for device, (x, y) in zip(members[zone], zone_centers):
+                offset = footprints[device].center() - device.scenePos()
+                moves.append((device, device.pos(), QPointF(x, y) - offset))
+        resizes = [(boundaries[boundary_id], boundaries[boundary_id].scene_rect(),
+                    QRectF(x0, y0, x1 - x0, y1 - y0))
+                   for boundary_id, (x0, y0, x1, y1) in rects.items()]
+
+        description = f"Boundary layout of {len(devices)} devices in {len(boundaries)} boundaries"
+        command = LayoutBoundariesCommand(self.device_manager, boundary_controller, moves, resizes, description)
+        if self.undo_redo_manager is not None:
+            self.undo_redo_manager.execute_command(command)
+        else:
+            command.execute()
+
+        log.info("Applied %s", description)
+        self.layout_finished.emit("Layout finished")
+        return True
+
+    def start_force_layout(self, iterations=300, pin_selected=True, **options):
+        """Start the force-directed layout in a worker process.
+
+        Args:
+            iterations (int): Number of iterations
+            pin_selected (bool): Keep selected devices where they are
+            **options: Extra ForceLayout options (ideal_length, theta, gravity)
+
+        Returns:
+            bool: False if a layout is already running or there is nothing to lay out
+
+        Raises:
+            ImportError: If numpy is not installed
+        """
+        if self.running:
+            return False
+
+        devices, positions, edges = self.build_graph()
+        if len(devices) < 2:
+            return False
+        pinned = [pin_selected and device.isSelected() for device in devices]
+
+        from utils.force_layout import layout_worker, _numpy
+
+        # Fail here rather than in the worker; results arrive as numpy arrays
+        _numpy()
+
+        # Spawned (not forked) so the worker does not inherit Qt's state
+        context = multiprocessing.get_context('spawn')
+        self._queue = context.Queue(maxsize=4)
+        self._stop_event = context.Event()
+        options = dict(options, iterations=iterations)
+        self._process = context.Process(
+            target=layout_worker,
+            args=(positions, edges, pinned, options, self._queue, self._stop_event),
+            daemon=True)
+        self._process.start()
+
+        self._devices = devices
+        self._start_positions = [device.pos() for device in devices]
+        self._last_positions = None
+        self._iterations = iterations
+        self._description = f"Force-directed layout of {len(devices)} devices"
+        self._poll_timer.start()
+
+        log.info("Started %s, %d connections", self._description, len(edges))
+        self.layout_started.emit(self._description)
+        return True
+
+    def cancel(self):
+        """Stop the running layout, keeping the positions reached so far."""
+        if not self.running:
+            return
+        self._stop_event.set()
+
+    def discard(self):
+        """Stop the running layout at once without recording it, e.g. before the scene is cleared."""
+        if not self.running:
+            return
+        self._stop_event.set()
+        self._last_positions = None
+        self._finish("Layout cancelled")
+
+    def _poll(self):
+        """Apply the latest positions sent by the worker."""
+        latest = None
+        try:
+            while True:
+                message = self._queue.get_nowait()
+                latest = message
+                if message[0] != 'progress':
+                    break
+        except queue.Empty:
+            pass
+
+        if latest is None:
+            if not self._process.is_alive() and self._queue.empty():
+                self._finish("Layout worker exited unexpectedly")
+            return
+
+        kind, iteration, payload = latest
+        if kind == 'error':
+            log.error("Layout failed:\n%s", payload)
+            self._finish("Layout failed")
+            return
+
+        self._apply(payload)
+        self.layout_progress.emit(iteration, self._iterations)
+        if kind == 'done':
+            cancelled = iteration < self._iterations
+            self._finish("Layout cancelled" if cancelled else "Layout finished")
+
+    def _reap(self):
+        """Drain the queues of stopped workers and join the ones that exited."""
+        now = time.monotonic()
+        exiting = []
+        for process, result_queue, deadline in self._exiting:
+            # Unblock a worker waiting to put its final result
+            try:
+                while True:
+                    result_queue.get_nowait()
+            except queue.Empty:
+                pass
+
+            if process.is_alive():
+                if now >= deadline:
+                    log.warning("Layout worker %s did not exit, terminating it", process.pid)
+                    process.terminate()
+                    deadline = float('inf')
+                exiting.append((process, result_queue, deadline))
+            else:
+                process.join()
+                result_queue.close()
+
+        self._exiting = exiting
+        if not exiting:
+            self._reap_timer.stop()
+
+    def _apply(self, positions):
+        """Move the devices to positions received from the worker."""
+        self._last_positions = positions
+        self.device_manager.move_devices([(device, QPointF(x, y))
+                                          for device, (x, y) in zip(self._devices, positions.tolist())])
+
+    def _finish(self, message):
+        """Stop polling, clean up the worker and record the moves made as one undo step."""
+        self._poll_timer.stop()
+        if self._process is not None:
+            # The worker may still be flushing results or blocked on the full
+            # queue; joining it here would freeze the GUI, so it is reaped
+            # from a timer instead
+            self._stop_event.set()
+            deadline = time.monotonic() + self.EXIT_GRACE_MS / 1000
+            self._exiting.append((self._process, self._queue, deadline))
+            self._reap_timer.start()
+        self._process = None
+        self._queue = None
+        self._stop_event = None
+
+        positions = self._last_positions
+        if positions is not None and self.undo_redo_manager is not None:
+            moves = [(device, old, QPointF(x, y))
+                     for device, old, (x, y) in zip(self._devices, self._start_positions, positions.tolist())]
+            self.undo_redo_manager.execute_command(
+                MoveDevicesCommand(self.device_manager, moves, self._description))
+
+        self._devices = []
+        self._start_positions = []
+        self._last_positions = None
+        log.info("%s: %s", message, self._description)
+        self.layout_finished.emit(message)
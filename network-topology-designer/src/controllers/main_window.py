@@ -3,7 +3,7 @@ from PyQt5.QtWidgets import (
     QAction, QToolBar, QFileDialog, QMessageBox, QDockWidget, QListWidget
 )
 from PyQt5.QtGui import QIcon, QPainter, QImage
-from PyQt5.QtCore import Qt, QRectF, pyqtSlot
+from PyQt5.QtCore import Qt, QRectF, QPointF, pyqtSlot
 
 # Import models
 from models.device import Device
@@ -13,12 +13,27 @@ from controllers.device_manager import DeviceManager
 from controllers.connection_tool import ConnectionCreationTool
 from controllers.connection_manager import ConnectionManager
 from controllers.boundary_controller import BoundaryController
+from controllers.view_manager import ViewManager
+from controllers.view_performance import ViewPerformanceConfig
+from controllers.event_dispatcher import EventDispatcher
+from controllers.snap_controller import SnapController
+from controllers.undo_redo_manager import (
+    UndoRedoManager, MoveDevicesCommand, EditPropertiesCommand, BulkEditPropertiesCommand
+)
+from controllers.properties_panel import PropertiesPanel
+from controllers.layout_controller import LayoutController
+from controllers.analytics_controller import AnalyticsController
+from controllers.resilience_controller import ResilienceController
+from controllers.selection_notifier import SelectionNotifier
 
 # Import views
 from views.topology_scene import TopologyScene
+from views.fps_overlay import FpsOverlay
+from views.perf_overlay import PerfOverlay
 
 # Import utils
 from utils.file_handler import FileHandler
+from utils import arrange
 
 class MainWindow(QMainWindow):
     """Main window for network topology designer application."""
@@ -69,6 +84,11 @@ class MainWindow(QMainWindow):
         self.view.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
         self.view.setResizeAnchor(QGraphicsView.AnchorUnderMouse)
         
+        # Optional performance configuration and frame rate overlay
+        self.view_performance = ViewPerformanceConfig(self.view, self.scene)
+        self.fps_overlay = FpsOverlay(self.view, self.view_performance)
+        self.perf_overlay = PerfOverlay(self.view)
+        
         # Create central widget
         central_widget = QWidget()
         layout = QVBoxLayout(central_widget)
@@ -81,6 +101,12 @@ class MainWindow(QMainWindow):
         # Device manager
         self.device_manager = DeviceManager(self.scene)
         
+        # Selection changes (e.g. from the rubber band), batched to one per frame
+        self.selection_notifier = SelectionNotifier(self.scene, self.view, self)
+        
+        # Snapping of dragged devices to the grid and alignment guides
+        self.snap_controller = SnapController(self.scene, self.device_manager)
+        
         # Connection manager
         self.connection_manager = ConnectionManager(self.scene)
         
@@ -90,12 +116,57 @@ class MainWindow(QMainWindow):
         # Boundary controller
         self.boundary_controller = BoundaryController(self, self.scene)
         
+        # View manager
+        self.view_manager = ViewManager(self, self.view, self.scene, show_border=False)
+        
         # File handler
         self.file_handler = FileHandler(
             device_manager=self.device_manager,
             connection_manager=self.connection_manager,
             boundary_controller=self.boundary_controller
         )
+        
+        # Undo/redo history
+        self.undo_redo_manager = UndoRedoManager(self)
+        
+        # Graph of the topology for analysis; loading bypasses the manager signals
+        self.analytics_controller = AnalyticsController(self.device_manager, self.connection_manager, self)
+        if hasattr(self.file_handler, 'file_loaded'):
+            self.file_handler.file_loaded.connect(lambda path: self.analytics_controller.rebuild())
+        self.resilience_controller = ResilienceController(self.analytics_controller, self.scene, self.view, self)
+        
+        # Automatic layouts
+        self.layout_controller = LayoutController(self.device_manager, self.undo_redo_manager, self)
+        self.layout_controller.layout_started.connect(self._on_layout_started)
+        self.layout_controller.layout_progress.connect(self._on_layout_progress)
+        self.layout_controller.layout_finished.connect(self._on_layout_finished)
+        
+        # Scene mouse events go to the handler of the current mode
+        self._setup_event_dispatcher()
+    
+    def _setup_event_dispatcher(self):
+        """Register the interaction modes and route scene mouse events through them."""
+        self.event_dispatcher = EventDispatcher(self)
+        self.event_dispatcher.register_mode(
+            "select_mode",
+            move=self._on_select_mode_move)
+        self.event_dispatcher.register_mode(
+            "device_mode",
+            press=self._on_device_mode_press)
+        self.event_dispatcher.register_mode(
+            "connection_mode",
+            press=self.connection_tool.handle_press,
+            move=self.connection_tool.handle_move,
+            release=self.connection_tool.handle_release,
+            exit=self.connection_tool.clear_temp_connection)
+        self.event_dispatcher.register_mode(
+            "boundary_mode",
+            press=lambda event, scene_pos: self.boundary_controller.handle_mouse_press(event),
+            move=lambda event, scene_pos: self.boundary_controller.handle_mouse_move(event),
+            release=lambda event, scene_pos: self.boundary_controller.handle_mouse_release(event),
+            enter=self.boundary_controller.activate,
+            exit=self.boundary_controller.deactivate)
+        self.event_dispatcher.attach(self.scene)
     
     def _setup_ui(self):
         """Set up UI components."""
@@ -169,10 +240,78 @@ class MainWindow(QMainWindow):
         self.exit_action.triggered.connect(self.close)
         
         # Edit actions
+        self.undo_action = QAction("&Undo", self)
+        self.undo_action.setShortcut("Ctrl+Z")
+        self.undo_action.setEnabled(False)
+        self.undo_action.triggered.connect(self.undo_redo_manager.undo)
+        self.undo_redo_manager.undoAvailable.connect(self.undo_action.setEnabled)
+        
+        self.redo_action = QAction("&Redo", self)
+        self.redo_action.setShortcut("Ctrl+Y")
+        self.redo_action.setEnabled(False)
+        self.redo_action.triggered.connect(self.undo_redo_manager.redo)
+        self.undo_redo_manager.redoAvailable.connect(self.redo_action.setEnabled)
+        
         self.delete_action = QAction("&Delete", self)
         self.delete_action.setShortcut("Delete")
         self.delete_action.triggered.connect(self._on_delete_selected)
         
+        self.find_action = QAction("&Find Device...", self)
+        self.find_action.setShortcut("Ctrl+F")
+        self.find_action.triggered.connect(self._on_find_device)
+        
+        # Arrange actions
+        self.align_actions = []
+        for edge, label in (('left', "Align &Left"), ('center', "Align &Center"),
+                            ('right', "Align &Right"), ('top', "Align &Top"),
+                            ('middle', "Align &Middle"), ('bottom', "Align &Bottom")):
+            action = QAction(label, self)
+            action.triggered.connect(lambda checked=False, edge=edge: self._on_align(edge))
+            self.align_actions.append(action)
+        
+        self.distribute_horizontal_action = QAction("Distribute &Horizontally", self)
+        self.distribute_horizontal_action.triggered.connect(lambda: self._on_distribute('horizontal'))
+        
+        self.distribute_vertical_action = QAction("Distribute &Vertically", self)
+        self.distribute_vertical_action.triggered.connect(lambda: self._on_distribute('vertical'))
+        
+        self.pack_grid_action = QAction("&Pack into Grid", self)
+        self.pack_grid_action.setStatusTip("Arrange the selected devices in a grid of equal cells")
+        self.pack_grid_action.triggered.connect(self._on_pack_grid)
+        
+        self.force_layout_action = QAction("&Force-Directed Layout", self)
+        self.force_layout_action.setStatusTip("Lay out all devices by their connections; selected devices stay in place")
+        self.force_layout_action.triggered.connect(self._on_force_layout)
+        
+        self.layered_layout_action = QAction("&Layered Layout", self)
+        self.layered_layout_action.setStatusTip("Arrange devices in tiers by type: WAN, firewalls, routers, switches, hosts")
+        self.layered_layout_action.triggered.connect(self._on_layered_layout)
+        
+        self.boundary_layout_action = QAction("&Boundary Layout", self)
+        self.boundary_layout_action.setStatusTip("Lay out the devices of each boundary on their own and pack the boundaries")
+        self.boundary_layout_action.triggered.connect(self._on_boundary_layout)
+        
+        # Analyze actions
+        self.statistics_action = QAction("Topology &Statistics...", self)
+        self.statistics_action.setStatusTip("Show device, connection and path length statistics")
+        self.statistics_action.triggered.connect(self._on_show_statistics)
+        
+        self.shortest_path_action = QAction("Shortest &Path", self)
+        self.shortest_path_action.setStatusTip("Select the devices on a shortest path between the two selected devices")
+        self.shortest_path_action.triggered.connect(self._on_shortest_path)
+        
+        self.resilience_report_action = QAction("&Resilience Report...", self)
+        self.resilience_report_action.setStatusTip("Find devices and links whose failure would split the network")
+        self.resilience_report_action.triggered.connect(self._on_resilience_report)
+        
+        self.highlight_failures_action = QAction("&Highlight Single Points of Failure", self)
+        self.highlight_failures_action.setCheckable(True)
+        self.highlight_failures_action.toggled.connect(self.resilience_controller.set_highlight_enabled)
+        
+        self.cancel_layout_action = QAction("&Cancel Layout", self)
+        self.cancel_layout_action.setEnabled(False)
+        self.cancel_layout_action.triggered.connect(self.layout_controller.cancel)
+        
         # View actions
         self.zoom_in_action = QAction("Zoom &In", self)
         self.zoom_in_action.setShortcut("Ctrl++")
@@ -185,6 +324,50 @@ class MainWindow(QMainWindow):
         self.zoom_reset_action = QAction("&Reset Zoom", self)
         self.zoom_reset_action.setShortcut("Ctrl+0")
         self.zoom_reset_action.triggered.connect(self._on_zoom_reset)
+        
+        self.snap_grid_action = QAction("Snap to &Grid", self)
+        self.snap_grid_action.setCheckable(True)
+        self.snap_grid_action.setStatusTip("Snap dragged devices to a grid (hold Alt to move freely)")
+        self.snap_grid_action.toggled.connect(self.snap_controller.set_grid_enabled)
+        
+        self.smart_guides_action = QAction("Smart G&uides", self)
+        self.smart_guides_action.setCheckable(True)
+        self.smart_guides_action.setStatusTip("Align dragged devices with the edges and centers of nearby devices")
+        self.smart_guides_action.toggled.connect(self.snap_controller.set_guides_enabled)
+        
+        self.compact_devices_action = QAction("&Compact Device Rendering", self)
+        self.compact_devices_action.setCheckable(True)
+        self.compact_devices_action.setChecked(Device.compact_rendering)
+        self.compact_devices_action.setStatusTip("Draw newly added devices as single items (faster for large topologies)")
+        self.compact_devices_action.toggled.connect(Device.set_compact_rendering)
+        
+        self.performance_view_action = QAction("&Performance Rendering", self)
+        self.performance_view_action.setCheckable(True)
+        self.performance_view_action.setStatusTip("Tune viewport updates and caching for large topologies")
+        self.performance_view_action.toggled.connect(self._on_toggle_performance_view)
+        
+        self.opengl_view_action = QAction("Use &OpenGL Viewport", self)
+        self.opengl_view_action.setCheckable(True)
+        self.opengl_view_action.setEnabled(False)
+        self.opengl_view_action.setStatusTip("Render through OpenGL in performance mode (falls back to software)")
+        self.opengl_view_action.toggled.connect(self.view_performance.set_opengl)
+        
+        self.fps_overlay_action = QAction("Show &FPS Overlay", self)
+        self.fps_overlay_action.setCheckable(True)
+        self.fps_overlay_action.toggled.connect(self.fps_overlay.set_enabled)
+        
+        self.perf_overlay_action = QAction("Show &Profiling Overlay", self)
+        self.perf_overlay_action.setCheckable(True)
+        self.perf_overlay_action.setStatusTip("Show paint time, event filter time and update_path calls")
+        self.perf_overlay_action.toggled.connect(self.perf_overlay.set_enabled)
+        
+        self.collapse_boundaries_action = QAction("&Collapse Selected Boundaries", self)
+        self.collapse_boundaries_action.setStatusTip("Show selected boundaries and their contents as single nodes")
+        self.collapse_boundaries_action.triggered.connect(self._on_collapse_boundaries)
+        
+        self.expand_boundaries_action = QAction("E&xpand Selected Boundaries", self)
+        self.expand_boundaries_action.setStatusTip("Restore the contents of selected collapsed boundaries")
+        self.expand_boundaries_action.triggered.connect(self._on_expand_boundaries)
     
     def _setup_toolbar(self):
         """Set up application toolbar."""
@@ -230,13 +413,53 @@ class MainWindow(QMainWindow):
         
         # Edit menu
         edit_menu = menubar.addMenu("&Edit")
+        edit_menu.addAction(self.undo_action)
+        edit_menu.addAction(self.redo_action)
+        edit_menu.addSeparator()
         edit_menu.addAction(self.delete_action)
+        edit_menu.addSeparator()
+        edit_menu.addAction(self.find_action)
         
         # View menu
         view_menu = menubar.addMenu("&View")
         view_menu.addAction(self.zoom_in_action)
         view_menu.addAction(self.zoom_out_action)
         view_menu.addAction(self.zoom_reset_action)
+        view_menu.addSeparator()
+        view_menu.addAction(self.snap_grid_action)
+        view_menu.addAction(self.smart_guides_action)
+        view_menu.addSeparator()
+        view_menu.addAction(self.compact_devices_action)
+        view_menu.addAction(self.performance_view_action)
+        view_menu.addAction(self.opengl_view_action)
+        view_menu.addAction(self.fps_overlay_action)
+        view_menu.addAction(self.perf_overlay_action)
+        view_menu.addSeparator()
+        view_menu.addAction(self.collapse_boundaries_action)
+        view_menu.addAction(self.expand_boundaries_action)
+        
+        # Arrange menu
+        arrange_menu = menubar.addMenu("&Arrange")
+        for action in self.align_actions:
+            arrange_menu.addAction(action)
+        arrange_menu.addSeparator()
+        arrange_menu.addAction(self.distribute_horizontal_action)
+        arrange_menu.addAction(self.distribute_vertical_action)
+        arrange_menu.addSeparator()
+        arrange_menu.addAction(self.pack_grid_action)
+        arrange_menu.addSeparator()
+        arrange_menu.addAction(self.force_layout_action)
+        arrange_menu.addAction(self.layered_layout_action)
+        arrange_menu.addAction(self.boundary_layout_action)
+        arrange_menu.addAction(self.cancel_layout_action)
+        
+        # Analyze menu
+        analyze_menu = menubar.addMenu("A&nalyze")
+        analyze_menu.addAction(self.statistics_action)
+        analyze_menu.addAction(self.shortest_path_action)
+        analyze_menu.addSeparator()
+        analyze_menu.addAction(self.resilience_report_action)
+        analyze_menu.addAction(self.highlight_failures_action)
         
         # Help menu
         help_menu = menubar.addMenu("&Help")
@@ -252,7 +475,11 @@ class MainWindow(QMainWindow):
         self.device_dock.setWidget(self.device_list)
         self.addDockWidget(Qt.RightDockWidgetArea, self.device_dock)
         
-        # We'll skip property editor since you don't want that import
+        # Properties of the selection; several selected items are edited in bulk
+        self.properties_panel = PropertiesPanel()
+        self.properties_dock = QDockWidget("Properties", self)
+        self.properties_dock.setWidget(self.properties_panel)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.properties_dock)
     
     def _setup_statusbar(self):
         """Set up the status bar."""
@@ -261,13 +488,14 @@ class MainWindow(QMainWindow):
     def _connect_signals(self):
         """Connect signals between components."""
         try:
-            # Scene signals
-            if hasattr(self.scene, 'mouse_press_signal'):
-                self.scene.mouse_press_signal.connect(self._on_scene_mouse_press)
-            if hasattr(self.scene, 'mouse_move_signal'):
-                self.scene.mouse_move_signal.connect(self._on_scene_mouse_move)
-            if hasattr(self.scene, 'mouse_release_signal'):
-                self.scene.mouse_release_signal.connect(self._on_scene_mouse_release)
+            # Scene mouse events are routed by the event dispatcher
+            
+            # Selection and property edits; edits go through the undo history
+            self.selection_notifier.selection_changed.connect(self.properties_panel.set_items)
+            self.properties_panel.propertiesChanged.connect(self._on_properties_changed)
+            self.properties_panel.bulkPropertiesChanged.connect(self._on_bulk_properties_changed)
+            self.undo_redo_manager.commandUndone.connect(self._on_command_replayed)
+            self.undo_redo_manager.commandRedone.connect(self._on_command_replayed)
             
             # Device manager signals
             if hasattr(self.device_manager, 'device_added'):
@@ -297,6 +525,7 @@ class MainWindow(QMainWindow):
     def _enable_select_mode(self):
         """Enable selection mode."""
         self.current_mode = "select_mode"
+        self.event_dispatcher.set_mode(self.current_mode)
         
         # Update action states
         self.select_action.setChecked(True)
@@ -308,16 +537,13 @@ class MainWindow(QMainWindow):
         self.view.setDragMode(QGraphicsView.RubberBandDrag)
         self.view.setCursor(Qt.ArrowCursor)
         
-        # Deactivate tools
-        if hasattr(self.connection_tool, 'deactivate'):
-            self.connection_tool.deactivate()
-        
         # Update status
         self.statusBar().showMessage("Select Mode: Click to select items")
     
     def _enable_device_mode(self):
         """Enable device creation mode."""
         self.current_mode = "device_mode"
+        self.event_dispatcher.set_mode(self.current_mode)
         
         # Update action states
         self.select_action.setChecked(False)
@@ -329,16 +555,13 @@ class MainWindow(QMainWindow):
         self.view.setDragMode(QGraphicsView.NoDrag)
         self.view.setCursor(Qt.CrossCursor)
         
-        # Deactivate tools
-        if hasattr(self.connection_tool, 'deactivate'):
-            self.connection_tool.deactivate()
-        
         # Update status
         self.statusBar().showMessage(f"Device Mode: Click to add {self.selected_device_type}")
     
     def _enable_connection_mode(self):
         """Enable connection creation mode."""
         self.current_mode = "connection_mode"
+        self.event_dispatcher.set_mode(self.current_mode)
         
         # Update action states
         self.select_action.setChecked(False)
@@ -350,16 +573,13 @@ class MainWindow(QMainWindow):
         self.view.setDragMode(QGraphicsView.NoDrag)
         self.view.setCursor(Qt.CrossCursor)
         
-        # Activate connection tool
-        if hasattr(self.connection_tool, 'activate'):
-            self.connection_tool.activate()
-        
         # Update status
         self.statusBar().showMessage("Connection Mode: Click and drag to connect devices")
     
     def _enable_boundary_mode(self):
         """Enable boundary creation mode."""
         self.current_mode = "boundary_mode"
+        self.event_dispatcher.set_mode(self.current_mode)
         
         # Update action states
         self.select_action.setChecked(False)
@@ -371,10 +591,6 @@ class MainWindow(QMainWindow):
         self.view.setDragMode(QGraphicsView.NoDrag)
         self.view.setCursor(Qt.CrossCursor)
         
-        # Deactivate tools
-        if hasattr(self.connection_tool, 'deactivate'):
-            self.connection_tool.deactivate()
-        
         # Update status
         self.statusBar().showMessage("Boundary Mode: Click and drag to create a boundary")
     
@@ -389,80 +605,28 @@ class MainWindow(QMainWindow):
         # Update status
         self.statusBar().showMessage(f"Device Mode: Click to add {device_type}")
     
-    def _on_scene_mouse_press(self, event):
-        """Handle mouse press events in the scene."""
-        scene_pos = event.scenePos()
-        print(f"Scene mouse press at {scene_pos.x()}, {scene_pos.y()}, mode: {self.current_mode}")
-        
-        try:
-            # Handle based on current mode
-            if self.current_mode == "device_mode":
-                # Create a device
-                self.device_manager.create_device(
-                    self.selected_device_type,
-                    scene_pos.x(),
-                    scene_pos.y()
-                )
-                
-            elif self.current_mode == "connection_mode":
-                # Forward to connection tool
-                self.connection_tool.handle_press(event, scene_pos)
-                
-            elif self.current_mode == "boundary_mode":
-                # Forward to boundary controller
-                self.boundary_controller.handle_mouse_press(event)
-                
-        except Exception as e:
-            print(f"Error handling mouse press: {e}")
-            import traceback
-            traceback.print_exc()
-    
-    def _on_scene_mouse_move(self, event):
-        """Handle mouse move events in the scene."""
-        scene_pos = event.scenePos()
-        
-        try:
-            # Handle based on current mode
-            if self.current_mode == "select_mode":
-                # Update status with position
-                self.statusBar().showMessage(f"Position: ({int(scene_pos.x())}, {int(scene_pos.y())})")
-                
-            elif self.current_mode == "connection_mode":
-                # Forward to connection tool
-                self.connection_tool.handle_move(event, scene_pos)
-                
-            elif self.current_mode == "boundary_mode":
-                # Forward to boundary controller
-                self.boundary_controller.handle_mouse_move(event)
-                
-        except Exception as e:
-            print(f"Error handling mouse move: {e}")
+    def _on_device_mode_press(self, event, scene_pos):
+        """Add a device where the scene was clicked in device mode."""
+        self.device_manager.create_device(
+            self.selected_device_type,
+            scene_pos.x(),
+            scene_pos.y()
+        )
+        return True
     
-    def _on_scene_mouse_release(self, event):
-        """Handle mouse release events in the scene."""
-        scene_pos = event.scenePos()
-        print(f"Scene mouse release at {scene_pos.x()}, {scene_pos.y()}, mode: {self.current_mode}")
-        
-        try:
-            # Handle based on current mode
-            if self.current_mode == "connection_mode":
-                # Forward to connection tool
-                self.connection_tool.handle_release(event, scene_pos)
-                
-            elif self.current_mode == "boundary_mode":
-                # Forward to boundary controller
-                self.boundary_controller.handle_mouse_release(event)
-                
-        except Exception as e:
-            print(f"Error handling mouse release: {e}")
-            import traceback
-            traceback.print_exc()
+    def _on_select_mode_move(self, event, scene_pos):
+        """Show the pointer position in select mode."""
+        self.statusBar().showMessage(f"Position: ({int(scene_pos.x())}, {int(scene_pos.y())})")
+        return False
     
     def _on_device_added(self, device):
         """Handle device added event."""
         try:
             # Update device list
             self._update_device_list()
+            
+            # Large scenes switch to cheaper viewport updates in performance mode
+            self.view_performance.update_viewport_mode(len(self.device_manager.devices))
                 
             # Update status
             self.statusBar().showMessage(f"Added {device.device_type}: {device.name}", 3000)
@@ -475,6 +639,7 @@ class MainWindow(QMainWindow):
         try:
             # Update device list
             self._update_device_list()
+            self.view_performance.update_viewport_mode(len(self.device_manager.devices))
                 
             # Update status
             self.statusBar().showMessage(f"Removed {device.device_type}: {device.name}", 3000)
@@ -525,6 +690,21 @@ class MainWindow(QMainWindow):
         except Exception as e:
             print(f"Error handling connection removed: {e}")
     
+    def _on_properties_changed(self, item, properties):
+        """Apply properties edited in the properties panel as one undo step."""
+        self.undo_redo_manager.execute_command(
+            EditPropertiesCommand(item, item.properties, properties, self.device_manager))
+    
+    def _on_bulk_properties_changed(self, items, changes):
+        """Apply changes made to a multi-selection as one undo step."""
+        self.undo_redo_manager.execute_command(
+            BulkEditPropertiesCommand(items, changes, self.device_manager))
+    
+    def _on_command_replayed(self, command):
+        """Show the restored values after a property edit was undone or redone."""
+        if isinstance(command, (EditPropertiesCommand, BulkEditPropertiesCommand)):
+            self.properties_panel.set_items(self.scene.selectedItems())
+    
     def _on_delete_selected(self):
         """Delete selected items."""
         selected_items = self.scene.selectedItems()
@@ -575,6 +755,9 @@ class MainWindow(QMainWindow):
             if reply != QMessageBox.Yes:
                 return
                 
+        self.layout_controller.discard()
+        self.highlight_failures_action.setChecked(False)
+        
         # Use file handler to create new topology
         if hasattr(self.file_handler, 'new_topology'):
             self.file_handler.new_topology()
@@ -583,11 +766,15 @@ class MainWindow(QMainWindow):
             self.scene.clear()
             if hasattr(self.device_manager, 'devices'):
                 self.device_manager.devices = {}
+                self.device_manager.rebuild_search_index()
+                self.device_manager.anchor_index.clear()
             if hasattr(self.connection_manager, 'connections'):
                 self.connection_manager.connections = {}
             if hasattr(self.boundary_controller, 'boundaries'):
                 self.boundary_controller.boundaries = {}
                 
+        self.undo_redo_manager.clear()
+        self.analytics_controller.rebuild()
         self.statusBar().showMessage("New topology created")
         self._update_device_list()
     
@@ -602,7 +789,10 @@ class MainWindow(QMainWindow):
         
         if filepath:
             # Use file handler to load topology
+            self.layout_controller.discard()
+            self.highlight_failures_action.setChecked(False)
             self.file_handler.load_topology(filepath)
+            self.undo_redo_manager.clear()
             self._update_device_list()
     
     def _on_save_topology(self):
@@ -668,6 +858,188 @@ class MainWindow(QMainWindow):
                 import traceback
                 traceback.print_exc()
     
+    def _on_find_device(self):
+        """Open the device search palette."""
+        if not hasattr(self, 'search_palette'):
+            from ui.search_palette import DeviceSearchPalette
+            self.search_palette = DeviceSearchPalette(self.device_manager, self)
+            self.search_palette.device_chosen.connect(self._on_jump_to_device)
+        self.search_palette.popup()
+    
+    def _on_jump_to_device(self, device):
+        """Select a device and center the view on it."""
+        self.scene.clearSelection()
+        device.setSelected(True)
+        self.view_manager.center_on_item(device)
+        self.statusBar().showMessage(f"Found {device.device_type}: {device.name}", 3000)
+    
+    def _on_collapse_boundaries(self):
+        """Collapse the selected boundaries into proxy nodes."""
+        from models.boundary_item import BoundaryItem
+        
+        boundaries = [item for item in self.scene.selectedItems() if isinstance(item, BoundaryItem)]
+        collapsed = sum(1 for boundary in boundaries
+                        if self.boundary_controller.collapse_boundary(boundary) is not None)
+        self.statusBar().showMessage(f"Collapsed {collapsed} boundaries", 3000)
+    
+    def _on_expand_boundaries(self):
+        """Expand the selected collapsed boundaries."""
+        from views.boundary_proxy_item import BoundaryProxyItem
+        
+        proxies = [item for item in self.scene.selectedItems() if isinstance(item, BoundaryProxyItem)]
+        expanded = sum(1 for proxy in proxies
+                       if self.boundary_controller.expand_boundary(proxy.boundary))
+        self.statusBar().showMessage(f"Expanded {expanded} boundaries", 3000)
+    
+    def _selected_devices(self):
+        """Return the selected devices."""
+        # Not isinstance(): the scene's devices come from src.models.device,
+        # a different class than the models.device.Device imported here
+        devices = self.device_manager.devices
+        return [item for item in self.scene.selectedItems()
+                if devices.get(getattr(item, 'id', None)) is item]
+    
+    def _arrange_devices(self, devices, compute, description):
+        """Move devices to the centers computed from their boxes, as one undo step.
+        
+        Args:
+            devices (list): Devices to arrange
+            compute (callable): Maps a list of (x, y, width, height) boxes to new (x, y) centers
+            description (str): Undo/redo text
+        """
+        positions = [device.pos() for device in devices]
+        boxes = [(pos.x(), pos.y(), device.width, device.height)
+                 for device, pos in zip(devices, positions)]
+        targets = compute(boxes)
+        
+        moves = [(device, old, QPointF(x, y))
+                 for device, old, (x, y) in zip(devices, positions, targets)
+                 if old.x() != x or old.y() != y]
+        if not moves:
+            return
+        
+        self.undo_redo_manager.execute_command(
+            MoveDevicesCommand(self.device_manager, moves, description))
+    
+    def _on_align(self, edge):
+        """Align the selected devices."""
+        devices = self._selected_devices()
+        if len(devices) < 2:
+            self.statusBar().showMessage("Select at least two devices to align", 3000)
+            return
+        self._arrange_devices(devices, lambda boxes: arrange.align(boxes, edge),
+                              f"Align {len(devices)} devices {edge}")
+    
+    def _on_distribute(self, axis):
+        """Distribute the selected devices evenly."""
+        devices = self._selected_devices()
+        if len(devices) < 3:
+            self.statusBar().showMessage("Select at least three devices to distribute", 3000)
+            return
+        self._arrange_devices(devices, lambda boxes: arrange.distribute(boxes, axis),
+                              f"Distribute {len(devices)} devices {axis}ly")
+    
+    def _on_pack_grid(self):
+        """Pack the selected devices into a grid."""
+        devices = self._selected_devices()
+        if len(devices) < 2:
+            self.statusBar().showMessage("Select at least two devices to pack", 3000)
+            return
+        self._arrange_devices(devices, arrange.pack_grid,
+                              f"Pack {len(devices)} devices into a grid")
+    
+    def _on_force_layout(self):
+        """Start a force-directed layout of all devices."""
+        try:
+            started = self.layout_controller.start_force_layout()
+        except ImportError as e:
+            QMessageBox.warning(self, "Automatic Layout", str(e))
+            return
+        if not started:
+            self.statusBar().showMessage("Nothing to lay out", 3000)
+    
+    def _on_layered_layout(self):
+        """Lay out the selected devices in tiers, or all devices if fewer than two are selected."""
+        devices = self._selected_devices()
+        if not self.layout_controller.apply_layered_layout(devices if len(devices) >= 2 else None):
+            self.statusBar().showMessage("Nothing to lay out", 3000)
+    
+    def _on_boundary_layout(self):
+        """Lay out the devices inside their boundaries and pack the boundaries."""
+        boundaries = self.boundary_controller.boundaries.values()
+        if any(self.boundary_controller.is_collapsed(boundary) for boundary in boundaries):
+            self.statusBar().showMessage("Expand all boundaries before laying them out", 3000)
+            return
+        if not self.layout_controller.apply_boundary_layout(self.boundary_controller):
+            self.statusBar().showMessage("Nothing to lay out; draw boundaries first", 3000)
+    
+    def _on_show_statistics(self):
+        """Show statistics of the topology graph."""
+        summary = self.analytics_controller.summary()
+        degree = summary['degree']
+        QMessageBox.information(
+            self,
+            "Topology Statistics",
+            f"Devices: {summary['devices']}\n"
+            f"Connections: {summary['connections']}\n"
+            f"Connected components: {summary['components']} "
+            f"(largest: {summary['largest_component']} devices)\n"
+            f"Connections per device: min {degree['min']}, max {degree['max']}, "
+            f"mean {degree['mean']:.2f}, median {degree['median']:g}\n"
+            f"Diameter: {summary['diameter']} hops"
+        )
+    
+    def _on_shortest_path(self):
+        """Select a shortest path between the two selected devices."""
+        devices = self._selected_devices()
+        if len(devices) != 2:
+            self.statusBar().showMessage("Select exactly two devices", 3000)
+            return
+        path = self.analytics_controller.shortest_path(devices[0], devices[1])
+        if path is None:
+            self.statusBar().showMessage(f"No path between {devices[0].name} and {devices[1].name}", 3000)
+            return
+        for device in path:
+            device.setSelected(True)
+        self.statusBar().showMessage(f"Shortest path: {len(path) - 1} hops via "
+                                     + " → ".join(device.name for device in path), 5000)
+    
+    def _on_resilience_report(self):
+        """Highlight single points of failure and list them."""
+        devices, connections = self.resilience_controller.find()
+        self.highlight_failures_action.setChecked(True)
+        self.statusBar().showMessage(
+            f"{len(devices)} single-point-of-failure devices, {len(connections)} bridge links", 5000)
+        self.resilience_controller.show_report(self)
+    
+    def _on_layout_started(self, description):
+        """Block further layouts until this one ends."""
+        self.force_layout_action.setEnabled(False)
+        self.layered_layout_action.setEnabled(False)
+        self.boundary_layout_action.setEnabled(False)
+        self.cancel_layout_action.setEnabled(True)
+        self.statusBar().showMessage(f"{description}...")
+    
+    def _on_layout_progress(self, iteration, iterations):
+        """Show how far the running layout is."""
+        self.statusBar().showMessage(f"Layout: iteration {iteration} of {iterations}")
+    
+    def _on_layout_finished(self, message):
+        """Re-enable layouts and report the result."""
+        self.force_layout_action.setEnabled(True)
+        self.layered_layout_action.setEnabled(True)
+        self.boundary_layout_action.setEnabled(True)
+        self.cancel_layout_action.setEnabled(False)
+        self.statusBar().showMessage(message, 3000)
+    
+    def _on_toggle_performance_view(self, enabled):
+        """Switch between the default and the performance view configuration."""
+        # Loading a file registers devices without device_added
+        self.view_performance.device_count = len(self.device_manager.devices)
+        self.view_performance.set_performance_mode(enabled)
+        self.opengl_view_action.setEnabled(enabled)
+        self.statusBar().showMessage(self.view_performance.describe(), 3000)
+    
     def _on_zoom_in(self):
         """Zoom in the view."""
         self.view.scale(1.2, 1.2)
@@ -4,6 +4,8 @@ from PyQt5.QtWidgets import QApplication
 import weakref
 import traceback
 
+from utils.perf_counters import perf
+
 class ModeManager(QObject):
     """Manager for handling different interaction modes in the canvas."""
     
@@ -143,6 +145,7 @@ class ModeManager(QObject):
             import traceback
             traceback.print_exc()
     
+    @perf.timed('mode_manager.eventFilter')
     def eventFilter(self, obj, event):
         """Filter events from the view."""
         try:
@@ -2,6 +2,11 @@ from PyQt5.QtCore import QObject, Qt, QPointF, QEvent
 from PyQt5.QtGui import QPen, QColor, QMouseEvent
 import traceback
 
+from utils.perf_counters import perf
+from utils.logger import get_logger, DEBUG
+
+log = get_logger('mouse')
+
 class MouseHandler(QObject):
     """Handles mouse events for the network topology designer."""
     
@@ -36,6 +41,7 @@ class MouseHandler(QObject):
         # Install event filter
         self.view.viewport().installEventFilter(self)
         
+    @perf.timed('mouse_handler.eventFilter')
     def eventFilter(self, obj, event):
         """Filter events for mouse handling."""
         try:
@@ -83,8 +89,8 @@ class MouseHandler(QObject):
             # Get current mode from canvas controller
             current_mode = self.canvas.current_mode if hasattr(self.canvas, 'current_mode') else "selection"
             
-            print(f"Mouse press in mode: {current_mode} at {scene_pos.x():.1f}, {scene_pos.y():.1f}")
-            print(f"MouseHandler handling event in mode: {current_mode}")
+            if log.isEnabledFor(DEBUG):
+                log.debug("Mouse press in mode %s at %.1f, %.1f", current_mode, scene_pos.x(), scene_pos.y())
             
             # Let canvas controller handle the event based on current mode
             if hasattr(self.canvas, 'handle_click'):
@@ -92,12 +98,10 @@ class MouseHandler(QObject):
                 # Ensure we return a boolean
                 return bool(result) if result is not None else False
             else:
-                print("Warning: Canvas controller has no handle_click method")
+                log.warning("Canvas controller has no handle_click method")
                 return False
         except Exception as e:
-            print(f"Error in handle_mouse_press: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Error in handle_mouse_press: %s", e)
             return False
     
     def handle_mouse_move(self, event):
@@ -120,9 +124,7 @@ class MouseHandler(QObject):
             return False
             
         except Exception as e:
-            print(f"Error in handle_mouse_move: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Error in handle_mouse_move: %s", e)
             return False
     
     def handle_mouse_release(self, event):
@@ -131,12 +133,10 @@ class MouseHandler(QObject):
             # Get scene position
             scene_pos = self.view.mapToScene(event.pos())
             
-            print(f"Mouse released at scene position: ({scene_pos.x():.1f}, {scene_pos.y():.1f})")
-            
             # Get current mode from canvas controller
             current_mode = self.canvas.current_mode if hasattr(self.canvas, 'current_mode') else "selection"
-            print(f"Mouse released in mode: {current_mode}")
-            print(f"Scene position: ({scene_pos.x():.1f}, {scene_pos.y():.1f})")
+            if log.isEnabledFor(DEBUG):
+                log.debug("Mouse release in mode %s at %.1f, %.1f", current_mode, scene_pos.x(), scene_pos.y())
             
             # Let the canvas controller handle the release
             if hasattr(self.canvas, 'handle_mouse_release'):
@@ -144,14 +144,12 @@ class MouseHandler(QObject):
                 # Ensure we return a boolean value
                 return bool(handled) if handled is not None else False
             else:
-                print("Warning: Canvas controller has no handle_mouse_release method")
+                log.warning("Canvas controller has no handle_mouse_release method")
             
             return False  # Always return a boolean
             
         except Exception as e:
-            print(f"Error in handle_mouse_release: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Error in handle_mouse_release: %s", e)
             return False  # Return a boolean even on error
     
     def handle_wheel(self, event):
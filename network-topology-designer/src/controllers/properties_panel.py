@@ -1,14 +1,20 @@
+from collections import OrderedDict
+from collections.abc import Mapping
+
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QFormLayout, QLabel, QLineEdit, 
     QComboBox, QPushButton, QGroupBox, QSpinBox, QColorDialog,
-    QHBoxLayout, QCheckBox
+    QHBoxLayout, QCheckBox, QStackedWidget
 )
-from PyQt5.QtCore import Qt, QObject, pyqtSignal, pyqtSlot
+from PyQt5.QtCore import Qt, QObject, QTimer, pyqtSignal, pyqtSlot
 from PyQt5.QtGui import QColor
 
 class PropertyEditorFactory:
     """Factory to create property editors based on property type."""
     
+    # Shown in an editor when the selected items disagree on a value
+    MIXED_VALUES_TEXT = "(multiple values)"
+    
     @staticmethod
     def create_editor(property_name, property_value, parent=None):
         """Create an appropriate editor for a property."""
@@ -81,6 +87,61 @@ class PropertyEditorFactory:
             editor.setText(str(property_value))
             return editor
     
+    @staticmethod
+    def set_editor_value(editor, property_name, property_value):
+        """Rebind an existing editor to a new value without emitting change signals."""
+        blocked = editor.blockSignals(True)
+        try:
+            if isinstance(editor, QCheckBox):
+                editor.setTristate(False)
+                editor.setChecked(bool(property_value))
+            elif isinstance(editor, QSpinBox) or hasattr(editor, 'decimals'):
+                editor.setSpecialValueText("")
+                editor.setValue(property_value)
+            elif isinstance(editor, QComboBox):
+                index = editor.findText(str(property_value))
+                if index < 0:
+                    editor.addItem(str(property_value))
+                    index = editor.count() - 1
+                editor.setCurrentIndex(index)
+            elif isinstance(editor, QPushButton) and property_name.lower().endswith('color'):
+                color = QColor(property_value)
+                if color.isValid():
+                    editor.setStyleSheet(f"background-color: {color.name()}; color: {'black' if color.lightness() > 128 else 'white'}")
+                    editor.setText(color.name())
+                else:
+                    editor.setStyleSheet("")
+                    editor.setText("Select Color")
+            else:
+                editor.setPlaceholderText("")
+                editor.setText(str(property_value))
+        finally:
+            editor.blockSignals(blocked)
+    
+    @staticmethod
+    def set_editor_mixed(editor, property_name):
+        """Show that the selected items have different values for a property."""
+        mixed_text = PropertyEditorFactory.MIXED_VALUES_TEXT
+        blocked = editor.blockSignals(True)
+        try:
+            if isinstance(editor, QCheckBox):
+                editor.setTristate(True)
+                editor.setCheckState(Qt.PartiallyChecked)
+            elif isinstance(editor, QSpinBox) or hasattr(editor, 'decimals'):
+                # The special value text is shown while the value sits at the minimum
+                editor.setSpecialValueText(mixed_text)
+                editor.setValue(editor.minimum())
+            elif isinstance(editor, QComboBox):
+                editor.setCurrentIndex(-1)
+            elif isinstance(editor, QPushButton) and property_name.lower().endswith('color'):
+                editor.setStyleSheet("")
+                editor.setText(mixed_text)
+            else:
+                editor.clear()
+                editor.setPlaceholderText(mixed_text)
+        finally:
+            editor.blockSignals(blocked)
+    
     @staticmethod
     def get_editor_value(editor):
         """Get the value from a property editor."""
@@ -105,13 +166,37 @@ class PropertiesPanel(QWidget):
     # Signal emitted when properties change
     propertiesChanged = pyqtSignal(object, dict)
     
+    # Signal emitted with (items, changed properties) when editing a multi-selection
+    bulkPropertiesChanged = pyqtSignal(list, dict)
+    
+    # Number of editor pages kept alive for reuse
+    MAX_CACHED_PAGES = 8
+    
+    # Delay before the panel follows the selection, so arrowing through
+    # items only rebinds editors for the item the user settles on
+    UPDATE_DELAY_MS = 40
+    
     def __init__(self, parent=None):
         """Initialize the properties panel."""
         super().__init__(parent)
         
         self.current_item = None
+        self.current_items = []
         self.editors = {}
         
+        # Properties the user touched since the editors were last bound
+        self._dirty = set()
+        
+        # Editor pages keyed by property schema, least recently used first
+        self._pages = OrderedDict()
+        
+        # Debounce timer for selection changes
+        self._pending_item = None
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(self.UPDATE_DELAY_MS)
+        self._update_timer.timeout.connect(self._flush_pending_item)
+        
         self._create_ui()
     
     def _create_ui(self):
@@ -123,15 +208,23 @@ class PropertiesPanel(QWidget):
         self.header_label.setStyleSheet("font-weight: bold; font-size: 14px;")
         main_layout.addWidget(self.header_label)
         
-        # Properties form
+        # Multi-selection option: show properties shared by all items or by any item
+        self.union_checkbox = QCheckBox("Show properties of any selected item")
+        self.union_checkbox.setVisible(False)
+        self.union_checkbox.toggled.connect(self._on_union_toggled)
+        main_layout.addWidget(self.union_checkbox)
+        
+        # Properties form; one page per property schema is stacked here
         self.properties_group = QGroupBox("Properties")
-        self.properties_layout = QFormLayout(self.properties_group)
+        group_layout = QVBoxLayout(self.properties_group)
+        self.pages_stack = QStackedWidget()
+        group_layout.addWidget(self.pages_stack)
         
         main_layout.addWidget(self.properties_group)
         
         # Initial message when no item is selected
         self.no_selection_label = QLabel("Select an item to edit its properties.")
-        self.properties_layout.addRow(self.no_selection_label)
+        self.pages_stack.addWidget(self.no_selection_label)
         
         # Button to apply changes
         self.apply_button = QPushButton("Apply Changes")
@@ -143,20 +236,66 @@ class PropertiesPanel(QWidget):
         # Add stretch to push everything to the top
         main_layout.addStretch()
     
-    def set_item(self, item):
-        """Set the item whose properties will be edited."""
-        self.current_item = item
-        self.editors.clear()
+    def set_item(self, item, immediate=False):
+        """Set the item whose properties will be edited.
         
-        # Clear previous form
-        while self.properties_layout.rowCount() > 0:
-            self.properties_layout.removeRow(0)
+        Rapid successive calls are coalesced; only the last item is shown.
+        
+        Args:
+            item: Item to edit, or None to clear the panel
+            immediate (bool): Bind the item right away instead of debouncing
+        """
+        self._pending_item = item
+        if immediate:
+            self._flush_pending_item()
+        else:
+            self._update_timer.start()
+    
+    def set_items(self, items, immediate=False):
+        """Set the selected items; several items switch the panel to bulk editing.
+        
+        Args:
+            items (list): Selected items
+            immediate (bool): Bind the items right away instead of debouncing
+        """
+        items = list(items)
+        if len(items) <= 1:
+            self.set_item(items[0] if items else None, immediate)
+            return
+        
+        self._pending_item = items
+        if immediate:
+            self._flush_pending_item()
+        else:
+            self._update_timer.start()
+    
+    def _flush_pending_item(self):
+        """Bind the most recently requested item (or items) to the editors."""
+        self._update_timer.stop()
+        item = self._pending_item
+        self._pending_item = None
+        if isinstance(item, list):
+            self._bind_items(item)
+        else:
+            self._bind_item(item)
+    
+    def _on_union_toggled(self, checked):
+        """Rebuild the multi-selection view when switching union/intersection."""
+        if self.current_items:
+            self._bind_items(self.current_items)
+    
+    def _bind_item(self, item):
+        """Show the editor page for an item's schema and load its values."""
+        self.current_item = item
+        self.current_items = []
+        self.union_checkbox.setVisible(False)
+        self._dirty.clear()
         
         if not item:
             # No item selected
             self.header_label.setText("No Item Selected")
-            self.no_selection_label = QLabel("Select an item to edit its properties.")
-            self.properties_layout.addRow(self.no_selection_label)
+            self.editors = {}
+            self.pages_stack.setCurrentWidget(self.no_selection_label)
             self.apply_button.setEnabled(False)
             return
         
@@ -168,47 +307,157 @@ class PropertiesPanel(QWidget):
         else:
             self.header_label.setText("Item Properties")
         
-        # Add property editors
-        if hasattr(item, 'properties') and isinstance(item.properties, dict):
-            for name, value in item.properties.items():
-                # Skip certain properties
-                if name == 'id':
-                    label = QLabel(str(value))
-                    self.properties_layout.addRow("ID:", label)
-                    continue
-                
-                # Create appropriate editor for the property
-                editor = PropertyEditorFactory.create_editor(name, value, self)
-                
-                # Special handling for color editor
-                if isinstance(editor, QPushButton) and name.lower().endswith('color'):
-                    # Connect color button to color dialog
-                    editor.clicked.connect(
-                        lambda checked, btn=editor: self._select_color(btn)
-                    )
-                
-                # Store editor for later retrieval
-                self.editors[name] = editor
-                
-                # Add to form
-                self.properties_layout.addRow(f"{name.replace('_', ' ').title()}:", editor)
+        values = self._collect_values(item)
+        page, editors, id_label = self._get_page(self._schema_key(item, values), values)
         
-        # Additional properties for specific item types
-        if hasattr(item, 'device_type'):
-            # Device specific properties
-            type_editor = PropertyEditorFactory.create_editor('device_type', item.device_type, self)
-            self.editors['device_type'] = type_editor
-            self.properties_layout.addRow("Device Type:", type_editor)
+        # Rebind values into the pooled editors
+        for name, value in values.items():
+            if name == 'id':
+                id_label.setText(str(value))
+            else:
+                PropertyEditorFactory.set_editor_value(editors[name], name, value)
         
-        elif hasattr(item, 'connection_type'):
-            # Connection specific properties
-            conn_editor = PropertyEditorFactory.create_editor('connection_type', item.connection_type, self)
-            self.editors['connection_type'] = conn_editor
-            self.properties_layout.addRow("Connection Type:", conn_editor)
+        self.editors = editors
+        self.pages_stack.setCurrentWidget(page)
         
         # Enable apply button
         self.apply_button.setEnabled(True)
     
+    def _bind_items(self, items):
+        """Show the shared (or combined) properties of several items."""
+        self.current_item = None
+        self.current_items = items
+        self.union_checkbox.setVisible(True)
+        self._dirty.clear()
+        
+        self.header_label.setText(f"{len(items)} Items Selected")
+        
+        all_values = [self._collect_values(item) for item in items]
+        use_union = self.union_checkbox.isChecked()
+        
+        # Ordered property names, following the first item where possible
+        names = []
+        seen = set()
+        for values in all_values:
+            for name in values:
+                if name not in seen:
+                    seen.add(name)
+                    names.append(name)
+        if not use_union:
+            names = [name for name in names if all(name in values for values in all_values)]
+        names = [name for name in names if name != 'id']
+        
+        # Sample value per property (drives the editor type) and whether items agree
+        merged = {}
+        mixed = set()
+        missing = object()
+        for name in names:
+            sample = missing
+            for values in all_values:
+                value = values.get(name, missing)
+                if value is missing:
+                    mixed.add(name)
+                elif sample is missing:
+                    sample = value
+                elif value != sample:
+                    mixed.add(name)
+            merged[name] = sample
+        
+        schema_key = ('multiple', use_union, tuple((name, type(value).__name__) for name, value in merged.items()))
+        page, editors, _ = self._get_page(schema_key, merged)
+        
+        for name, value in merged.items():
+            if name in mixed:
+                PropertyEditorFactory.set_editor_mixed(editors[name], name)
+            else:
+                PropertyEditorFactory.set_editor_value(editors[name], name, value)
+        
+        self.editors = editors
+        self.pages_stack.setCurrentWidget(page)
+        self.apply_button.setEnabled(bool(editors))
+    
+    def _watch_editor(self, name, editor):
+        """Record when the user edits a property so bulk edits only touch changed fields."""
+        mark = lambda *args, name=name: self._dirty.add(name)
+        if isinstance(editor, QCheckBox):
+            editor.clicked.connect(lambda checked, btn=editor: btn.setTristate(False))
+            editor.clicked.connect(mark)
+        elif isinstance(editor, QSpinBox) or hasattr(editor, 'decimals'):
+            editor.valueChanged.connect(mark)
+        elif isinstance(editor, QComboBox):
+            editor.activated.connect(mark)
+        elif isinstance(editor, QLineEdit):
+            editor.textEdited.connect(mark)
+        elif isinstance(editor, QPushButton):
+            editor.clicked.connect(mark)
+    
+    @staticmethod
+    def _collect_values(item):
+        """Return the ordered property values shown for an item."""
+        values = {}
+        if hasattr(item, 'properties') and isinstance(item.properties, Mapping):
+            values.update(item.properties)
+        
+        # Additional properties for specific item types
+        if hasattr(item, 'device_type'):
+            values['device_type'] = item.device_type
+        elif hasattr(item, 'connection_type'):
+            values['connection_type'] = item.connection_type
+        return values
+    
+    @staticmethod
+    def _schema_key(item, values):
+        """Return the key identifying which editor layout an item needs."""
+        item_type = getattr(item, 'device_type', None) or getattr(item, 'connection_type', None)
+        fields = tuple((name, type(value).__name__) for name, value in values.items())
+        return (type(item).__name__, item_type, fields)
+    
+    def _get_page(self, schema_key, values):
+        """Return a pooled (page, editors, id_label) for a schema, building it if needed."""
+        if schema_key in self._pages:
+            self._pages.move_to_end(schema_key)
+            return self._pages[schema_key]
+        
+        page = QWidget()
+        layout = QFormLayout(page)
+        layout.setContentsMargins(0, 0, 0, 0)
+        editors = {}
+        id_label = None
+        
+        for name, value in values.items():
+            if name == 'id':
+                id_label = QLabel(str(value))
+                layout.addRow("ID:", id_label)
+                continue
+            
+            # Create appropriate editor for the property
+            editor = PropertyEditorFactory.create_editor(name, value, page)
+            
+            # Special handling for color editor
+            if isinstance(editor, QPushButton) and name.lower().endswith('color'):
+                # Connect color button to color dialog
+                editor.clicked.connect(
+                    lambda checked, btn=editor: self._select_color(btn)
+                )
+            
+            # Store editor for later retrieval
+            editors[name] = editor
+            self._watch_editor(name, editor)
+            
+            # Add to form
+            layout.addRow(f"{name.replace('_', ' ').title()}:", editor)
+        
+        self.pages_stack.addWidget(page)
+        self._pages[schema_key] = (page, editors, id_label)
+        
+        # Evict the least recently used page once the pool is full
+        while len(self._pages) > self.MAX_CACHED_PAGES:
+            _, (old_page, _, _) = self._pages.popitem(last=False)
+            self.pages_stack.removeWidget(old_page)
+            old_page.deleteLater()
+        
+        return self._pages[schema_key]
+    
     def _select_color(self, button):
         """Open color dialog when a color button is clicked."""
         # Get current color
@@ -229,13 +478,20 @@ class PropertiesPanel(QWidget):
     
     def apply_changes(self):
         """Apply the edited properties to the current item."""
+        if self._update_timer.isActive():
+            self._flush_pending_item()
+        
+        if self.current_items:
+            self._apply_bulk_changes()
+            return
+        
         if not self.current_item:
             return
         
         # Collect new property values
         new_properties = {}
         
-        if hasattr(self.current_item, 'properties') and isinstance(self.current_item.properties, dict):
+        if hasattr(self.current_item, 'properties') and isinstance(self.current_item.properties, Mapping):
             # Start with copy of existing properties
             new_properties = self.current_item.properties.copy()
             
@@ -267,4 +523,22 @@ class PropertiesPanel(QWidget):
             old_properties = self.current_item.properties.copy()
             
             # For undo/redo - the receiver should create an EditPropertiesCommand
-            self.propertiesChanged.emit(self.current_item, new_properties)
\ No newline at end of file
+            self.propertiesChanged.emit(self.current_item, new_properties)
+    
+    def _apply_bulk_changes(self):
+        """Emit the fields the user changed for every selected item in one batch."""
+        changes = {}
+        for name in self._dirty:
+            editor = self.editors.get(name)
+            if editor is None:
+                continue
+            value = PropertyEditorFactory.get_editor_value(editor)
+            if value == PropertyEditorFactory.MIXED_VALUES_TEXT:
+                continue
+            changes[name] = value
+        
+        self._dirty.clear()
+        
+        if changes:
+            # The receiver should create a single BulkEditPropertiesCommand
+            self.bulkPropertiesChanged.emit(list(self.current_items), changes)
@@ -0,0 +1,151 @@
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QLabel, QListWidget, QListWidgetItem, QDialogButtonBox
+)
+from PyQt5.QtCore import Qt, QObject, QTimer
+
+from views.resilience_overlay import ResilienceOverlay
+from utils.logger import get_logger
+
+log = get_logger('devices')
+
+
+class ResilienceReportDialog(QDialog):
+    """Lists the articulation point devices and bridge connections.
+
+    Double-clicking an entry selects it and scrolls the view to it.
+    """
+
+    def __init__(self, devices, connections, view=None, parent=None):
+        super().__init__(parent)
+        self.view = view
+        self.setWindowTitle("Resilience Report")
+        self.resize(420, 480)
+
+        layout = QVBoxLayout(self)
+        if not devices and not connections:
+            layout.addWidget(QLabel("No single points of failure: every device and link is redundant."))
+        else:
+            layout.addWidget(QLabel(f"{len(devices)} devices whose failure splits the network:"))
+            device_list = QListWidget()
+            for device in sorted(devices, key=lambda d: d.name):
+                entry = QListWidgetItem(f"{device.name} ({device.device_type}, "
+                                        f"{len(getattr(device, 'connections', ()))} connections)")
+                entry.setData(Qt.UserRole, device)
+                device_list.addItem(entry)
+            device_list.itemDoubleClicked.connect(self._show_item)
+            layout.addWidget(device_list)
+
+            layout.addWidget(QLabel(f"{len(connections)} links whose failure splits the network:"))
+            connection_list = QListWidget()
+            for connection in connections:
+                entry = QListWidgetItem(f"{connection.source_device.name} — {connection.target_device.name}")
+                entry.setData(Qt.UserRole, connection)
+                connection_list.addItem(entry)
+            connection_list.itemDoubleClicked.connect(self._show_item)
+            layout.addWidget(connection_list)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Close)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def _show_item(self, entry):
+        item = entry.data(Qt.UserRole)
+        scene = item.scene() if hasattr(item, 'scene') else None
+        if scene is None:
+            # Hidden, e.g. inside a collapsed boundary
+            return
+        scene.clearSelection()
+        item.setSelected(True)
+        if self.view is not None:
+            self.view.centerOn(item.sceneBoundingRect().center())
+
+
+class ResilienceController(QObject):
+    """Finds single points of failure and highlights them on the canvas.
+
+    Articulation points and bridges come from the AnalyticsController's
+    graph, which computes them at most once per change. While the
+    highlight is on, edits are collected and the highlight is refreshed
+    once after they settle, and device moves only reposition it.
+    """
+
+    # Delay before the highlight follows edits to the topology
+    REFRESH_DELAY_MS = 100
+
+    def __init__(self, analytics_controller, scene, view=None, parent=None):
+        """Initialize the controller.
+
+        Args:
+            analytics_controller: AnalyticsController providing the graph
+            scene: TopologyScene to highlight on
+            view (optional): View scrolled to entries picked in the report
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.analytics_controller = analytics_controller
+        self.scene = scene
+        self.view = view
+        self.overlay = None
+        self._highlighted = set()
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(self.REFRESH_DELAY_MS)
+        self._refresh_timer.timeout.connect(self._refresh)
+
+        analytics_controller.graph_changed.connect(self._on_graph_changed)
+        if hasattr(scene, 'geometry_changed'):
+            scene.geometry_changed.connect(self._on_geometry_changed)
+
+    @property
+    def highlight_enabled(self):
+        return self.overlay is not None
+
+    def set_highlight_enabled(self, enabled):
+        """Show or hide the highlight of single points of failure."""
+        if enabled and self.overlay is None:
+            self.overlay = ResilienceOverlay()
+            self.scene.addItem(self.overlay)
+            self._refresh()
+        elif not enabled and self.overlay is not None:
+            if self.overlay.scene() is self.scene:
+                self.scene.removeItem(self.overlay)
+            self.overlay = None
+            self._highlighted = set()
+            self._refresh_timer.stop()
+
+    def find(self):
+        """Return (articulation point devices, bridge connections)."""
+        return self.analytics_controller.single_points_of_failure()
+
+    def show_report(self, parent=None):
+        """Turn on the highlight and show the report dialog."""
+        devices, connections = self.find()
+        log.info("Resilience report: %d articulation points, %d bridges", len(devices), len(connections))
+        self.set_highlight_enabled(True)
+        dialog = ResilienceReportDialog(devices, connections, self.view, parent)
+        dialog.exec_()
+        return devices, connections
+
+    def _on_graph_changed(self):
+        if self.overlay is not None:
+            self._refresh_timer.start()
+
+    def _on_geometry_changed(self, item):
+        # Moving a highlighted device only repositions the highlight
+        if self.overlay is not None and item in self._highlighted and not self._refresh_timer.isActive():
+            self.overlay.refresh()
+
+    def _refresh(self):
+        if self.overlay is None:
+            return
+        if self.overlay.scene() is not self.scene:
+            # The scene was cleared
+            self.scene.addItem(self.overlay)
+        devices, connections = self.find()
+        # Bridges move with their end points
+        self._highlighted = set(devices)
+        for connection in connections:
+            self._highlighted.add(connection.source_device)
+            self._highlighted.add(connection.target_device)
+        self.overlay.set_targets(devices, connections)
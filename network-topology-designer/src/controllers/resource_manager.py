@@ -1,6 +1,10 @@
 from PyQt5.QtGui import QPixmap, QIcon
 import os
 
+from utils.logger import get_logger
+
+log = get_logger('resources')
+
 class ResourceManager:
     """Manager for loading and caching application resources."""
     
@@ -57,7 +61,7 @@ class ResourceManager:
         # Get icon path
         icon_path = self.device_icons.get(device_type, self.device_icons.get("generic"))
         if not icon_path:
-            print(f"No icon found for device type: {device_type}")
+            log.warning("No icon found for device type: %s", device_type)
             return None
             
         # Full path
@@ -66,7 +70,7 @@ class ResourceManager:
         # Try to load pixmap
         pixmap = QPixmap(full_path)
         if pixmap.isNull():
-            print(f"Failed to load pixmap from {full_path}")
+            log.warning("Failed to load pixmap from %s", full_path)
             return None
             
         # Scale if needed
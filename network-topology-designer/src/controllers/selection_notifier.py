@@ -0,0 +1,56 @@
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from utils.perf_counters import perf
+
+
+class SelectionNotifier(QObject):
+    """Batches scene selection changes into one notification per frame.
+
+    While the view's rubber band is dragged, QGraphicsScene.setSelectionArea()
+    runs on every mouse move and emits selectionChanged each time the set of
+    items under the band changes. Listeners connected to selection_changed
+    instead get the selected items at most once per frame, and once more
+    right when the band is released, so a drag over thousands of devices
+    does not rebuild the properties panel on every mouse move.
+    """
+
+    # Emitted with the list of selected items
+    selection_changed = pyqtSignal(list)
+
+    # Selection notifications are batched to one per frame
+    NOTIFY_INTERVAL_MS = 16
+
+    def __init__(self, scene, view=None, parent=None):
+        """Initialize the notifier.
+
+        Args:
+            scene: QGraphicsScene whose selection is followed
+            view (optional): QGraphicsView whose rubber band is followed
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.scene = scene
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.NOTIFY_INTERVAL_MS)
+        self._timer.timeout.connect(self.flush)
+
+        scene.selectionChanged.connect(self._on_selection_changed)
+        if view is not None:
+            view.rubberBandChanged.connect(self._on_rubber_band_changed)
+
+    def _on_selection_changed(self):
+        perf.increment('selection.changes')
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _on_rubber_band_changed(self, rect, from_pos, to_pos):
+        # A null rect means the band was released: deliver the final selection now
+        if rect.isNull() and self._timer.isActive():
+            self.flush()
+
+    def flush(self):
+        """Send the pending notification right away."""
+        self._timer.stop()
+        perf.increment('selection.notifications')
+        self.selection_changed.emit(self.scene.selectedItems())
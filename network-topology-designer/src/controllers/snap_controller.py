@@ -0,0 +1,217 @@
+from PyQt5.QtCore import QObject, Qt, QPointF, QLineF, QRectF
+from PyQt5.QtGui import QPen, QColor
+from PyQt5.QtWidgets import QApplication
+
+from models.device import is_device
+from utils.logger import get_logger, DEBUG
+
+log = get_logger('devices')
+
+
+class SnapController(QObject):
+    """Snaps dragged devices to the grid and to smart alignment guides.
+
+    Devices call snap_drag() from itemChange while the user drags them. The
+    device under the mouse decides the snap; every other selected device is
+    shifted by the same offset, so a dragged selection keeps its shape. Guides
+    align the dragged device's left edge, center or right edge (top, center,
+    bottom vertically) with those of nearby devices, found through the
+    DeviceManager's anchor index, so each drag step only looks at the few
+    devices around the cursor. Holding Alt suspends snapping.
+    """
+
+    DEFAULT_GRID_SIZE = 20
+
+    # Snap when an anchor is this close, in screen pixels
+    SNAP_DISTANCE_PX = 6
+
+    # Only devices this close to the dragged one can produce guides (scene units)
+    SEARCH_RADIUS = 800
+
+    GUIDE_COLOR = QColor(230, 0, 140)
+
+    def __init__(self, scene, device_manager, grid_size=None):
+        """Initialize the controller and register it with the scene.
+
+        Args:
+            scene: TopologyScene whose devices are snapped
+            device_manager: DeviceManager providing the anchor index
+            grid_size (int, optional): Grid spacing in scene units
+        """
+        super().__init__()
+        self.scene = scene
+        self.device_manager = device_manager
+        self.grid_size = grid_size or self.DEFAULT_GRID_SIZE
+        self.grid_enabled = False
+        self.guides_enabled = False
+
+        # Guide lines currently shown, in scene coordinates
+        self.guides = []
+
+        # Current drag: the grabbed item, the start positions of the moved
+        # items, and the snap offset of the last mouse delta
+        self._drag_grabber = None
+        self._drag_origins = {}
+        self._drag_delta = None
+        self._drag_offset = QPointF()
+
+        scene.snap_controller = self
+
+    @property
+    def enabled(self):
+        """Whether any kind of snapping is on."""
+        return self.grid_enabled or self.guides_enabled
+
+    def set_grid_enabled(self, enabled):
+        """Turn snap-to-grid on or off."""
+        self.grid_enabled = bool(enabled)
+
+    def set_guides_enabled(self, enabled):
+        """Turn smart guides on or off."""
+        self.guides_enabled = bool(enabled)
+        if not enabled:
+            self.clear_guides()
+
+    def snap_drag(self, device, pos):
+        """Return where a dragged device should go when Qt moves it to `pos`.
+
+        Qt moves every selected item by the same mouse delta. The snap offset
+        is computed once per delta, from the device under the mouse, and
+        added to each of them.
+        """
+        # The grabber is often a child of the device (its icon or label)
+        grabber = self.scene.mouseGrabberItem()
+        while grabber is not None and not is_device(grabber):
+            grabber = grabber.parentItem()
+        if grabber is None:
+            return pos
+
+        if grabber is not self._drag_grabber:
+            # First move of a drag; nothing has moved yet
+            self._drag_grabber = grabber
+            self._drag_origins = {item: item.pos() for item in self.scene.selectedItems()}
+            self._drag_origins[grabber] = grabber.pos()
+            self._drag_delta = None
+
+        origin = self._drag_origins.get(device)
+        if origin is None:
+            # Moved by something other than the drag
+            return pos
+
+        delta = pos - origin
+        key = (delta.x(), delta.y())
+        if key != self._drag_delta:
+            raw = self._drag_origins[grabber] + delta
+            self._drag_offset = self.snap(grabber, raw) - raw
+            self._drag_delta = key
+        return pos + self._drag_offset
+
+    def end_drag(self):
+        """Forget the current drag and hide its guides."""
+        self._drag_grabber = None
+        self._drag_origins = {}
+        self._drag_delta = None
+        self.clear_guides()
+
+    def snap(self, device, pos):
+        """Return where a device should go when it is dragged to `pos`."""
+        if QApplication.keyboardModifiers() & Qt.AltModifier:
+            self.clear_guides()
+            return pos
+
+        x, y = pos.x(), pos.y()
+        snapped_x = snapped_y = False
+        guides = []
+        if self.guides_enabled:
+            x, y, snapped_x, snapped_y, guides = self._snap_to_guides(device, x, y)
+
+        if self.grid_enabled:
+            grid = self.grid_size
+            if not snapped_x:
+                x = round(x / grid) * grid
+            if not snapped_y:
+                y = round(y / grid) * grid
+
+        self._set_guides(guides)
+        return QPointF(x, y)
+
+    def _tolerance(self):
+        """Return the snap distance in scene units at the current zoom."""
+        views = self.scene.views()
+        scale = abs(views[0].transform().m11()) if views else 1.0
+        return self.SNAP_DISTANCE_PX / max(scale, 1e-6)
+
+    def _snap_to_guides(self, device, x, y):
+        """Align a device centered at (x, y) with nearby devices.
+
+        Returns:
+            tuple: (x, y, snapped x, snapped y, guide lines)
+        """
+        tolerance = self._tolerance()
+        half_w = device.width / 2
+        half_h = device.height / 2
+        devices = self.device_manager.devices
+
+        best_dx = best_dy = None
+        match_x = match_y = None
+        for key, cx, cy in self.device_manager.anchor_index.query_radius(x, y, self.SEARCH_RADIUS):
+            other = devices.get(key)
+            # Other selected devices move along with this one
+            if other is None or other is device or other.isSelected():
+                continue
+            other_w = other.width / 2
+            other_h = other.height / 2
+
+            for offset in (-half_w, 0, half_w):
+                for target in (cx - other_w, cx, cx + other_w):
+                    dx = target - (x + offset)
+                    if abs(dx) <= tolerance and (best_dx is None or abs(dx) < abs(best_dx)):
+                        best_dx = dx
+                        match_x = (target, cy - other_h, cy + other_h)
+
+            for offset in (-half_h, 0, half_h):
+                for target in (cy - other_h, cy, cy + other_h):
+                    dy = target - (y + offset)
+                    if abs(dy) <= tolerance and (best_dy is None or abs(dy) < abs(best_dy)):
+                        best_dy = dy
+                        match_y = (target, cx - other_w, cx + other_w)
+
+        guides = []
+        if best_dx is not None:
+            x += best_dx
+        if best_dy is not None:
+            y += best_dy
+
+        # Guides run from the matched device to the dragged one
+        if match_x is not None:
+            target, top, bottom = match_x
+            guides.append(QLineF(target, min(top, y - half_h), target, max(bottom, y + half_h)))
+        if match_y is not None:
+            target, left, right = match_y
+            guides.append(QLineF(min(left, x - half_w), target, max(right, x + half_w), target))
+
+        if guides and log.isEnabledFor(DEBUG):
+            log.debug("Snapped %s to guides at %.1f, %.1f", getattr(device, 'name', device), x, y)
+        return x, y, best_dx is not None, best_dy is not None, guides
+
+    def clear_guides(self):
+        """Hide the guides, e.g. when the drag ends."""
+        self._set_guides([])
+
+    def _set_guides(self, guides):
+        if guides == self.guides:
+            return
+        old, self.guides = self.guides, guides
+        for line in old + guides:
+            rect = QRectF(line.p1(), line.p2()).normalized()
+            self.scene.update(rect.adjusted(-2, -2, 2, 2))
+
+    def paint_guides(self, painter):
+        """Draw the current guides; called from the scene's drawForeground."""
+        if not self.guides:
+            return
+        painter.save()
+        # Cosmetic pen: one pixel wide at any zoom
+        painter.setPen(QPen(self.GUIDE_COLOR, 0, Qt.DashLine))
+        painter.drawLines(self.guides)
+        painter.restore()
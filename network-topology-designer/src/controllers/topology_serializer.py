@@ -23,7 +23,7 @@ class TopologySerializer:
                         'type': item.device_type,
                         'x': item.pos().x(),
                         'y': item.pos().y(),
-                        'properties': item.properties
+                        'properties': dict(item.properties)
                     }
                     topology_data['devices'].append(device_data)
                 
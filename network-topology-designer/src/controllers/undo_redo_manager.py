@@ -152,6 +152,64 @@ class MoveDeviceCommand(Command):
         self.device.setPos(self.old_position)
 
 
+class MoveDevicesCommand(Command):
+    """Command to move many devices at once as one undo step."""
+    
+    def __init__(self, device_manager, moves, description=None):
+        """Initialize the command.
+        
+        Args:
+            device_manager: DeviceManager that applies the moves
+            moves (list): (device, old QPointF, new QPointF) tuples
+            description (str, optional): Text shown for undo/redo
+        """
+        super().__init__(description or f"Move {len(moves)} devices")
+        self.device_manager = device_manager
+        self.moves = list(moves)
+    
+    def execute(self):
+        """Execute the command by moving every device to its new position."""
+        self.device_manager.move_devices([(device, new) for device, old, new in self.moves])
+    
+    def undo(self):
+        """Undo the command by moving every device back."""
+        self.device_manager.move_devices([(device, old) for device, old, new in self.moves])
+
+
+class LayoutBoundariesCommand(Command):
+    """Command to move devices and move/resize boundaries as one undo step."""
+    
+    def __init__(self, device_manager, boundary_controller, moves, resizes, description=None):
+        """Initialize the command.
+        
+        Args:
+            device_manager: DeviceManager that moves the devices
+            boundary_controller: BoundaryController that updates the boundaries and zones
+            moves (list): (device, old QPointF, new QPointF) tuples
+            resizes (list): (boundary, old QRectF, new QRectF) tuples in scene coordinates
+            description (str, optional): Text shown for undo/redo
+        """
+        super().__init__(description or f"Lay out {len(resizes)} boundaries")
+        self.device_manager = device_manager
+        self.boundary_controller = boundary_controller
+        self.moves = list(moves)
+        self.resizes = list(resizes)
+    
+    def execute(self):
+        """Execute the command by applying the new layout."""
+        self.boundary_controller.apply_layout(
+            self.device_manager,
+            [(device, new) for device, old, new in self.moves],
+            [(boundary, new) for boundary, old, new in self.resizes])
+    
+    def undo(self):
+        """Undo the command by restoring the previous layout."""
+        self.boundary_controller.apply_layout(
+            self.device_manager,
+            [(device, old) for device, old, new in self.moves],
+            [(boundary, old) for boundary, old, new in self.resizes])
+
+
 class AddConnectionCommand(Command):
     """Command to add a connection between devices."""
     
@@ -303,32 +361,103 @@ class AddBoundaryCommand(Command):
 class EditPropertiesCommand(Command):
     """Command to edit properties of an item."""
     
-    def __init__(self, item, old_properties, new_properties):
-        """Initialize the edit properties command."""
+    def __init__(self, item, old_properties, new_properties, device_manager=None):
+        """Initialize the edit properties command.
+        
+        Args:
+            item: Item to edit
+            old_properties (dict): Properties before the edit
+            new_properties (dict): Properties after the edit
+            device_manager: Optional DeviceManager whose search index is refreshed
+        """
         super().__init__("Edit properties")
         self.item = item
         self.old_properties = old_properties.copy()
         self.new_properties = new_properties.copy()
+        self.device_manager = device_manager
     
     def execute(self):
         """Execute the command to edit properties."""
         self.item.properties = self.new_properties.copy()
-        
-        # Update visual representation if needed
-        if hasattr(self.item, "update_visual"):
-            self.item.update_visual()
-        elif hasattr(self.item, "update_appearance"):
-            self.item.update_appearance()
+        self._refresh_item()
     
     def undo(self):
         """Undo the command by restoring old properties."""
         self.item.properties = self.old_properties.copy()
-        
-        # Update visual representation if needed
+        self._refresh_item()
+    
+    def _refresh_item(self):
+        """Update the item's visual representation and search index entry."""
         if hasattr(self.item, "update_visual"):
             self.item.update_visual()
         elif hasattr(self.item, "update_appearance"):
             self.item.update_appearance()
+        
+        if self.device_manager and hasattr(self.item, 'device_type'):
+            self.device_manager.reindex_device(self.item)
+
+
+class BulkEditPropertiesCommand(Command):
+    """Command to apply the same property changes to many items as one undo step."""
+    
+    # Attributes edited through the properties panel that live outside item.properties
+    TYPE_ATTRIBUTES = ('device_type', 'connection_type')
+    
+    def __init__(self, items, changes, device_manager=None):
+        """Initialize the bulk edit command.
+        
+        Args:
+            items (list): Items to edit
+            changes (dict): Property names mapped to their new value
+            device_manager: Optional DeviceManager whose search index is refreshed
+        """
+        super().__init__(f"Edit properties of {len(items)} items")
+        self.items = list(items)
+        self.changes = dict(changes)
+        self.device_manager = device_manager
+        
+        # Snapshot of the previous values, (item, properties copy, type attributes)
+        self.old_states = []
+        for item in self.items:
+            properties = getattr(item, 'properties', None)
+            attributes = {name: getattr(item, name) for name in self.TYPE_ATTRIBUTES
+                          if name in self.changes and hasattr(item, name)}
+            self.old_states.append((item, dict(properties) if properties is not None else None, attributes))
+    
+    def execute(self):
+        """Execute the command by applying the changes to every item."""
+        for item in self.items:
+            for name, value in self.changes.items():
+                if name in self.TYPE_ATTRIBUTES:
+                    if hasattr(item, name):
+                        setattr(item, name, value)
+                elif getattr(item, 'properties', None) is not None:
+                    item.properties[name] = value
+        
+        self._refresh_items()
+    
+    def undo(self):
+        """Undo the command by restoring every item's previous values."""
+        for item, properties, attributes in self.old_states:
+            if properties is not None:
+                item.properties = dict(properties)
+            for name, value in attributes.items():
+                setattr(item, name, value)
+        
+        self._refresh_items()
+    
+    def _refresh_items(self):
+        """Update each item's visual representation once after all changes."""
+        for item in self.items:
+            if hasattr(item, "update_visual"):
+                item.update_visual()
+            elif hasattr(item, "update_appearance"):
+                item.update_appearance()
+            elif hasattr(item, "update"):
+                item.update()
+            
+            if self.device_manager and hasattr(item, 'device_type'):
+                self.device_manager.reindex_device(item)
 
 
 class UndoRedoManager(QObject):
@@ -14,14 +14,27 @@ class ViewFactory:
     """
     
     @staticmethod
-    def create_graphics_view():
-        """Create and configure a QGraphicsView for the network topology."""
+    def create_graphics_view(performance_mode=False, opengl=False):
+        """Create and configure a QGraphicsView for the network topology.
+        
+        Args:
+            performance_mode (bool): Use the performance-oriented view configuration
+            opengl (bool): Render through an OpenGL viewport in performance mode
+        """
+        from controllers.view_performance import ViewPerformanceConfig
+        
         view = QGraphicsView()
         view.setRenderHint(QPainter.Antialiasing)
         view.setDragMode(QGraphicsView.RubberBandDrag)
         view.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
         view.setResizeAnchor(QGraphicsView.AnchorUnderMouse)
         view.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+        
+        # Keep the configuration with the view so it can be toggled later
+        view.performance_config = ViewPerformanceConfig(view)
+        if performance_mode:
+            view.performance_config.opengl_requested = opengl
+            view.performance_config.set_performance_mode(True)
         return view
     
     @staticmethod
@@ -5,12 +5,13 @@ from PyQt5.QtCore import Qt, QRectF, QPointF
 class ViewManager:
     """Manages view operations such as zoom, pan, and view transformations."""
     
-    def __init__(self, main_window, view, scene, canvas_controller=None):
+    def __init__(self, main_window, view, scene, canvas_controller=None, show_border=True):
         """Initialize the view manager."""
         self.main_window = main_window
         self.view = view
         self.scene = scene
         self.canvas_controller = canvas_controller
+        self.show_border = show_border
         
         # Initialize view settings
         self.current_zoom = 1.0
@@ -24,7 +25,8 @@ class ViewManager:
     def _setup_view(self):
         """Set up the view."""
         # No need to add grid here - let canvas_controller handle it
-        self._add_border()
+        if self.show_border:
+            self._add_border()
     
     # Remove or comment out the _add_grid method, or modify it to use canvas_controller:
     # def _add_grid(self):
@@ -88,8 +90,8 @@ class ViewManager:
     def center_on_item(self, item):
         """Center the view on a specific item."""
         if item:
-            scene_pos = item.scenePos()
-            self.view.centerOn(scene_pos)
+            # Center on the visual middle rather than the item's top-left origin
+            self.view.centerOn(item.sceneBoundingRect().center())
     
     def get_center_point(self):
         """Get the center point of the current view."""
@@ -0,0 +1,135 @@
+from PyQt5.QtWidgets import QGraphicsView, QWidget
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from utils.logger import get_logger
+
+log = get_logger('app')
+
+
+class ViewPerformanceConfig(QObject):
+    """Switches a QGraphicsView between the default and a performance-oriented configuration.
+
+    Performance mode selects the viewport update strategy from the scene size,
+    skips painter state saving, caches the background and can render through
+    an OpenGL viewport (falling back to the software raster viewport).
+    """
+
+    # Emitted with a short description whenever the configuration changes
+    configuration_changed = pyqtSignal(str)
+
+    # Scenes with more devices than this use MinimalViewportUpdate in performance mode
+    LARGE_SCENE_DEVICES = 1000
+
+    def __init__(self, view, scene=None):
+        """Initialize with the default (quality-first) configuration."""
+        super().__init__(view)
+        self.view = view
+        self.scene = scene or view.scene()
+
+        self.performance_mode = False
+        self.opengl_requested = False
+        self.opengl_active = False
+
+        # Number of devices in the scene, as last reported by the owner
+        self.device_count = None
+
+    def describe(self):
+        """Return a short description of the active configuration."""
+        if not self.performance_mode:
+            return "Default rendering"
+        mode = {
+            QGraphicsView.MinimalViewportUpdate: "minimal",
+            QGraphicsView.SmartViewportUpdate: "smart",
+            QGraphicsView.FullViewportUpdate: "full",
+            QGraphicsView.BoundingRectViewportUpdate: "bounding rect",
+        }.get(self.view.viewportUpdateMode(), "custom")
+        backend = "OpenGL" if self.opengl_active else "software"
+        return f"Performance rendering ({mode} updates, {backend})"
+
+    def set_performance_mode(self, enabled):
+        """Enable or disable the performance-oriented configuration."""
+        self.performance_mode = bool(enabled)
+        self.apply()
+
+    def set_opengl(self, enabled):
+        """Request (or drop) the OpenGL viewport; only used in performance mode."""
+        self.opengl_requested = bool(enabled)
+        self.apply()
+
+    def apply(self):
+        """Apply the current configuration to the view."""
+        view = self.view
+        if self.performance_mode:
+            view.setOptimizationFlag(QGraphicsView.DontSavePainterState, True)
+            view.setCacheMode(QGraphicsView.CacheBackground)
+            self.update_viewport_mode()
+        else:
+            view.setOptimizationFlag(QGraphicsView.DontSavePainterState, False)
+            view.setCacheMode(QGraphicsView.CacheNone)
+            view.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+
+        self._apply_viewport(self.performance_mode and self.opengl_requested)
+
+        view.resetCachedContent()
+        view.viewport().update()
+        self.configuration_changed.emit(self.describe())
+
+    def update_viewport_mode(self, device_count=None):
+        """Pick Smart or Minimal viewport updates from the number of devices.
+
+        Owners report the count they keep (e.g. len(DeviceManager.devices))
+        whenever devices are added or removed. Until one is reported the
+        top-level scene items are counted, which is O(N).
+        """
+        if device_count is not None:
+            self.device_count = device_count
+        if not self.performance_mode:
+            return
+
+        count = self.device_count
+        if count is None:
+            scene = self.scene or self.view.scene()
+            count = sum(1 for item in scene.items() if item.parentItem() is None) if scene else 0
+
+        if count > self.LARGE_SCENE_DEVICES:
+            mode = QGraphicsView.MinimalViewportUpdate
+        else:
+            mode = QGraphicsView.SmartViewportUpdate
+
+        if self.view.viewportUpdateMode() != mode:
+            self.view.setViewportUpdateMode(mode)
+            self.configuration_changed.emit(self.describe())
+
+    def _apply_viewport(self, use_opengl):
+        """Install an OpenGL or software viewport widget."""
+        if use_opengl == self.opengl_active:
+            return
+
+        if use_opengl:
+            try:
+                from PyQt5.QtWidgets import QOpenGLWidget
+                from PyQt5.QtGui import QSurfaceFormat
+
+                widget = QOpenGLWidget()
+                surface_format = QSurfaceFormat()
+                surface_format.setSamples(4)
+                widget.setFormat(surface_format)
+                self.view.setViewport(widget)
+                self.opengl_active = True
+
+                # The GL context only exists once the widget is shown
+                QTimer.singleShot(0, self._verify_opengl)
+                return
+            except Exception as e:
+                log.warning("OpenGL viewport unavailable, using software rendering: %s", e)
+
+        self.view.setViewport(QWidget())
+        self.opengl_active = False
+
+    def _verify_opengl(self):
+        """Fall back to software rendering if the OpenGL context could not be created."""
+        viewport = self.view.viewport()
+        if self.opengl_active and hasattr(viewport, 'isValid') and not viewport.isValid():
+            log.warning("OpenGL context could not be created, using software rendering")
+            self.opengl_requested = False
+            self.apply()
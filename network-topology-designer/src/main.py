@@ -3,24 +3,35 @@
 Network Topology Designer - Main Entry Point
 """
 import sys
+import multiprocessing
 import os
 import logging
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
 # Add parent directory to path to enable relative imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
+# Time imports and startup steps when started with --profile-startup
+from src.utils.startup_profiler import profiler
+PROFILE_STARTUP = "--profile-startup" in sys.argv
+if PROFILE_STARTUP:
+    profiler.enable()
+
+# Set up logging; nothing is written to disk unless --log-file is given
+from src.utils.logger import configure_logging, get_logger
+configure_logging(level=logging.DEBUG if "--debug" in sys.argv else logging.INFO,
+                  log_file="--log-file" in sys.argv)
+logger = get_logger('app')
+profiler.mark("logging configured")
+
 # Now import modules
 from src.controllers.main_window import MainWindow
 from src.utils.resource_path import get_resource_path
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import Qt
+profiler.mark("modules imported")
 
 def init_resources():
     """Initialize application resources."""
@@ -29,6 +40,10 @@ def init_resources():
         try:
             import resources_rc
             logger.info("Qt resources initialized successfully")
+            
+            # Resolve names from the compiled bundle through the manifest too
+            from utils.resource_manifest import get_manifest
+            get_manifest().add_qt_resources()
         except ImportError:
             logger.warning("Qt resources module not found. Using filesystem resources.")
     except Exception as e:
@@ -61,22 +76,30 @@ def main():
     
     # Check resources
     check_resources()
+    profiler.mark("resources checked")
     
     # Create application with explicit args
     app = QApplication(sys.argv)
     app.setApplicationName("Network Topology Designer")
     app.setOrganizationName("NISTO")
+    profiler.mark("QApplication created")
     
     # Create and show main window with try/except
     try:
         logger.info("Creating main window...")
         main_window = MainWindow()
+        profiler.mark("MainWindow created")
         logger.info("Showing main window...")
         main_window.show()
         logger.info("Main window shown successfully")
         
         # Process some events to ensure window appears
         app.processEvents()
+        profiler.mark("window shown")
+        
+        if PROFILE_STARTUP:
+            profiler.disable()
+            profiler.report()
         
     except Exception as e:
         logger.exception("Error creating or showing main window")
@@ -89,4 +112,6 @@ def main():
     return app.exec_()
 
 if __name__ == "__main__":
+    # Layout workers are started as separate processes
+    multiprocessing.freeze_support()
     sys.exit(main())
\ No newline at end of file
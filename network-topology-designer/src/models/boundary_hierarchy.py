@@ -0,0 +1,328 @@
+"""
+Nested boundaries and device membership.
+
+Boundaries nest by containment (site > building > rack): the parent of a
+boundary is the smallest boundary that fully contains it. Every device
+belongs to the innermost boundary containing its position, if any.
+
+Both boundaries and devices are kept in uniform grid indexes, so adding a
+boundary, moving a device or asking "which zone is this device in" only
+looks at the few cells involved instead of every boundary. Membership is
+maintained incrementally: moving a device only checks the boundaries
+overlapping its grid cell.
+
+This module has no Qt dependency; BoundaryController feeds it scene
+coordinates and applies batched moves to the graphics items.
+"""
+import math
+
+
+class _GridIndex:
+    """Maps keys to the grid cells covered by their rectangles."""
+
+    def __init__(self, cell_size):
+        self.cell_size = float(cell_size)
+        self._cells = {}
+        self._keys = {}
+
+    def _cell_range(self, rect):
+        x0, y0, x1, y1 = rect
+        size = self.cell_size
+        return (math.floor(x0 / size), math.floor(y0 / size),
+                math.floor(x1 / size), math.floor(y1 / size))
+
+    def insert(self, key, rect):
+        """Insert (or move) a key covering `rect` = (x0, y0, x1, y1)."""
+        cells = self._cell_range(rect)
+        old = self._keys.get(key)
+        if old == cells:
+            return
+        if old is not None:
+            self._remove_cells(key, old)
+        self._keys[key] = cells
+        cx0, cy0, cx1, cy1 = cells
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                self._cells.setdefault((cx, cy), set()).add(key)
+
+    def remove(self, key):
+        cells = self._keys.pop(key, None)
+        if cells is not None:
+            self._remove_cells(key, cells)
+
+    def _remove_cells(self, key, cells):
+        cx0, cy0, cx1, cy1 = cells
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = self._cells.get((cx, cy))
+                if bucket is not None:
+                    bucket.discard(key)
+                    if not bucket:
+                        del self._cells[(cx, cy)]
+
+    def query_point(self, x, y):
+        """Return the keys whose cells include the point (candidates only)."""
+        size = self.cell_size
+        return self._cells.get((math.floor(x / size), math.floor(y / size)), ())
+
+    def query_rect(self, rect):
+        """Return the keys whose cells overlap the rectangle (candidates only)."""
+        cx0, cy0, cx1, cy1 = self._cell_range(rect)
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(self._cells):
+            # Huge query: scanning the occupied cells is cheaper
+            found = set()
+            for (cx, cy), bucket in self._cells.items():
+                if cx0 <= cx <= cx1 and cy0 <= cy <= cy1:
+                    found.update(bucket)
+            return found
+        found = set()
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = self._cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        return found
+
+
+def _contains_point(rect, x, y):
+    x0, y0, x1, y1 = rect
+    return x0 <= x <= x1 and y0 <= y <= y1
+
+
+def _contains_rect(outer, inner):
+    return (outer[0] <= inner[0] and outer[1] <= inner[1]
+            and inner[2] <= outer[2] and inner[3] <= outer[3])
+
+
+def _overlaps(a, b):
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def _area(rect):
+    return (rect[2] - rect[0]) * (rect[3] - rect[1])
+
+
+class BoundaryHierarchy:
+    """Nested boundaries with incrementally maintained device membership."""
+
+    def __init__(self, cell_size=400):
+        """Initialize an empty hierarchy.
+
+        Args:
+            cell_size (float): Grid cell size in scene units; roughly the size
+                of a small boundary works well
+        """
+        self.rects = {}            # boundary ID -> (x0, y0, x1, y1)
+        self.parent = {}           # boundary ID -> parent boundary ID or None
+        self.children = {}         # boundary ID -> set of child boundary IDs
+        self.members = {}          # boundary ID -> set of device IDs directly inside
+        self.device_positions = {} # device ID -> (x, y)
+        self.device_zone = {}      # device ID -> innermost boundary ID or None
+        self._boundary_index = _GridIndex(cell_size)
+        self._device_index = _GridIndex(cell_size)
+
+    # --- Queries -----------------------------------------------------------
+
+    def zone_of(self, device_id):
+        """Return the ID of the innermost boundary containing a device, or None."""
+        return self.device_zone.get(device_id)
+
+    def zone_path(self, device_id):
+        """Return the boundary IDs containing a device, innermost first."""
+        path = []
+        boundary_id = self.device_zone.get(device_id)
+        while boundary_id is not None:
+            path.append(boundary_id)
+            boundary_id = self.parent.get(boundary_id)
+        return path
+
+    def innermost_at(self, x, y):
+        """Return the ID of the innermost boundary containing a point, or None."""
+        best = None
+        best_area = None
+        for boundary_id in self._boundary_index.query_point(x, y):
+            rect = self.rects[boundary_id]
+            if _contains_point(rect, x, y):
+                area = _area(rect)
+                if best is None or area < best_area:
+                    best, best_area = boundary_id, area
+        return best
+
+    def boundaries_overlapping(self, rect):
+        """Return the IDs of the boundaries whose rect overlaps rect = (x0, y0, x1, y1)."""
+        return [boundary_id for boundary_id in self._boundary_index.query_rect(rect)
+                if _overlaps(self.rects[boundary_id], rect)]
+
+    def descendants(self, boundary_id):
+        """Return the IDs of all boundaries nested inside a boundary."""
+        result = []
+        stack = list(self.children.get(boundary_id, ()))
+        while stack:
+            child = stack.pop()
+            result.append(child)
+            stack.extend(self.children.get(child, ()))
+        return result
+
+    def devices_in(self, boundary_id, recursive=True):
+        """Return the IDs of the devices in a boundary (and, by default, its descendants)."""
+        devices = set(self.members.get(boundary_id, ()))
+        if recursive:
+            for child in self.descendants(boundary_id):
+                devices.update(self.members.get(child, ()))
+        return devices
+
+    def roots(self):
+        """Return the IDs of the boundaries not nested in any other boundary."""
+        return [boundary_id for boundary_id, parent in self.parent.items() if parent is None]
+
+    # --- Boundaries --------------------------------------------------------
+
+    def add_boundary(self, boundary_id, rect):
+        """Add (or replace) a boundary with rect = (x0, y0, x1, y1)."""
+        if boundary_id in self.rects:
+            self.remove_boundary(boundary_id)
+
+        rect = tuple(rect)
+        self.rects[boundary_id] = rect
+        self.children[boundary_id] = set()
+        self.members[boundary_id] = set()
+        self._boundary_index.insert(boundary_id, rect)
+
+        self._set_parent(boundary_id, self._find_parent(boundary_id))
+
+        # Boundaries the new one now encloses move under it
+        for other in self._boundary_index.query_rect(rect):
+            if other == boundary_id or not _contains_rect(rect, self.rects[other]):
+                continue
+            if self._find_parent(other) == boundary_id:
+                self._set_parent(other, boundary_id)
+
+        self._reassign_devices_in(rect)
+
+    def remove_boundary(self, boundary_id):
+        """Remove a boundary; its children and devices move to its parent."""
+        rect = self.rects.pop(boundary_id, None)
+        if rect is None:
+            return
+        self._boundary_index.remove(boundary_id)
+
+        parent = self.parent.pop(boundary_id, None)
+        if parent is not None:
+            self.children[parent].discard(boundary_id)
+        for child in self.children.pop(boundary_id, ()):
+            self.parent[child] = None
+            self._set_parent(child, self._find_parent(child))
+
+        for device_id in self.members.pop(boundary_id, ()):
+            self.device_zone[device_id] = None
+            self._assign_device(device_id)
+
+    def update_boundary(self, boundary_id, rect):
+        """Move or resize a boundary on its own (its contents stay where they are)."""
+        if self.rects.get(boundary_id) == tuple(rect):
+            return
+        self.add_boundary(boundary_id, rect)
+
+    def move_boundary(self, boundary_id, dx, dy):
+        """Move a boundary together with its nested boundaries and devices.
+
+        The caller moves the corresponding graphics items; membership inside
+        the moved group does not change, so this only updates positions and
+        the group's relation to the rest of the hierarchy.
+
+        Returns:
+            tuple: (moved boundary IDs, moved device IDs)
+        """
+        if boundary_id not in self.rects:
+            return [], []
+
+        boundaries = [boundary_id] + self.descendants(boundary_id)
+        devices = self.devices_in(boundary_id)
+
+        for moved in boundaries:
+            x0, y0, x1, y1 = self.rects[moved]
+            rect = (x0 + dx, y0 + dy, x1 + dx, y1 + dy)
+            self.rects[moved] = rect
+            self._boundary_index.insert(moved, rect)
+        for device_id in devices:
+            x, y = self.device_positions[device_id]
+            self.device_positions[device_id] = (x + dx, y + dy)
+            self._device_index.insert(device_id, (x + dx, y + dy, x + dx, y + dy))
+
+        # The group may have been moved into or out of another boundary
+        self._set_parent(boundary_id, self._find_parent(boundary_id, exclude=set(boundaries)))
+
+        # Boundaries outside the group may now be enclosed by it, and devices
+        # outside the group may now lie inside it
+        group = set(boundaries)
+        rect = self.rects[boundary_id]
+        for other in self._boundary_index.query_rect(rect):
+            if other not in group and _contains_rect(rect, self.rects[other]):
+                self._set_parent(other, self._find_parent(other))
+        self._reassign_devices_in(rect)
+
+        return boundaries, list(devices)
+
+    def _find_parent(self, boundary_id, exclude=()):
+        """Return the smallest other boundary fully containing a boundary."""
+        rect = self.rects[boundary_id]
+        best = None
+        best_area = None
+        for other in self._boundary_index.query_point(rect[0], rect[1]):
+            if other == boundary_id or other in exclude:
+                continue
+            other_rect = self.rects[other]
+            if not _contains_rect(other_rect, rect) or other_rect == rect and other > boundary_id:
+                # Identical rectangles nest by ID so they do not parent each other
+                continue
+            area = _area(other_rect)
+            if best is None or area < best_area:
+                best, best_area = other, area
+        return best
+
+    def _set_parent(self, boundary_id, parent):
+        old = self.parent.get(boundary_id)
+        if old is not None and old != parent:
+            self.children[old].discard(boundary_id)
+        self.parent[boundary_id] = parent
+        if parent is not None:
+            self.children[parent].add(boundary_id)
+
+    # --- Devices -----------------------------------------------------------
+
+    def move_device(self, device_id, x, y):
+        """Add or move a device.
+
+        Returns:
+            tuple or None: (old zone, new zone) if the device changed zone
+        """
+        self.device_positions[device_id] = (x, y)
+        self._device_index.insert(device_id, (x, y, x, y))
+
+        return self._assign_device(device_id)
+
+    def remove_device(self, device_id):
+        """Forget a device."""
+        self.device_positions.pop(device_id, None)
+        self._device_index.remove(device_id)
+        zone = self.device_zone.pop(device_id, None)
+        if zone is not None:
+            self.members[zone].discard(device_id)
+
+    def _assign_device(self, device_id):
+        """Recompute the zone of a device; returns (old, new) if it changed."""
+        x, y = self.device_positions[device_id]
+        old = self.device_zone.get(device_id)
+        new = self.innermost_at(x, y)
+        if new == old and device_id in self.device_zone:
+            return None
+        if old is not None and old in self.members:
+            self.members[old].discard(device_id)
+        self.device_zone[device_id] = new
+        if new is not None:
+            self.members[new].add(device_id)
+        return old, new
+
+    def _reassign_devices_in(self, rect):
+        for device_id in self._device_index.query_rect(rect):
+            self._assign_device(device_id)
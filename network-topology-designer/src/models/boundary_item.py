@@ -80,20 +80,66 @@ class BoundaryItem(QGraphicsItemGroup):
             if hasattr(self, 'selection_changed'):
                 self.selection_changed.emit(self, bool(value))
         
+        elif change == QGraphicsItemGroup.ItemPositionHasChanged:
+            # Members are cached by the boundary controller
+            scene = self.scene()
+            if scene is not None and hasattr(scene, 'notify_geometry_changed'):
+                scene.notify_geometry_changed(self)
+        
         return super().itemChange(change, value)
     
+    def scene_rect(self):
+        """Return the boundary rectangle in scene coordinates."""
+        return self.mapRectToScene(self.rect)
+    
+    def set_rect(self, rect):
+        """Resize the boundary to `rect` (in item coordinates)."""
+        self.rect = QRectF(rect)
+        
+        # A group only recomputes its bounds when children are added
+        self.removeFromGroup(self.rect_item)
+        self.rect_item.setRect(self.rect)
+        self.addToGroup(self.rect_item)
+        self.rect_item.stackBefore(self.name_item)
+        
+        self.name_item.setPos(self.rect.x() + 10, self.rect.y() + 10)
+        self.type_item.setPos(self.rect.x() + 10, self.rect.y() + 35)
+        
+        scene = self.scene()
+        if scene is not None and hasattr(scene, 'notify_geometry_changed'):
+            scene.notify_geometry_changed(self)
+    
     def contains_point(self, scene_pos):
         """Check if the boundary contains the given scene position."""
         item_pos = self.mapFromScene(scene_pos)
         return self.rect_item.contains(item_pos)
     
-    def get_contained_items(self, scene):
-        """Get all items contained within this boundary."""
+    def get_contained_items(self, scene=None, accept=None):
+        """Get the top-level items whose bounding rect lies inside this boundary.
+        
+        The query goes through the scene's spatial index, so its cost depends
+        on the number of items inside the boundary, not in the scene.
+        
+        Args:
+            scene: Scene to search (defaults to the boundary's scene)
+            accept (callable, optional): Reports only the items for which it
+                returns True; by default every item except boundaries
+        """
+        scene = scene or self.scene()
+        if scene is None:
+            return []
+        
         items = []
-        for item in scene.items():
-            if item != self and item not in self.childItems():
-                if self.contains_point(item.scenePos()):
-                    items.append(item)
+        for item in scene.items(self.scene_rect(), Qt.ContainsItemBoundingRect):
+            # Child items (icons, labels, ports) belong to their parent
+            if item is self or item.parentItem() is not None:
+                continue
+            if accept is not None:
+                if not accept(item):
+                    continue
+            elif isinstance(item, BoundaryItem):
+                continue
+            items.append(item)
         return items
     
     def update_name(self, name):
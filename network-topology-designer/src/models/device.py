@@ -1,15 +1,32 @@
 # network-topology-designer/src/models/device.py
-from PyQt5.QtCore import QPointF, pyqtSignal, Qt
+from PyQt5.QtCore import QPointF, QRectF, pyqtSignal, Qt
 from PyQt5.QtWidgets import (QGraphicsItemGroup, QGraphicsItem, QGraphicsTextItem,
                             QGraphicsRectItem, QGraphicsPathItem, QGraphicsEllipseItem,
                             QGraphicsPixmapItem)
-from PyQt5.QtGui import QPixmap, QFont, QPen, QBrush, QColor, QPainterPath
+from PyQt5.QtGui import QPixmap, QFont, QPen, QBrush, QColor, QPainterPath, QStaticText
 import uuid
 import os
 from utils.resource_manager import ResourceManager
+from models.property_store import PropertyStore, freeze_defaults
+from models.port_table import PortTable, get_port_layout
+from views.port_indicator_item import PortIndicatorItem, PortIndicatorPainter
+from utils.logger import get_logger, DEBUG
 import math
 import random  # For generating unique IDs
 
+log = get_logger('devices')
+
+
+def is_device(item):
+    """Return True if a scene item is a network device.
+    
+    Checked by attribute rather than with isinstance(): main.py puts both src
+    and its parent on sys.path, so this module is loaded as models.device and
+    as src.models.device, and the two Device classes are different.
+    """
+    return hasattr(item, 'device_type')
+
+
 class Device(QGraphicsItemGroup):
     """Unified device class for network topology.
     
@@ -39,6 +56,7 @@ class Device(QGraphicsItemGroup):
         SWITCH: {
             'vlan_support': True,
             'port_count': 24,
+            'port_layout': 'switch',
             'switching_capacity': '48 Gbps',
             'icon': ':/icons/switch.png',
         },
@@ -71,9 +89,31 @@ class Device(QGraphicsItemGroup):
         }
     }
     
+    # Base properties shared by all device types
+    BASE_PROPERTIES = {
+        'id': "",
+        'description': "",
+        'ip_address': "",
+        'mac_address': "",
+        'status': "active",
+    }
+    
+    # Shared default property layers, built once per device type
+    _default_layers = {}
+    
     # Counter for generating unique IDs
     _id_counter = 0
     
+    # When enabled, new devices are a single item that paints its icon, label,
+    # selection and ports itself instead of a group of ~10 child items
+    compact_rendering = False
+    
+    # During a batch move, the connections to refresh once it ends (see begin_batch_move)
+    _batch_connections = None
+    
+    # Icons shared by all compact devices of a type
+    _compact_icons = {}
+    
     def __init__(self, name, device_type):
         super().__init__()
         
@@ -92,14 +132,16 @@ class Device(QGraphicsItemGroup):
         self.properties = self._get_default_properties()
         self.connections = []
         self.port_count = self._get_port_count()
+        self.compact = self.compact_rendering
         
-        # Create visual components
-        self._build_visual_representation()
-        
-        # Create the selection visual indicator (but keep it hidden initially)
-        self._selection_indicator = self._create_selection_indicator()
-        self.addToGroup(self._selection_indicator)
-        self._selection_indicator.setVisible(False)
+        if not self.compact:
+            # Create visual components
+            self._build_visual_representation()
+            
+            # Create the selection visual indicator (but keep it hidden initially)
+            self._selection_indicator = self._create_selection_indicator()
+            self.addToGroup(self._selection_indicator)
+            self._selection_indicator.setVisible(False)
         
         # Core properties
         self.id = str(uuid.uuid4())[:8]
@@ -114,30 +156,21 @@ class Device(QGraphicsItemGroup):
         # Connection points/ports
         self.ports = []
         
-        # Base properties for all devices
-        self.properties.update({
-            'id': self.id,
-            'description': "",
-            'ip_address': "",
-            'mac_address': "",
-            'status': "active",
-        })
-        
-        # Add device-specific properties
-        if device_type in self.DEVICE_PROPERTIES:
-            # Copy only non-visual properties
-            for key, value in self.DEVICE_PROPERTIES[device_type].items():
-                if key != 'icon':  # Skip the icon property
-                    self.properties[key] = value
+        # Base and device-specific properties come from the shared default
+        # layer; only the per-device ID is stored on this device
+        self.properties['id'] = self.id
         
         # Set position
         self.setPos(0, 0)
         
         # Create visual representation
-        self._create_visual()
+        if self.compact:
+            self._init_compact_visual()
+        else:
+            self._create_visual()
         self._init_ports()
         
-        print(f"Device created: {self.name} ({self.device_type}) at position (0, 0)")
+        log.debug("Device created: %s (%s)", self.name, self.device_type)
     
     @classmethod
     def create(cls, device_type, x=0, y=0, name=None):
@@ -165,6 +198,24 @@ class Device(QGraphicsItemGroup):
         
         return device
     
+    @classmethod
+    def set_compact_rendering(cls, enabled):
+        """Choose the rendering mode for devices created from now on."""
+        cls.compact_rendering = bool(enabled)
+    
+    @classmethod
+    def begin_batch_move(cls):
+        """Defer connection updates of moved devices until end_batch_move()."""
+        if cls._batch_connections is None:
+            cls._batch_connections = set()
+    
+    @classmethod
+    def end_batch_move(cls):
+        """Stop deferring and return the connections of the devices moved meanwhile."""
+        connections = cls._batch_connections or set()
+        cls._batch_connections = None
+        return connections
+    
     @classmethod
     def _get_next_id(cls):
         """
@@ -182,6 +233,91 @@ class Device(QGraphicsItemGroup):
         cls._id_counter += 1
         return cls._id_counter
 
+    def _init_compact_visual(self):
+        """Set up single-item rendering: shared icon, cached label, painted ports."""
+        pixmap = self._compact_icons.get(self.device_type)
+        if pixmap is None:
+            pixmap = ResourceManager.load_device_icon(self.device_type)
+            self._compact_icons[self.device_type] = pixmap
+        self._compact_pixmap = pixmap
+        if not pixmap.isNull():
+            self.width = pixmap.width()
+            self.height = pixmap.height()
+        
+        # Pre-laid-out label text, so painting does not re-run text layout
+        self._label_font = QFont()
+        self._label_font.setPointSize(8)
+        self._static_label = QStaticText(self.name)
+        self._static_label.setPerformanceHint(QStaticText.AggressiveCaching)
+        self._static_label.prepare(font=self._label_font)
+        
+        self._port_painter = PortIndicatorPainter(self)
+        self._ports_visible = False
+        self._compact_bounds = QRectF()
+        self._update_compact_bounds()
+        
+        # Repaints of an unchanged device are served from a pixmap cache
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+    
+    def _update_compact_bounds(self):
+        """Recompute the bounding rect of a compact device."""
+        self._static_label.prepare(font=self._label_font)
+        label_size = self._static_label.size()
+        self._label_pos = QPointF(-label_size.width() / 2, self.height / 2 + 5)
+        
+        icon_rect = QRectF(-self.width / 2, -self.height / 2, self.width, self.height)
+        label_rect = QRectF(self._label_pos, label_size)
+        
+        # Leave room for the selection outline
+        bounds = icon_rect.united(label_rect).adjusted(-6, -6, 6, 6)
+        if self._ports_visible:
+            bounds = bounds.united(self._port_painter.bounds)
+        
+        if bounds != self._compact_bounds:
+            self.prepareGeometryChange()
+            self._compact_bounds = bounds
+    
+    def boundingRect(self):
+        """Bounding rect; compact devices report their painted area."""
+        if self.compact:
+            return self._compact_bounds
+        return super().boundingRect()
+    
+    def shape(self):
+        """Hit-test shape; compact devices use the icon and label area."""
+        if self.compact:
+            path = QPainterPath()
+            path.addRect(self._compact_bounds)
+            return path
+        return super().shape()
+    
+    def paint(self, painter, option, widget=None):
+        """Paint the device; compact devices draw everything in this one call."""
+        if not self.compact:
+            super().paint(painter, option, widget)
+            return
+        
+        icon_rect = QRectF(-self.width / 2, -self.height / 2, self.width, self.height)
+        if not self._compact_pixmap.isNull():
+            painter.drawPixmap(icon_rect.topLeft(), self._compact_pixmap)
+        else:
+            painter.setPen(QPen(Qt.black))
+            painter.setBrush(QBrush(QColor(220, 220, 220)))
+            painter.drawRect(icon_rect)
+            painter.drawText(icon_rect, Qt.AlignCenter, self.device_type[:1].upper())
+        
+        painter.setPen(Qt.black)
+        painter.setFont(self._label_font)
+        painter.drawStaticText(self._label_pos, self._static_label)
+        
+        if self.isSelected():
+            painter.setPen(QPen(QColor(0, 120, 215), 1.5, Qt.DashLine))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRect(self._compact_bounds.adjusted(1, 1, -1, -1))
+        
+        if self._ports_visible:
+            self._port_painter.paint(painter)
+    
     def _create_visual(self):
         """Create visual representation of the device."""
         try:
@@ -196,10 +332,11 @@ class Device(QGraphicsItemGroup):
                 # Update size based on pixmap
                 self.width = pixmap.width()
                 self.height = pixmap.height()
-                print(f"Icon loaded successfully: {pixmap.width()}x{pixmap.height()}")
+                if log.isEnabledFor(DEBUG):
+                    log.debug("Icon loaded: %dx%d", pixmap.width(), pixmap.height())
             else:
                 # Create a fallback visual
-                print("Creating fallback rectangle")
+                log.debug("Creating fallback rectangle for %s", self.device_type)
                 rect = QGraphicsRectItem(0, 0, 48, 48)
                 rect.setBrush(QBrush(QColor(220, 220, 220)))
                 rect.setPen(QPen(Qt.black))
@@ -226,52 +363,83 @@ class Device(QGraphicsItemGroup):
             self.addToGroup(self.label_item)
             
         except Exception as e:
-            print(f"Error creating device visual: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Error creating device visual: %s", e)
     
     def _init_ports(self):
-        """Initialize connection ports based on device type."""
-        # Basic 4 ports for all devices
-        self.ports = [
-            {'name': 'Port 1', 'position': 'north', 'connected': False},
-            {'name': 'Port 2', 'position': 'east', 'connected': False},
-            {'name': 'Port 3', 'position': 'south', 'connected': False},
-            {'name': 'Port 4', 'position': 'west', 'connected': False}
-        ]
-        
-        # Add device-specific ports
-        if self.device_type == self.SWITCH:
-            # Switches get more ports
-            self.ports.extend([
-                {'name': 'Port 5', 'position': 'north-east', 'connected': False},
-                {'name': 'Port 6', 'position': 'south-east', 'connected': False},
-                {'name': 'Port 7', 'position': 'south-west', 'connected': False},
-                {'name': 'Port 8', 'position': 'north-west', 'connected': False},
-            ])
-        elif self.device_type == self.ROUTER:
-            # Routers get a WAN port
-            self.ports.append({'name': 'WAN', 'position': 'north-east', 'connected': False})
-        elif self.device_type == self.SERVER:
-            # Servers get multiple network interfaces
-            self.ports.extend([
-                {'name': 'NIC 1', 'position': 'east', 'connected': False},
-                {'name': 'NIC 2', 'position': 'west', 'connected': False},
-            ])
+        """Initialize connection ports from the device's port layout spec."""
+        # Names and offsets are shared per layout; the table only tracks connection state
+        layout = get_port_layout(self._port_layout_name())
+        if isinstance(self.ports, PortTable):
+            self.ports.set_layout(layout)
+        else:
+            self.ports = PortTable(layout)
+        
+        if self.compact:
+            # Ports are painted by the device itself
+            self._port_painter.invalidate()
+            self._port_painter.refresh(self.prepareGeometryChange)
+            self._update_compact_bounds()
+        elif getattr(self, 'port_indicator', None) is None:
+            # All port indicators are drawn by one child item
+            self.port_indicator = PortIndicatorItem(self)
+        else:
+            self.port_indicator.refresh()
+    
+    def _port_layout_name(self):
+        """Return the name of the port layout this device uses."""
+        return self.properties.get('port_layout') or self.device_type
+    
+    def _sync_port_layout(self):
+        """Rebuild the ports if the configured port layout changed."""
+        ports = getattr(self, 'ports', None)
+        if isinstance(ports, PortTable) and ports.layout is not get_port_layout(self._port_layout_name()):
+            self._init_ports()
+    
+    def set_port_indicators_visible(self, visible):
+        """Show or hide the port indicators of this device."""
+        if self.compact:
+            if visible != self._ports_visible:
+                self._port_painter.refresh(self.prepareGeometryChange)
+                self._ports_visible = visible
+                self._update_compact_bounds()
+                self.update()
+        elif getattr(self, 'port_indicator', None) is not None:
+            if visible:
+                self.port_indicator.refresh()
+            self.port_indicator.setVisible(visible)
     
     def itemChange(self, change, value):
         """Handle item changes such as position and selection."""
         from PyQt5.QtWidgets import QGraphicsItem
         
-        if change == QGraphicsItem.ItemPositionHasChanged:
+        if change == QGraphicsItem.ItemPositionChange:
+            # Snap to the grid/guides while the user drags this device
+            # (alone or as part of the selection)
+            scene = self.scene()
+            snap = getattr(scene, 'snap_controller', None) if scene is not None else None
+            if snap is not None and snap.enabled:
+                value = snap.snap_drag(self, value)
+        
+        elif change == QGraphicsItem.ItemPositionHasChanged:
             # Position has changed, update connections
             if hasattr(self, 'connections') and self.connections:
+                batch = Device._batch_connections
                 for connection in self.connections:
-                    if connection:
+                    if not connection:
+                        continue
+                    if batch is not None:
+                        # Both ends may move; refresh once after the batch
+                        batch.add(connection)
+                    else:
                         connection.update_position()
+            
+            # Let the scene grow and update cached boundary membership
+            scene = self.scene()
+            if scene is not None and hasattr(scene, 'notify_geometry_changed'):
+                scene.notify_geometry_changed(self)
                         
         elif change == QGraphicsItem.ItemSelectedChange:
-            # Selection state is changing
+            # Selection state is changing (compact devices just repaint)
             if hasattr(self, '_selection_indicator'):
                 self._selection_indicator.setVisible(bool(value))
         
@@ -283,15 +451,26 @@ class Device(QGraphicsItemGroup):
         if key in self.properties:
             self.properties[key] = value
             
+            if key == 'port_layout':
+                self._sync_port_layout()
+            
             # Update label if name changed
             if key == 'name':
-                self.name = value
-                if self.label_item:
-                    self.label_item.setPlainText(value)
-                    
-                    # Re-center the label
-                    label_width = self.label_item.boundingRect().width()
-                    self.label_item.setPos(-label_width/2, self.height/2 + 5)
+                self.set_name(value)
+    
+    def set_name(self, name):
+        """Rename the device and update its label."""
+        self.name = name
+        if self.compact:
+            self._static_label.setText(name)
+            self._update_compact_bounds()
+            self.update()
+        elif self.label_item:
+            self.label_item.setPlainText(name)
+            
+            # Re-center the label
+            label_width = self.label_item.boundingRect().width()
+            self.label_item.setPos(-label_width/2, self.height/2 + 5)
     
     def add_connection(self, connection):
         """Add a connection to this device."""
@@ -304,50 +483,25 @@ class Device(QGraphicsItemGroup):
             self.connections.remove(connection)
     
     def get_port_position(self, port_name):
-        """Get the scene position of a specific port."""
-        # Find the port
-        port = next((p for p in self.ports if p['name'] == port_name), None)
-        if not port:
-            return self.scenePos()  # Default to device center if port not found
-        
-        # Calculate position based on port position attribute
+        """Get the scene position of a specific port (by name or port object)."""
         pos = self.scenePos()
         
-        if port['position'] == 'north':
-            return QPointF(pos.x(), pos.y() - self.height/2)
-        elif port['position'] == 'east':
-            return QPointF(pos.x() + self.width/2, pos.y())
-        elif port['position'] == 'south':
-            return QPointF(pos.x(), pos.y() + self.height/2)
-        elif port['position'] == 'west':
-            return QPointF(pos.x() - self.width/2, pos.y())
-        elif port['position'] == 'north-east':
-            return QPointF(pos.x() + self.width/3, pos.y() - self.height/3)
-        elif port['position'] == 'south-east':
-            return QPointF(pos.x() + self.width/3, pos.y() + self.height/3)
-        elif port['position'] == 'south-west':
-            return QPointF(pos.x() - self.width/3, pos.y() + self.height/3)
-        elif port['position'] == 'north-west':
-            return QPointF(pos.x() - self.width/3, pos.y() - self.height/3)
-        
-        return pos  # Default to device center
+        index = self.ports.index_of(port_name)
+        if index is None:
+            return pos  # Default to device center if port not found
+        
+        dx, dy = self.ports.layout.offset(index, self.width, self.height)
+        return QPointF(pos.x() + dx, pos.y() + dy)
     
     def get_closest_port(self, scene_pos):
         """Get the port closest to the given scene position."""
-        min_distance = float('inf')
-        closest_port = None
-        
-        for port in self.ports:
-            port_pos = self.get_port_position(port['name'])
-            dx = port_pos.x() - scene_pos.x()
-            dy = port_pos.y() - scene_pos.y()
-            distance = (dx*dx + dy*dy) ** 0.5
-            
-            if distance < min_distance:
-                min_distance = distance
-                closest_port = port
-        
-        return closest_port, min_distance
+        pos = self.scenePos()
+        index, distance = self.ports.layout.nearest(
+            scene_pos.x() - pos.x(), scene_pos.y() - pos.y(), self.width, self.height
+        )
+        if index is None:
+            return None, distance
+        return self.ports[index], distance
     
     # Compatibility methods for NetworkDevice and DeviceItem
     def get_id(self):
@@ -427,14 +581,51 @@ class Device(QGraphicsItemGroup):
         
         return outline
     
-    def _get_default_properties(self):
-        """Return the default properties for this device type."""
-        if self.device_type in self.DEVICE_PROPERTIES:
-            # Return a copy to avoid modifying the class constants
-            return dict(self.DEVICE_PROPERTIES[self.device_type])
+    @property
+    def properties(self):
+        """Device properties, backed by a copy-on-write store over the type defaults."""
+        return self._properties
+    
+    @properties.setter
+    def properties(self, values):
+        if isinstance(values, PropertyStore) and values.defaults is self._default_layer(self.device_type):
+            self._properties = values
         else:
+            # Keep sharing the type defaults and store only the differences
+            store = PropertyStore(self._default_layer(self.device_type))
+            store.replace(values)
+            self._properties = store
+        
+        self._sync_port_layout()
+    
+    @classmethod
+    def _default_layer(cls, device_type):
+        """Return the shared default properties for a device type.
+        
+        The layer must be treated as read-only; it is shared by every device
+        of the type.
+        """
+        layer = cls._default_layers.get(device_type)
+        if layer is None:
             # Default to generic device properties if type not found
-            return dict(self.DEVICE_PROPERTIES[self.GENERIC])
+            layer = dict(cls.DEVICE_PROPERTIES.get(device_type, cls.DEVICE_PROPERTIES[cls.GENERIC]))
+            layer.update(cls.BASE_PROPERTIES)
+            
+            # Device-specific values win over the base ones (except the icon)
+            for key, value in cls.DEVICE_PROPERTIES.get(device_type, {}).items():
+                if key != 'icon':
+                    layer[key] = value
+            
+            # Mutable values (e.g. the forwarding table) are frozen, so readers
+            # share them and only PropertyStore.mutable() makes private copies
+            layer = freeze_defaults(layer)
+            cls._default_layers[device_type] = layer
+        return layer
+    
+    def _get_default_properties(self):
+        """Return the default properties for this device type."""
+        # A fresh store only references the shared layer; nothing is copied
+        return PropertyStore(self._default_layer(self.device_type))
     
     # Simplified version that just returns a basic port count
     def _get_port_count(self):
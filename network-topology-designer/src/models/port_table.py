@@ -0,0 +1,396 @@
+"""
+Compact port storage for devices.
+
+Port names and positions are identical for every device using the same
+layout, so they live in a shared PortLayout together with precomputed
+offsets. Layouts are data-driven: they are read from resources/port_layouts.json
+and may describe hundreds of ports as groups ("48 ports along the bottom edge
+in 2 rows"). Each device only keeps a PortTable with one byte of connection
+state per port; Port objects are lightweight views that are created on demand
+and still support the dict-style access (port['name'], port['connected'] = True)
+used across the controllers.
+"""
+import json
+import math
+import os
+
+from utils.logger import get_logger
+
+log = get_logger('resources')
+
+# numpy is imported on first use (see _numpy()); importing it at startup
+# costs more than building every layout in the spec file
+np = None
+_numpy_checked = False
+
+
+# Offset of each named position as a fraction of the device width/height
+POSITION_FACTORS = {
+    'north': (0.0, -0.5),
+    'east': (0.5, 0.0),
+    'south': (0.0, 0.5),
+    'west': (-0.5, 0.0),
+    'north-east': (1 / 3, -1 / 3),
+    'south-east': (1 / 3, 1 / 3),
+    'south-west': (-1 / 3, 1 / 3),
+    'north-west': (-1 / 3, -1 / 3),
+    'center': (0.0, 0.0),
+}
+
+# Layout used when no spec file is available or a layout name is unknown
+DEFAULT_LAYOUT = 'default'
+
+# Built-in specs, used when resources/port_layouts.json cannot be read
+BUILTIN_PORT_LAYOUTS = {
+    DEFAULT_LAYOUT: {
+        'groups': [
+            {'name': 'Ports', 'ports': [
+                ['Port 1', 'north'], ['Port 2', 'east'], ['Port 3', 'south'], ['Port 4', 'west'],
+            ]},
+        ],
+    },
+}
+
+# Fraction of the device size that generated rows are spaced apart, and the
+# margin kept free at both ends of an edge
+ROW_SPACING = 0.12
+EDGE_MARGIN = 0.05
+
+# Below this many ports a plain loop beats numpy's call overhead
+NUMPY_MIN_PORTS = 32
+
+
+def _numpy():
+    """Return the numpy module, or None when it is not installed."""
+    global np, _numpy_checked
+    if not _numpy_checked:
+        _numpy_checked = True
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            np = None
+    return np
+
+
+class PortLayout:
+    """Port names, positions and offset factors shared by all devices using a layout."""
+
+    __slots__ = ('name', 'names', 'positions', 'factors', 'index', 'groups', '_offset_cache')
+
+    def __init__(self, ports, name=None, groups=None):
+        """Initialize the layout.
+
+        Args:
+            ports (list): (name, position) pairs, or (name, position, fx, fy)
+                where fx/fy are offsets as fractions of the device size
+            name (str, optional): Name of the layout in the spec file
+            groups (list, optional): (group name, first index, end index) tuples
+                used for grouped rendering; defaults to a single group
+        """
+        names = []
+        positions = []
+        factors = []
+        for port in ports:
+            port_name, position = port[0], port[1]
+            if len(port) >= 4:
+                factor = (port[2], port[3])
+            else:
+                factor = POSITION_FACTORS.get(position, (0.0, 0.0))
+            names.append(port_name)
+            positions.append(position)
+            factors.append(factor)
+
+        self.name = name
+        self.names = tuple(names)
+        self.positions = tuple(positions)
+        self.factors = tuple(factors)
+        self.index = {port_name: i for i, port_name in enumerate(self.names)}
+        self.groups = tuple(groups) if groups else (("Ports", 0, len(self.names)),)
+        self._offset_cache = {}
+
+    @classmethod
+    def from_spec(cls, name, specs):
+        """Build a layout from the spec named `name` in a dict of layout specs."""
+        ports = []
+        groups = []
+        for group in _resolve_groups(name, specs):
+            start = len(ports)
+            ports.extend(_expand_group(group))
+            if len(ports) > start:
+                groups.append((group.get('name', f"Group {len(groups) + 1}"), start, len(ports)))
+        return cls(ports, name=name, groups=groups)
+
+    def __len__(self):
+        return len(self.names)
+
+    def offsets(self, width, height):
+        """Return the (dx, dy) offset of every port for a device size.
+
+        Results are cached per size. For layouts large enough to benefit, a
+        numpy array is cached alongside for vectorized queries when numpy is
+        available.
+        """
+        key = (width, height)
+        cached = self._offset_cache.get(key)
+        if cached is None:
+            offsets = tuple((fx * width, fy * height) for fx, fy in self.factors)
+            array = None
+            if len(offsets) >= NUMPY_MIN_PORTS and _numpy() is not None:
+                array = np.array(offsets, dtype=float).reshape(-1, 2)
+            cached = (offsets, array)
+            self._offset_cache[key] = cached
+        return cached
+
+    def offset(self, index, width, height):
+        """Return the (dx, dy) offset of one port from the device position."""
+        return self.offsets(width, height)[0][index]
+
+    def nearest(self, x, y, width, height):
+        """Return (index, distance) of the port closest to a point relative to the device.
+
+        Returns (None, inf) for a layout without ports.
+        """
+        if not self.names:
+            return None, float('inf')
+
+        offsets, array = self.offsets(width, height)
+        if array is not None:
+            distances = np.hypot(array[:, 0] - x, array[:, 1] - y)
+            index = int(distances.argmin())
+            return index, float(distances[index])
+
+        best_index = 0
+        best_distance = float('inf')
+        for i, (dx, dy) in enumerate(offsets):
+            distance = math.hypot(dx - x, dy - y)
+            if distance < best_distance:
+                best_distance = distance
+                best_index = i
+        return best_index, best_distance
+
+
+def _resolve_groups(name, specs, seen=None):
+    """Return the port groups of a layout spec, following "extends" chains."""
+    seen = seen or set()
+    if name in seen:
+        raise ValueError(f"Port layout '{name}' extends itself")
+    seen.add(name)
+
+    spec = specs[name]
+    groups = []
+    if spec.get('extends'):
+        groups.extend(_resolve_groups(spec['extends'], specs, seen))
+    groups.extend(spec.get('groups', []))
+    return groups
+
+
+def _expand_group(group):
+    """Expand a group spec into (name, position, fx, fy) tuples.
+
+    A group either lists its ports explicitly ("ports": [[name, position], ...])
+    or generates them ("prefix", "start", "count") evenly spaced along one
+    device edge ("side"), wrapped into "rows" that step inwards.
+    """
+    if 'ports' in group:
+        return [tuple(port) for port in group['ports']]
+
+    prefix = group.get('prefix', 'Port ')
+    first = int(group.get('start', 1))
+    count = int(group.get('count', 0))
+    side = group.get('side', 'south')
+    rows = max(1, int(group.get('rows', 1)))
+    columns = max(1, math.ceil(count / rows))
+
+    usable = 1.0 - 2 * EDGE_MARGIN
+    ports = []
+    for i in range(count):
+        row, column = divmod(i, columns)
+        along = -0.5 + EDGE_MARGIN + usable * (column + 0.5) / columns
+        inset = 0.5 - row * ROW_SPACING
+        if side == 'north':
+            fx, fy = along, -inset
+        elif side == 'east':
+            fx, fy = inset, along
+        elif side == 'west':
+            fx, fy = -inset, along
+        else:
+            fx, fy = along, inset
+        ports.append((f"{prefix}{first + i}", side, fx, fy))
+    return ports
+
+
+_layouts = {}
+_layout_specs = None
+
+
+def default_spec_path():
+    """Return the path of the port layout spec file."""
+    from utils.resource_path import get_resource_path
+    return get_resource_path("port_layouts.json")
+
+
+def load_port_layout_specs(path=None):
+    """Load (or reload) the port layout specs and drop any cached layouts.
+
+    Falls back to the built-in specs when the file is missing or invalid.
+    """
+    global _layout_specs
+
+    path = path or default_spec_path()
+    specs = dict(BUILTIN_PORT_LAYOUTS)
+    try:
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                specs.update(json.load(f).get('layouts', {}))
+        else:
+            log.info("Port layout spec not found: %s, using built-in layouts", path)
+    except (OSError, ValueError) as e:
+        log.error("Error loading port layouts from %s: %s", path, e)
+
+    _layout_specs = specs
+    _layouts.clear()
+    return specs
+
+
+def get_port_layout(name):
+    """Return the shared port layout with the given name (usually the device type).
+
+    Unknown names fall back to the default layout.
+    """
+    layout = _layouts.get(name)
+    if layout is None:
+        specs = _layout_specs if _layout_specs is not None else load_port_layout_specs()
+        if name in specs:
+            layout = PortLayout.from_spec(name, specs)
+        else:
+            # The built-in default layout is always part of the specs
+            layout = get_port_layout(DEFAULT_LAYOUT)
+        _layouts[name] = layout
+    return layout
+
+
+def available_port_layouts():
+    """Return the names of all configured port layouts."""
+    specs = _layout_specs if _layout_specs is not None else load_port_layout_specs()
+    return sorted(specs)
+
+
+class Port:
+    """Lightweight view of one port of a device."""
+
+    __slots__ = ('_table', 'index', '_extra')
+
+    def __init__(self, table, index):
+        self._table = table
+        self.index = index
+        self._extra = None
+
+    @property
+    def name(self):
+        return self._table.layout.names[self.index]
+
+    @property
+    def position(self):
+        return self._table.layout.positions[self.index]
+
+    @property
+    def connected(self):
+        return bool(self._table.connected[self.index])
+
+    @connected.setter
+    def connected(self, value):
+        self._table.connected[self.index] = 1 if value else 0
+
+    def __getitem__(self, key):
+        if key == 'name':
+            return self.name
+        if key == 'connected':
+            return self.connected
+        if key == 'position':
+            return self.position
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key == 'connected':
+            self.connected = value
+        elif key in ('name', 'position'):
+            raise KeyError(f"Port {key} is defined by the device type's layout")
+        else:
+            # Rarely used ad-hoc data, e.g. a view's indicator item
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __contains__(self, key):
+        return key in ('name', 'connected', 'position') or (self._extra is not None and key in self._extra)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __repr__(self):
+        return f"Port({self.name!r}, {self.position!r}, connected={self.connected})"
+
+
+class PortTable:
+    """Per-device port state backed by a shared layout."""
+
+    __slots__ = ('layout', 'connected', '_views')
+
+    def __init__(self, layout):
+        self.layout = layout
+        self.connected = bytearray(len(layout))
+        self._views = None
+
+    def __len__(self):
+        return len(self.layout)
+
+    def __getitem__(self, index):
+        if self._views is None:
+            self._views = [None] * len(self.layout)
+        view = self._views[index]
+        if view is None:
+            view = Port(self, index)
+            self._views[index] = view
+        return view
+
+    def __iter__(self):
+        for index in range(len(self.layout)):
+            yield self[index]
+
+    def index_of(self, port):
+        """Return the index of a port given its name or Port view, or None."""
+        if isinstance(port, Port):
+            return port.index if port._table is self else self.layout.index.get(port.name)
+        if isinstance(port, dict):
+            port = port.get('name')
+        return self.layout.index.get(port)
+
+    def get(self, name):
+        """Return the Port view with the given name, or None."""
+        index = self.layout.index.get(name)
+        return self[index] if index is not None else None
+
+    def set_layout(self, layout):
+        """Switch to another layout, keeping the state of ports that keep their name."""
+        if layout is self.layout:
+            return
+        connected = bytearray(len(layout))
+        for index, port_name in enumerate(self.layout.names):
+            new_index = layout.index.get(port_name)
+            if new_index is not None:
+                connected[new_index] = self.connected[index]
+        self.layout = layout
+        self.connected = connected
+        self._views = None
+
+    def free_ports(self):
+        """Yield the ports that are not connected."""
+        for index, connected in enumerate(self.connected):
+            if not connected:
+                yield self[index]
@@ -0,0 +1,201 @@
+from collections.abc import MutableMapping
+
+# Value types that have to be frozen before they can be shared
+_MUTABLE_TYPES = (dict, list, set, bytearray)
+
+_MISSING = object()
+
+
+class FrozenDict(dict):
+    """Read-only dict for values shared through a default layer.
+
+    It is still a dict, so it compares equal to plain dicts and serializes
+    to JSON; every method that would change it raises TypeError. Copies
+    (copy.copy, copy.deepcopy, pickle) are plain dicts.
+    """
+
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("shared default values are read-only; use PropertyStore.mutable() to edit them")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+def freeze(value):
+    """Return a read-only version of a value (dict, list, set and bytearray nest)."""
+    if isinstance(value, FrozenDict):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    if isinstance(value, bytearray):
+        return bytes(value)
+    return value
+
+
+def thaw(value):
+    """Return a mutable copy of a value frozen by freeze(); other values are returned as is."""
+    if isinstance(value, FrozenDict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    if isinstance(value, frozenset):
+        return set(value)
+    if isinstance(value, bytes):
+        return bytearray(value)
+    return value
+
+
+def freeze_defaults(defaults):
+    """Return a default layer whose mutable values are frozen, ready to be shared."""
+    return {key: freeze(value) for key, value in defaults.items()}
+
+
+class PropertyStore(MutableMapping):
+    """Copy-on-write property mapping layered over shared defaults.
+
+    Every device of a type shares one defaults dict; a store only keeps the
+    keys that were overridden (or deleted) for its own device. It behaves like
+    a regular dict for readers such as the properties panel and serializers,
+    and copy() returns a plain dict snapshot.
+
+    Reading never creates an override: mutable defaults are handed out
+    frozen (see freeze_defaults), and mutable(key) returns a private copy for
+    in-place edits. Setting a value equal to the default stores nothing.
+    """
+
+    __slots__ = ('_defaults', '_overrides', '_deleted')
+
+    def __init__(self, defaults, overrides=None):
+        """Initialize the store.
+
+        Args:
+            defaults (dict): Shared default layer; never modified by the store
+            overrides (dict, optional): Initial values that differ from the defaults
+        """
+        self._defaults = defaults
+        self._overrides = None
+        self._deleted = None
+
+        if overrides:
+            for key, value in overrides.items():
+                self[key] = value
+
+    def __getitem__(self, key):
+        if self._overrides is not None and key in self._overrides:
+            return self._overrides[key]
+        if self._deleted is not None and key in self._deleted:
+            raise KeyError(key)
+
+        value = self._defaults[key]
+        if isinstance(value, _MUTABLE_TYPES) and not isinstance(value, FrozenDict):
+            # A default layer that was not frozen; never hand out its values
+            value = freeze(value)
+        return value
+
+    def __setitem__(self, key, value):
+        if self._deleted is not None:
+            self._deleted.discard(key)
+            if not self._deleted:
+                self._deleted = None
+
+        default = self._defaults.get(key, _MISSING)
+        compared = freeze(value) if isinstance(value, _MUTABLE_TYPES) else value
+        if (default is not _MISSING and
+                (value is default or (type(default) is type(compared) and default == compared))):
+            # Same as the shared default, so there is nothing to store
+            if self._overrides is not None:
+                self._overrides.pop(key, None)
+                if not self._overrides:
+                    self._overrides = None
+            return
+
+        self._set_override(key, value)
+
+    def __delitem__(self, key):
+        found = False
+        if self._overrides is not None and key in self._overrides:
+            del self._overrides[key]
+            if not self._overrides:
+                self._overrides = None
+            found = True
+
+        if key in self._defaults and (self._deleted is None or key not in self._deleted):
+            if self._deleted is None:
+                self._deleted = set()
+            self._deleted.add(key)
+            found = True
+
+        if not found:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        if self._overrides is not None and key in self._overrides:
+            return True
+        if self._deleted is not None and key in self._deleted:
+            return False
+        return key in self._defaults
+
+    def __iter__(self):
+        overrides = self._overrides or {}
+        deleted = self._deleted or ()
+        for key in self._defaults:
+            if key not in deleted or key in overrides:
+                yield key
+        for key in overrides:
+            if key not in self._defaults:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"PropertyStore({dict(self)!r})"
+
+    def _set_override(self, key, value):
+        if self._overrides is None:
+            self._overrides = {}
+        self._overrides[key] = value
+
+    def mutable(self, key):
+        """Return the value of a key for editing in place.
+
+        A shared (frozen) default is replaced by a private mutable copy first,
+        so the edits only affect this store.
+        """
+        value = self[key]
+        thawed = thaw(value)
+        if thawed is not value:
+            self._set_override(key, thawed)
+        return thawed
+
+    def copy(self):
+        """Return a plain dict snapshot of the current values."""
+        return dict(self)
+
+    def overrides(self):
+        """Return the values that differ from the shared defaults."""
+        return dict(self._overrides or {})
+
+    def replace(self, values):
+        """Replace all values, keeping only the differences from the defaults."""
+        self._overrides = None
+        self._deleted = None
+        for key in self._defaults:
+            if key not in values:
+                del self[key]
+        for key, value in values.items():
+            self[key] = value
+
+    @property
+    def defaults(self):
+        """The shared default layer backing this store."""
+        return self._defaults
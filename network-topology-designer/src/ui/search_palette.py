@@ -0,0 +1,107 @@
+from PyQt5.QtWidgets import (
+    QDialog,
+    QVBoxLayout,
+    QLineEdit,
+    QListWidget,
+    QListWidgetItem,
+    QLabel
+)
+from PyQt5.QtCore import Qt, QEvent, pyqtSignal
+
+
+class DeviceSearchPalette(QDialog):
+    """Popup palette for finding a device by name, ID, address or property and jumping to it."""
+
+    device_chosen = pyqtSignal(object)
+
+    MAX_RESULTS = 20
+
+    def __init__(self, device_manager, parent=None):
+        super(DeviceSearchPalette, self).__init__(parent, Qt.Popup | Qt.FramelessWindowHint)
+        self.device_manager = device_manager
+        self.setMinimumWidth(420)
+
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Create the search field and result list."""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(6, 6, 6, 6)
+
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Find device by name, ID, IP or MAC...")
+        self.search_edit.textChanged.connect(self._on_text_changed)
+        self.search_edit.returnPressed.connect(self._on_accept)
+        self.search_edit.installEventFilter(self)
+        layout.addWidget(self.search_edit)
+
+        self.result_list = QListWidget()
+        self.result_list.itemActivated.connect(self._on_item_activated)
+        layout.addWidget(self.result_list)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+    def popup(self):
+        """Show the palette centered over the parent window with an empty query."""
+        self.search_edit.clear()
+        self._on_text_changed("")
+
+        parent = self.parentWidget()
+        if parent:
+            self.adjustSize()
+            geometry = parent.geometry()
+            self.move(geometry.center().x() - self.width() // 2, geometry.top() + 80)
+
+        self.show()
+        self.search_edit.setFocus()
+
+    def eventFilter(self, obj, event):
+        """Let the arrow keys move through the results while typing."""
+        if obj is self.search_edit and event.type() == QEvent.KeyPress:
+            if event.key() in (Qt.Key_Down, Qt.Key_Up):
+                count = self.result_list.count()
+                if count:
+                    step = 1 if event.key() == Qt.Key_Down else -1
+                    row = (self.result_list.currentRow() + step) % count
+                    self.result_list.setCurrentRow(row)
+                return True
+            if event.key() == Qt.Key_Escape:
+                self.hide()
+                return True
+        return super().eventFilter(obj, event)
+
+    def _on_text_changed(self, text):
+        """Refresh the results for the current query."""
+        self.result_list.clear()
+
+        if not text.strip():
+            self.status_label.setText(f"{len(self.device_manager.devices)} devices")
+            return
+
+        devices = self.device_manager.search_devices(text, self.MAX_RESULTS)
+        for device in devices:
+            ip_address = device.properties.get('ip_address', '')
+            label = f"{device.name}  ({device.device_type}, {device.id})"
+            if ip_address:
+                label += f"  {ip_address}"
+            item = QListWidgetItem(label)
+            item.setData(Qt.UserRole, device.id)
+            self.result_list.addItem(item)
+
+        if devices:
+            self.result_list.setCurrentRow(0)
+        self.status_label.setText(f"{len(devices)} matches" if devices else "No matches")
+
+    def _on_accept(self):
+        """Jump to the highlighted result."""
+        item = self.result_list.currentItem()
+        if item:
+            self._on_item_activated(item)
+
+    def _on_item_activated(self, item):
+        """Emit the chosen device and close the palette."""
+        device = self.device_manager.get_device_by_id(item.data(Qt.UserRole))
+        if device:
+            self.device_chosen.emit(device)
+        self.hide()
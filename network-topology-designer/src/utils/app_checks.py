@@ -0,0 +1,377 @@
+"""
+End-to-end checks of the application wiring.
+
+Every check builds a MainWindow the way main.py does: src and its parent
+directory on sys.path and the window imported as
+src.controllers.main_window. That catches problems which only show up in
+the running app, such as modules loaded under two names (models.device and
+src.models.device define two different Device classes).
+
+Run from the src directory:
+    python -m utils.app_checks [name ...]
+
+Without names all checks run; "python -m utils.app_checks list" lists them.
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+
+def _main_window():
+    """Return (app, MainWindow) with the imports set up like main.py."""
+    src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if src_dir not in sys.path:
+        sys.path.append(src_dir)
+    parent_dir = os.path.dirname(src_dir)
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+    from utils.benchmark import _qt_app
+    app = _qt_app()
+    from src.controllers.main_window import MainWindow
+    with _quiet():
+        window = MainWindow()
+    return app, window
+
+
+def _quiet():
+    """Hide the console chatter of device and window construction."""
+    stack = contextlib.ExitStack()
+    stack.enter_context(contextlib.redirect_stdout(io.StringIO()))
+    stack.enter_context(contextlib.redirect_stderr(io.StringIO()))
+    return stack
+
+
+def _add_boundary(window, x, y, width, height):
+    """Add a boundary the way the boundary tool does, without its dialog."""
+    from PyQt5.QtCore import QRectF
+    from models.boundary_item import BoundaryItem
+
+    boundary = BoundaryItem(QRectF(x, y, width, height))
+    window.scene.addItem(boundary)
+    window.boundary_controller.register_boundary(boundary)
+    return boundary
+
+
+def _add_devices(window, positions, device_type='router'):
+    """Create devices through the DeviceManager, as clicking in device mode does."""
+    with _quiet():
+        return [window.device_manager.create_device(device_type, x, y) for x, y in positions]
+
+
+def _wait(app, ms):
+    """Process events for a while, so timers (debouncing, batching) fire."""
+    end = time.perf_counter() + ms / 1000
+    while time.perf_counter() < end:
+        app.processEvents()
+        time.sleep(0.005)
+
+
+def _expect(failures, condition, message):
+    if not condition:
+        failures.append(message)
+
+
+def check_boundary_membership():
+    """Devices created in the app are members of the boundary around them."""
+    from PyQt5.QtCore import QPointF
+
+    app, window = _main_window()
+    failures = []
+    boundary = _add_boundary(window, 0, 0, 600, 300)
+    devices = _add_devices(window, [(100, 150), (250, 150), (400, 150)])
+    outside = _add_devices(window, [(800, 150)])
+
+    contained = boundary.get_contained_items(window.scene)
+    _expect(failures, set(devices) <= set(contained),
+            f"get_contained_items() found {len(contained)} of 3 devices")
+    members = window.boundary_controller.get_devices_in_boundary(boundary)
+    _expect(failures, set(members) == set(devices),
+            f"get_devices_in_boundary() returned {len(members)} devices, expected 3")
+    zones = [window.boundary_controller.hierarchy.zone_of(device.id) for device in devices + outside]
+    _expect(failures, zones == [boundary.id] * 3 + [None], f"innermost zones are {zones}")
+
+    # Moves refresh the cached members of the boundaries they touch only
+    controller = window.boundary_controller
+    far = _add_boundary(window, 3000, 3000, 400, 400)
+    controller.get_devices_in_boundary(far)
+    devices[0].setPos(devices[0].pos() + QPointF(0, 1000))
+    outside[0].setPos(outside[0].pos() - QPointF(600, 0))
+    members = controller.get_devices_in_boundary(boundary)
+    _expect(failures, set(members) == {devices[1], devices[2], outside[0]},
+            f"after the moves get_devices_in_boundary() returned {len(members)} devices")
+    _expect(failures, far.id in controller._membership,
+            "a move far away dropped the cached members of an unrelated boundary")
+    return failures
+
+
+def _inside(item, boundary):
+    return boundary.scene_rect().contains(item.sceneBoundingRect())
+
+
+def _connect(window, pairs):
+    """Connect devices through the connection tool, as dragging between them does."""
+    tool = window.connection_tool
+    connections = []
+    with _quiet():
+        for source, target in pairs:
+            tool.source_device = source
+            tool.source_port, _ = source.get_closest_port(target.scenePos())
+            target_port, _ = target.get_closest_port(source.scenePos())
+            connections.append(tool.create_connection(target, target_port))
+    tool.source_device = tool.source_port = None
+    return connections
+
+
+def check_boundary_drag():
+    """Dragging a boundary carries its devices and nested boundaries along."""
+    from PyQt5.QtCore import QPointF
+
+    app, window = _main_window()
+    failures = []
+    outer = _add_boundary(window, 0, 0, 800, 400)
+    inner = _add_boundary(window, 400, 100, 300, 200)
+    devices = _add_devices(window, [(100, 200), (500, 200)])
+    before = [device.scenePos() for device in devices] + [inner.scene_rect().topLeft()]
+
+    outer.setPos(outer.pos() + QPointF(150, 50))
+    after = [device.scenePos() for device in devices] + [inner.scene_rect().topLeft()]
+    moved = [point - previous for point, previous in zip(after, before)]
+    _expect(failures, all(delta == QPointF(150, 50) for delta in moved),
+            f"members moved by {[(delta.x(), delta.y()) for delta in moved]}, expected (150, 50)")
+    zones = [window.boundary_controller.hierarchy.zone_of(device.id) for device in devices]
+    _expect(failures, zones == [outer.id, inner.id], f"innermost zones are {zones}")
+    return failures
+
+
+def check_boundary_collapse():
+    """Collapsing a boundary hides its devices; expanding restores them."""
+    app, window = _main_window()
+    failures = []
+    controller = window.boundary_controller
+    boundary = _add_boundary(window, 0, 0, 600, 300)
+    devices = _add_devices(window, [(100, 150), (250, 150), (400, 150)])
+    outside = _add_devices(window, [(800, 150)])
+    _connect(window, [(devices[0], devices[1]), (devices[2], outside[0])])
+    positions = [device.scenePos() for device in devices]
+
+    proxy = controller.collapse_boundary(boundary)
+    _expect(failures, proxy is not None, "collapse_boundary() returned None")
+    hidden = [device for device in devices if device.scene() is None]
+    _expect(failures, len(hidden) == 3, f"{len(hidden)} of 3 devices hidden")
+    anchors = window.device_manager.anchor_index
+    _expect(failures, not any(device.id in anchors for device in hidden),
+            "hidden devices are still snap targets")
+    _expect(failures, outside[0].scene() is window.scene, "device outside the boundary was hidden")
+
+    controller.expand_boundary(boundary)
+    shown = [device for device in devices if device.scene() is window.scene]
+    _expect(failures, len(shown) == 3, f"{len(shown)} of 3 devices shown after expanding")
+    anchored = [device for device in devices
+                if anchors.get(device.id) == (device.scenePos().x(), device.scenePos().y())]
+    _expect(failures, len(anchored) == 3, f"{len(anchored)} of 3 devices are snap targets after expanding")
+    _expect(failures, [device.scenePos() for device in devices] == positions,
+            "devices moved by collapsing and expanding")
+    return failures
+
+
+def check_boundary_layout():
+    """The boundary layout keeps every device inside its boundary."""
+    app, window = _main_window()
+    failures = []
+    first = _add_boundary(window, 0, 0, 400, 300)
+    second = _add_boundary(window, 600, 0, 400, 300)
+    first_devices = _add_devices(window, [(100, 150), (250, 150), (300, 250)])
+    second_devices = _add_devices(window, [(700, 150), (850, 150)], 'switch')
+    _connect(window, [(first_devices[0], first_devices[1]), (first_devices[0], first_devices[2]),
+                      (second_devices[0], second_devices[1]), (first_devices[0], second_devices[0])])
+
+    _expect(failures, window.layout_controller.apply_boundary_layout(window.boundary_controller),
+            "apply_boundary_layout() did nothing")
+    for boundary, devices in ((first, first_devices), (second, second_devices)):
+        outside = [device.name for device in devices if not _inside(device, boundary)]
+        _expect(failures, not outside, f"{outside} left boundary {boundary.name}")
+    _expect(failures, not first.scene_rect().intersects(second.scene_rect()), "boundaries overlap")
+    return failures
+
+
+def check_arrange_selection():
+    """Align acts on the selected devices, as one undo step."""
+    app, window = _main_window()
+    failures = []
+    devices = _add_devices(window, [(100, 100), (250, 160), (400, 220)])
+    _add_devices(window, [(550, 300)])
+    for device in devices:
+        device.setSelected(True)
+    before = [device.pos() for device in devices]
+
+    selected = window._selected_devices()
+    _expect(failures, set(selected) == set(devices), f"{len(selected)} of 3 devices selected")
+    window._on_align('top')
+    tops = {device.pos().y() for device in devices}
+    _expect(failures, len(tops) == 1, f"devices not aligned, y = {sorted(tops)}")
+    window.undo_redo_manager.undo()
+    _expect(failures, [device.pos() for device in devices] == before, "undo did not restore the positions")
+    return failures
+
+
+def check_snap_selection():
+    """Dragging a selection with snap on snaps the grabbed device and keeps the selection's shape."""
+    from PyQt5.QtCore import Qt, QPointF, QEvent
+    from PyQt5.QtGui import QMouseEvent
+    from PyQt5.QtTest import QTest
+    from PyQt5.QtWidgets import QApplication
+
+    app, window = _main_window()
+    failures = []
+    view = window.view
+    with _quiet():
+        window.show()
+    _wait(app, 50)
+    devices = _add_devices(window, [(100, 100), (233, 171)])
+    window.snap_controller.set_grid_enabled(True)
+    for device in devices:
+        device.setSelected(True)
+    offset = devices[1].pos() - devices[0].pos()
+
+    # Press on the first device's icon and drag by an off-grid amount
+    viewport = view.viewport()
+    start = devices[0].scenePos()
+    QTest.mousePress(viewport, Qt.LeftButton, Qt.NoModifier, view.mapFromScene(start))
+    for step in range(1, 6):
+        point = view.mapFromScene(start + QPointF(step * 7.3, step * 3.1))
+        QApplication.sendEvent(viewport, QMouseEvent(QEvent.MouseMove, QPointF(point), Qt.NoButton,
+                                                     Qt.LeftButton, Qt.NoModifier))
+    QTest.mouseRelease(viewport, Qt.LeftButton, Qt.NoModifier, point)
+
+    grid = window.snap_controller.grid_size
+    pos = devices[0].pos()
+    _expect(failures, pos != QPointF(100, 100) and pos.x() % grid == 0 and pos.y() % grid == 0,
+            f"grabbed device ended at ({pos.x()}, {pos.y()}), expected a moved grid point")
+    after = devices[1].pos() - devices[0].pos()
+    _expect(failures, after == offset,
+            f"selection changed shape: offset ({after.x()}, {after.y()}), expected ({offset.x()}, {offset.y()})")
+    return failures
+
+
+def check_bulk_edit():
+    """Selecting devices fills the properties panel; a bulk edit is one undo step."""
+    app, window = _main_window()
+    failures = []
+    devices = _add_devices(window, [(100, 100), (250, 100), (400, 100)])
+    other = _add_devices(window, [(550, 100)])[0]
+    for device in devices:
+        device.setSelected(True)
+    _wait(app, 150)
+
+    panel = window.properties_panel
+    _expect(failures, set(panel.current_items) == set(devices),
+            f"panel shows {len(panel.current_items)} items, expected the 3 selected devices")
+    editor = panel.editors.get('description')
+    _expect(failures, editor is not None, "no description editor for the selection")
+    if editor is None:
+        return failures
+
+    # What typing into the field does
+    editor.setText("core site")
+    editor.textEdited.emit("core site")
+    panel.apply_changes()
+    descriptions = [device.properties['description'] for device in devices]
+    _expect(failures, descriptions == ["core site"] * 3, f"descriptions after the edit: {descriptions}")
+    _expect(failures, other.properties['description'] == "", "an unselected device was edited")
+    _expect(failures, window.device_manager.search_devices("core site") != [],
+            "edited description is not searchable")
+
+    window.undo_redo_manager.undo()
+    descriptions = [device.properties['description'] for device in devices]
+    _expect(failures, descriptions == [""] * 3, f"descriptions after undo: {descriptions}")
+    _wait(app, 150)
+    _expect(failures, editor.text() == "", "panel still shows the undone value")
+    return failures
+
+
+def check_device_edit():
+    """Editing one device in the properties panel keeps it searchable under the new values."""
+    app, window = _main_window()
+    failures = []
+    manager = window.device_manager
+    device = _add_devices(window, [(100, 100), (250, 100)])[0]
+    device.setSelected(True)
+    _wait(app, 150)
+
+    panel = window.properties_panel
+    editor = panel.editors.get('description')
+    _expect(failures, panel.current_item is device and editor is not None,
+            "panel does not show the selected device")
+    if editor is None:
+        return failures
+
+    editor.setText("edge uplink")
+    editor.textEdited.emit("edge uplink")
+    panel.apply_changes()
+    _expect(failures, manager.search_devices("edge uplink") == [device], "edited description is not searchable")
+    window.undo_redo_manager.undo()
+    _expect(failures, manager.search_devices("edge uplink") == [], "undone description is still found")
+
+    manager.update_device_property(device.id, 'name', "Core Router A")
+    _expect(failures, device.name == "Core Router A", f"device is named {device.name!r} after renaming")
+    _expect(failures, manager.search_devices("core router a") == [device], "new name is not searchable")
+    return failures
+
+
+def check_analytics_sync():
+    """Devices and connections made in the app reach the analytics graph."""
+    app, window = _main_window()
+    failures = []
+    devices = _add_devices(window, [(100, 100), (250, 100), (400, 100)])
+    _expect(failures, all(device is not None for device in devices), "create_device() returned None")
+    _connect(window, [(devices[0], devices[1]), (devices[1], devices[2])])
+
+    summary = window.analytics_controller.summary()
+    _expect(failures, summary['devices'] == 3, f"summary() reports {summary['devices']} devices, expected 3")
+    _expect(failures, summary['connections'] == 2,
+            f"summary() reports {summary['connections']} connections, expected 2")
+    path = window.analytics_controller.shortest_path(devices[0], devices[2])
+    _expect(failures, path is not None and len(path) == 3, f"shortest path is {path}")
+
+    window.device_manager.remove_device(devices[2].id)
+    summary = window.analytics_controller.summary()
+    _expect(failures, summary['devices'] == 2, f"summary() reports {summary['devices']} devices after a removal")
+    return failures
+
+
+CHECKS = {
+    'boundary_membership': check_boundary_membership,
+    'boundary_drag': check_boundary_drag,
+    'boundary_collapse': check_boundary_collapse,
+    'boundary_layout': check_boundary_layout,
+    'arrange_selection': check_arrange_selection,
+    'snap_selection': check_snap_selection,
+    'bulk_edit': check_bulk_edit,
+    'device_edit': check_device_edit,
+    'analytics_sync': check_analytics_sync,
+}
+
+
+def main(argv=None):
+    """Run checks by name (all by default) and report failures."""
+    argv = sys.argv[1:] if argv is None else argv
+    unknown = [name for name in argv if name not in CHECKS]
+    if unknown:
+        print("Available checks: " + ", ".join(sorted(CHECKS)))
+        return 1
+
+    failed = 0
+    for name in argv or CHECKS:
+        failures = CHECKS[name]()
+        print(f"{'FAIL' if failures else 'ok  '} {name}")
+        for failure in failures:
+            print(f"       {failure}")
+        failed += bool(failures)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""
+Align, distribute and pack operations for a selection of devices.
+
+Every function takes the selection as a list of boxes (center x, center y,
+width, height) and returns the new center of each box, in the same order,
+so the caller can apply all moves in one pass and record them as a single
+undo step. Each operation is one or two passes over the selection (plus a
+sort for distribute and pack).
+
+This module has no Qt dependency.
+"""
+import math
+
+ALIGN_EDGES = ('left', 'center', 'right', 'top', 'middle', 'bottom')
+
+
+def bounds(boxes):
+    """Return (left, top, right, bottom) of the boxes."""
+    left = min(x - w / 2 for x, y, w, h in boxes)
+    top = min(y - h / 2 for x, y, w, h in boxes)
+    right = max(x + w / 2 for x, y, w, h in boxes)
+    bottom = max(y + h / 2 for x, y, w, h in boxes)
+    return left, top, right, bottom
+
+
+def align(boxes, edge):
+    """Align the boxes on one edge or center line of their bounding box.
+
+    Args:
+        boxes (list): (center x, center y, width, height) tuples
+        edge (str): One of ALIGN_EDGES
+
+    Returns:
+        list: New (x, y) centers
+    """
+    if edge not in ALIGN_EDGES:
+        raise ValueError(f"Unknown alignment: {edge}")
+    if not boxes:
+        return []
+
+    left, top, right, bottom = bounds(boxes)
+    if edge == 'left':
+        return [(left + w / 2, y) for x, y, w, h in boxes]
+    if edge == 'center':
+        center = (left + right) / 2
+        return [(center, y) for x, y, w, h in boxes]
+    if edge == 'right':
+        return [(right - w / 2, y) for x, y, w, h in boxes]
+    if edge == 'top':
+        return [(x, top + h / 2) for x, y, w, h in boxes]
+    if edge == 'middle':
+        middle = (top + bottom) / 2
+        return [(x, middle) for x, y, w, h in boxes]
+    return [(x, bottom - h / 2) for x, y, w, h in boxes]
+
+
+def distribute(boxes, axis='horizontal'):
+    """Space the boxes evenly between the two outermost ones.
+
+    The gaps between neighbouring boxes are made equal; the first and last
+    box (by position along the axis) stay where they are.
+
+    Args:
+        boxes (list): (center x, center y, width, height) tuples
+        axis (str): 'horizontal' or 'vertical'
+
+    Returns:
+        list: New (x, y) centers
+    """
+    if axis not in ('horizontal', 'vertical'):
+        raise ValueError(f"Unknown axis: {axis}")
+    result = [(x, y) for x, y, w, h in boxes]
+    if len(boxes) < 3:
+        return result
+
+    horizontal = axis == 'horizontal'
+    position = 0 if horizontal else 1
+    size = 2 if horizontal else 3
+    order = sorted(range(len(boxes)), key=lambda i: boxes[i][position])
+
+    first, last = boxes[order[0]], boxes[order[-1]]
+    start = first[position] - first[size] / 2
+    end = last[position] + last[size] / 2
+    total = sum(box[size] for box in boxes)
+    gap = (end - start - total) / (len(boxes) - 1)
+
+    edge = start
+    for i in order:
+        box = boxes[i]
+        center = edge + box[size] / 2
+        result[i] = (center, box[1]) if horizontal else (box[0], center)
+        edge += box[size] + gap
+    return result
+
+
+def pack_grid(boxes, columns=None, spacing=20):
+    """Pack the boxes into a grid of equal cells.
+
+    Boxes are placed in reading order of their current positions (top to
+    bottom, then left to right), starting at the top-left corner of the
+    selection.
+
+    Args:
+        boxes (list): (center x, center y, width, height) tuples
+        columns (int, optional): Number of columns; a square grid by default
+        spacing (float): Gap between cells
+
+    Returns:
+        list: New (x, y) centers
+    """
+    if not boxes:
+        return []
+    count = len(boxes)
+    columns = max(1, min(columns or math.ceil(math.sqrt(count)), count))
+
+    cell_w = max(w for x, y, w, h in boxes) + spacing
+    cell_h = max(h for x, y, w, h in boxes) + spacing
+    left, top, _, _ = bounds(boxes)
+
+    # Reading order: rows of roughly one cell height, then left to right
+    order = sorted(range(count), key=lambda i: (round((boxes[i][1] - top) / cell_h), boxes[i][0]))
+
+    result = [None] * count
+    for slot, i in enumerate(order):
+        row, column = divmod(slot, columns)
+        result[i] = (left + column * cell_w + cell_w / 2 - spacing / 2,
+                     top + row * cell_h + cell_h / 2 - spacing / 2)
+    return result
+
+
+def pack_shelves(boxes, spacing=20, max_width=None):
+    """Pack boxes of different sizes into rows, tallest first.
+
+    Rows (shelves) are filled left to right up to `max_width` and stacked
+    top to bottom, starting at the top-left corner of the boxes.
+
+    Args:
+        boxes (list): (center x, center y, width, height) tuples
+        spacing (float): Gap between boxes
+        max_width (float, optional): Row width; about that of a square arrangement by default
+
+    Returns:
+        list: New (x, y) centers
+    """
+    if not boxes:
+        return []
+    if max_width is None:
+        area = sum((w + spacing) * (h + spacing) for x, y, w, h in boxes)
+        max_width = max(max(w for x, y, w, h in boxes), math.sqrt(area))
+
+    left, top, _, _ = bounds(boxes)
+    order = sorted(range(len(boxes)), key=lambda i: (-boxes[i][3], boxes[i][1], boxes[i][0]))
+
+    result = [None] * len(boxes)
+    x, y = left, top
+    row_height = 0
+    for i in order:
+        w, h = boxes[i][2], boxes[i][3]
+        if x > left and x + w > left + max_width:
+            x = left
+            y += row_height + spacing
+            row_height = 0
+        result[i] = (x + w / 2, y + h / 2)
+        x += w + spacing
+        row_height = max(row_height, h)
+    return result
@@ -0,0 +1,505 @@
+"""
+Benchmarks for large topologies.
+
+Run from the src directory:
+    python -m utils.benchmark <name> [count]
+
+Use "python -m utils.benchmark list" to see the available benchmarks.
+"""
+import contextlib
+import gc
+import io
+import logging
+import math
+import os
+import sys
+import time
+import tracemalloc
+
+
+def _measure_memory(build):
+    """Return (result, bytes allocated) for a callable that builds some objects."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, current
+
+
+def benchmark_property_memory(count=100000):
+    """Compare per-device property dicts with shared copy-on-write property stores."""
+    from models.device import Device
+    from models.property_store import PropertyStore
+
+    device_types = Device.get_available_types()
+
+    def build_dicts():
+        devices = []
+        for i in range(count):
+            device_type = device_types[i % len(device_types)]
+            # What every device used to carry: a full copy of the type defaults
+            properties = dict(Device._default_layer(device_type))
+            properties['id'] = f"{i:08x}"
+            properties['ip_address'] = f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}"
+            devices.append(properties)
+        return devices
+
+    def build_stores():
+        devices = []
+        for i in range(count):
+            device_type = device_types[i % len(device_types)]
+            properties = PropertyStore(Device._default_layer(device_type))
+            properties['id'] = f"{i:08x}"
+            properties['ip_address'] = f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}"
+            # The search index, serializers and properties panel read every key;
+            # reading must not add overrides
+            dict(properties)
+            devices.append(properties)
+        return devices
+
+    # Build the shared layers up front so they are not charged to either side
+    for device_type in device_types:
+        Device._default_layer(device_type)
+
+    start = time.perf_counter()
+    dicts, dict_bytes = _measure_memory(build_dicts)
+    dict_time = time.perf_counter() - start
+    del dicts
+
+    start = time.perf_counter()
+    stores, store_bytes = _measure_memory(build_stores)
+    store_time = time.perf_counter() - start
+    del stores
+
+    print(f"Property memory for {count} devices:")
+    print(f"  dict per device:      {dict_bytes / 1e6:8.1f} MB  ({dict_time:.2f}s)")
+    print(f"  shared PropertyStore: {store_bytes / 1e6:8.1f} MB  ({store_time:.2f}s)")
+    if store_bytes:
+        print(f"  reduction:            {dict_bytes / store_bytes:8.1f}x")
+    return {'dict_bytes': dict_bytes, 'store_bytes': store_bytes}
+
+
+def _qt_app():
+    """Return a QApplication, creating an offscreen one when running headless."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication(sys.argv[:1])
+
+
+def _app_imports():
+    """Put src's parent directory on sys.path, as main.py does.
+
+    Some modules (e.g. controllers.device_manager) import through the src
+    package, which is only importable from the parent directory.
+    """
+    parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+
+def _create_device_grid(scene, count, spacing=120):
+    """Add `count` devices of mixed types to a scene in a square grid."""
+    from models.device import Device
+
+    device_types = Device.get_available_types()
+    columns = max(1, int(math.sqrt(count)))
+    devices = []
+    # Device construction is chatty; keep the benchmark output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(count):
+            device = Device.create(device_types[i % len(device_types)],
+                                   (i % columns) * spacing, (i // columns) * spacing)
+            scene.addItem(device)
+            devices.append(device)
+    return devices
+
+
+def _measure_pan(app, view, frames=60, step=20):
+    """Return the average time in ms to scroll the view by `step` pixels and repaint."""
+    app.processEvents()
+    scrollbar = view.horizontalScrollBar()
+    start = time.perf_counter()
+    for _ in range(frames):
+        scrollbar.setValue(scrollbar.value() + step)
+        view.viewport().repaint()
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def benchmark_device_rendering(count=20000, frames=60):
+    """Compare scene item count and pan frame time of grouped and compact devices."""
+    app = _qt_app()
+    from PyQt5.QtWidgets import QGraphicsScene, QGraphicsView
+    from models.device import Device
+
+    previous_mode = Device.compact_rendering
+    results = {}
+    try:
+        for compact in (False, True):
+            Device.set_compact_rendering(compact)
+            scene = QGraphicsScene()
+
+            start = time.perf_counter()
+            _create_device_grid(scene, count)
+            build_time = time.perf_counter() - start
+
+            view = QGraphicsView(scene)
+            view.resize(1280, 800)
+            view.scale(0.25, 0.25)
+            view.show()
+            view.centerOn(0, 0)
+            frame_ms = _measure_pan(app, view, frames)
+
+            mode = 'compact' if compact else 'grouped'
+            results[mode] = {
+                'items': len(scene.items()),
+                'build_seconds': build_time,
+                'pan_frame_ms': frame_ms,
+            }
+
+            view.close()
+            scene.clear()
+    finally:
+        Device.set_compact_rendering(previous_mode)
+
+    print(f"Device rendering with {count} devices:")
+    for mode, result in results.items():
+        print(f"  {mode:8} items: {result['items']:7d}  build: {result['build_seconds']:6.2f}s"
+              f"  pan frame: {result['pan_frame_ms']:7.2f} ms")
+    return results
+
+
+def benchmark_device_load(count=10000):
+    """Compare the time to load devices with debug tracing off and on."""
+    # The scenes below need the application for as long as they exist
+    app = _qt_app()
+    _app_imports()
+    from PyQt5.QtWidgets import QGraphicsScene
+    from models.device import Device
+    from controllers.device_manager import DeviceManager
+    from utils.logger import configure_logging, get_ring_buffer
+
+    device_types = Device.get_available_types()
+    columns = max(1, int(math.sqrt(count)))
+
+    def load():
+        # Same steps as loading a topology file
+        scene = QGraphicsScene()
+        manager = DeviceManager(scene)
+        start = time.perf_counter()
+        for i in range(count):
+            device = Device.create(device_types[i % len(device_types)],
+                                   (i % columns) * 120, (i // columns) * 120)
+            scene.addItem(device)
+            manager.register_device(device)
+        elapsed = time.perf_counter() - start
+        scene.clear()
+        app.processEvents()
+        return elapsed
+
+    results = {}
+    for name, level in (('tracing off', logging.INFO), ('tracing on', logging.DEBUG)):
+        # Bind the console handler to a buffer so terminal speed does not count
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            configure_logging(level=level)
+            elapsed = load()
+        ring_buffer = get_ring_buffer()
+        results[name] = {
+            'seconds': elapsed,
+            'records': len(ring_buffer.records) if ring_buffer else 0,
+            'console_bytes': len(output.getvalue()),
+        }
+    configure_logging()
+
+    print(f"Loading {count} devices:")
+    for name, result in results.items():
+        print(f"  {name:12} {result['seconds']:6.2f}s  {result['records']:6d} buffered records"
+              f"  {result['console_bytes'] / 1e6:6.1f} MB console output")
+    return results
+
+
+def benchmark_event_dispatch(count=100000, devices=5000):
+    """Compare mouse-move throughput of signal dispatch and the coalescing EventDispatcher."""
+    app = _qt_app()
+    from PyQt5.QtCore import QEvent, QPointF, Qt
+    from PyQt5.QtGui import QMouseEvent
+    from PyQt5.QtWidgets import QGraphicsLineItem, QGraphicsView
+    from views.topology_scene import TopologyScene
+    from controllers.event_dispatcher import EventDispatcher
+
+    scene = TopologyScene()
+    _create_device_grid(scene, devices)
+    line = QGraphicsLineItem(0, 0, 0, 0)
+    scene.addItem(line)
+    calls = [0]
+
+    # Scene mouse events cannot be created from Python; send widget events to
+    # a view, which turns them into scene events as it does for the pointer
+    view = QGraphicsView(scene)
+    view.resize(1280, 800)
+    view.show()
+    app.processEvents()
+    viewport = view.viewport()
+
+    def on_move(event, scene_pos):
+        # What the connection tool does on every move
+        calls[0] += 1
+        line.setLine(0, 0, scene_pos.x(), scene_pos.y())
+        return True
+
+    def run():
+        calls[0] = 0
+        start = time.perf_counter()
+        for i in range(count):
+            # Dragging with the left button held, as when drawing a connection
+            event = QMouseEvent(QEvent.MouseMove, QPointF(i % 1000, i % 700),
+                                Qt.NoButton, Qt.LeftButton, Qt.NoModifier)
+            app.sendEvent(viewport, event)
+        if scene.event_dispatcher is not None:
+            scene.event_dispatcher.flush_move()
+        return time.perf_counter() - start
+
+    results = {}
+
+    # Previous pipeline: scene signal to a slot that checks the mode
+    mode = "connection_mode"
+
+    def on_move_signal(event):
+        scene_pos = event.scenePos()
+        try:
+            if mode == "select_mode":
+                pass
+            elif mode == "connection_mode":
+                on_move(event, scene_pos)
+            elif mode == "boundary_mode":
+                pass
+        except Exception as e:
+            print(f"Error handling mouse move: {e}")
+
+    scene.mouse_move_signal.connect(on_move_signal)
+    results['signal'] = (run(), calls[0])
+    scene.mouse_move_signal.disconnect(on_move_signal)
+
+    for name, coalesce in (('dispatcher', False), ('coalesced', True)):
+        dispatcher = EventDispatcher(coalesce_moves=coalesce)
+        dispatcher.register_mode(mode, move=on_move)
+        dispatcher.set_mode(mode)
+        dispatcher.attach(scene)
+        results[name] = (run(), calls[0])
+        scene.event_dispatcher = None
+
+    print(f"Dispatching {count} mouse moves over {devices} devices:")
+    for name, (elapsed, handled) in results.items():
+        print(f"  {name:10} {count / elapsed:10.0f} events/s  {handled:7d} handler calls")
+    view.close()
+    scene.clear()
+    return {name: {'events_per_second': count / elapsed, 'handler_calls': handled}
+            for name, (elapsed, handled) in results.items()}
+
+
+def _random_graph(count, extra_edges=0.5, seed=0):
+    """Return (positions, edges) of a random tree with some extra edges, like a network."""
+    import random
+
+    rng = random.Random(seed)
+    side = 120 * math.sqrt(count)
+    positions = [(rng.uniform(0, side), rng.uniform(0, side)) for _ in range(count)]
+    edges = [(rng.randrange(i), i) for i in range(1, count)]
+    for _ in range(int(count * extra_edges)):
+        edges.append((rng.randrange(count), rng.randrange(count)))
+    return positions, edges
+
+
+def benchmark_force_layout(count=0, iterations=20):
+    """Time iterations of the Barnes-Hut force layout at 1k, 10k and 50k nodes (or `count`)."""
+    from utils.force_layout import ForceLayout
+
+    sizes = (count,) if count else (1000, 10000, 50000)
+    results = {}
+    for size in sizes:
+        positions, edges = _random_graph(size)
+        layout = ForceLayout(positions, edges, iterations=iterations)
+        start = time.perf_counter()
+        layout.run(iterations)
+        results[size] = (time.perf_counter() - start) / iterations
+
+    print(f"Force layout, {iterations} iterations:")
+    for size, seconds in results.items():
+        print(f"  {size:6d} nodes  {seconds * 1000:8.1f} ms/iteration")
+    return {size: {'seconds_per_iteration': seconds} for size, seconds in results.items()}
+
+
+def benchmark_zone_layout(sites=200, devices_per_site=50):
+    """Compare a layered layout of a whole WAN with laying out its sites as boundary zones."""
+    import random
+    from utils.layered_layout import layered_layout
+    from utils.zone_layout import zone_layout
+
+    rng = random.Random(0)
+    types, edges, zones = ['cloud'], [], {}
+    for site in range(sites):
+        # Router, a few switches and hosts per site; the router uplinks to the WAN
+        site_types = ['router'] + ['switch'] * 4 + ['workstation'] * (devices_per_site - 5)
+        site_edges = [(0, i) for i in range(1, 5)] + [(rng.randrange(1, 5), i) for i in range(5, devices_per_site)]
+        offset = len(types)
+        types += site_types
+        edges += [(0, offset)] + [(a + offset, b + offset) for a, b in site_edges]
+        zones[f"site{site}"] = (site_types, site_edges, [(60, 60)] * devices_per_site)
+    zones[None] = (['cloud'], [], [(60, 60)])
+    children = {None: list(zones)[:-1]}
+
+    results = {}
+    start = time.perf_counter()
+    layered_layout(types, edges)
+    results['whole graph'] = time.perf_counter() - start
+    for name, parallel in (('zones', False), ('zones, pool', True)):
+        start = time.perf_counter()
+        zone_layout(zones, children, parallel=parallel)
+        results[name] = time.perf_counter() - start
+
+    print(f"Laying out {sites} sites of {devices_per_site} devices:")
+    for name, seconds in results.items():
+        print(f"  {name:12} {seconds:6.2f}s")
+    return {name: {'seconds': seconds} for name, seconds in results.items()}
+
+
+def benchmark_topology_graph(count=100000):
+    """Time incremental updates and cached analytics queries on a large topology graph."""
+    import random
+    from utils.topology_graph import TopologyGraph
+
+    rng = random.Random(0)
+    _, edges = _random_graph(count, extra_edges=0.1)
+    graph = TopologyGraph()
+    start = time.perf_counter()
+    for i in range(count):
+        graph.add_node(i)
+    for key, (a, b) in enumerate(edges):
+        graph.add_edge(key, a, b)
+    build = time.perf_counter() - start
+
+    queries = (
+        ('components', graph.components),
+        ('degree stats', graph.degree_stats),
+        ('diameter', graph.diameter),
+        ('shortest path', lambda: graph.shortest_path(rng.randrange(count), rng.randrange(count))),
+    )
+    results = {}
+    for name, query in queries:
+        start = time.perf_counter()
+        query()
+        first = time.perf_counter() - start
+        start = time.perf_counter()
+        query()
+        results[name] = (first, time.perf_counter() - start)
+
+    # One edit invalidates the cache; the next query recomputes
+    start = time.perf_counter()
+    graph.add_edge('extra', 0, count - 1)
+    update = time.perf_counter() - start
+
+    print(f"Topology graph of {count} devices, {len(edges)} connections "
+          f"(built in {build:.2f}s, one update {update * 1e6:.0f} us):")
+    for name, (first, again) in results.items():
+        print(f"  {name:14} first {first * 1000:8.1f} ms  again {again * 1000:8.3f} ms")
+    return {name: {'first_seconds': first, 'again_seconds': again} for name, (first, again) in results.items()}
+
+
+def benchmark_resilience(count=20000):
+    """Time finding articulation points and bridges, before and after an edit."""
+    from utils.topology_graph import TopologyGraph
+
+    _, edges = _random_graph(count, extra_edges=0.25)
+    graph = TopologyGraph()
+    for key, (a, b) in enumerate(edges):
+        graph.add_edge(key, a, b)
+
+    results = {}
+    for name in ('first', 'cached', 'after edit'):
+        if name == 'after edit':
+            graph.add_edge('extra', 0, count - 1)
+        start = time.perf_counter()
+        points = graph.articulation_points()
+        bridges = graph.bridges()
+        results[name] = time.perf_counter() - start
+
+    print(f"Single points of failure in {count} devices: {len(points)} devices, {len(bridges)} links")
+    for name, seconds in results.items():
+        print(f"  {name:10} {seconds * 1000:8.2f} ms")
+    return {name: {'seconds': seconds} for name, seconds in results.items()}
+
+
+def benchmark_search_index(count=100000, repeat=5):
+    """Time building the device search index and palette queries against it."""
+    import random
+    from types import SimpleNamespace
+    from models.device import Device
+    from models.property_store import PropertyStore
+    from utils.search_index import DeviceSearchIndex
+
+    rng = random.Random(0)
+    device_types = Device.get_available_types()
+    devices = []
+    for i in range(count):
+        device_type = device_types[i % len(device_types)]
+        # What DeviceManager indexes: name, 8-character ID and the property store
+        properties = PropertyStore(Device._default_layer(device_type))
+        properties['id'] = f"{rng.getrandbits(32):08x}"
+        properties['ip_address'] = f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}"
+        devices.append(SimpleNamespace(name=f"{device_type.capitalize()} {i}",
+                                       id=properties['id'], properties=properties))
+
+    index = DeviceSearchIndex()
+    start = time.perf_counter()
+    for device in devices:
+        index.add(device.id, DeviceSearchIndex.fields_for_device(device))
+    build = time.perf_counter() - start
+
+    queries = ['server 77', 'Router 12345', devices[count // 2].id, '10.0.1', 'ospf',
+               'linux 77', 'active 5', 'routr 12', 'swtch 5', 'sever 77', 'server 99999999', 'zzz']
+    results = {}
+    for query in queries:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            found = index.search(query)
+            timings.append(time.perf_counter() - start)
+        results[query] = (max(timings), len(found))
+
+    print(f"Search index of {count} devices (built in {build:.2f}s), slowest of {repeat} runs:")
+    for query, (seconds, hits) in results.items():
+        print(f"  {query!r:20} {seconds * 1000:7.2f} ms  {hits:3d} hits")
+    return {'build_seconds': build,
+            'queries': {query: {'seconds': seconds, 'hits': hits} for query, (seconds, hits) in results.items()}}
+
+
+BENCHMARKS = {
+    'property_memory': benchmark_property_memory,
+    'device_rendering': benchmark_device_rendering,
+    'device_load': benchmark_device_load,
+    'event_dispatch': benchmark_event_dispatch,
+    'force_layout': benchmark_force_layout,
+    'zone_layout': benchmark_zone_layout,
+    'topology_graph': benchmark_topology_graph,
+    'resilience': benchmark_resilience,
+    'search_index': benchmark_search_index,
+}
+
+
+def main(argv=None):
+    """Run a benchmark by name from the command line."""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in BENCHMARKS:
+        print("Available benchmarks: " + ", ".join(sorted(BENCHMARKS)))
+        return 1
+
+    benchmark = BENCHMARKS[argv[0]]
+    args = [int(arg) for arg in argv[1:]]
+    benchmark(*args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,7 @@
-import logging
-import sys
+from utils.logger import get_logger
+
+log = get_logger('debug')
 
 def debug(message):
-    """Print debug message with timestamp."""
-    print(f"DEBUG: {message}")
-    sys.stdout.flush()  # Force immediate output
\ No newline at end of file
+    """Log a debug message (formatted by the caller)."""
+    log.debug("%s", message)
\ No newline at end of file
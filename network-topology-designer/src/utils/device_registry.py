@@ -1,14 +1,41 @@
 import os
+
+from utils.resource_manifest import get_manifest
 from PyQt5.QtGui import QIcon, QPixmap, QPainter, QPen, QBrush, QColor
 from PyQt5.QtCore import Qt
 
 class DeviceRegistry:
     """Manages the registry of available device types and their icons."""
     
-    def __init__(self, icons_dir="src/icons/device_icons"):
-        """Initialize the registry with the path to device icons."""
-        self.icons_dir = self._find_icons_directory(icons_dir)
-        self.device_types = self._discover_device_types()
+    # Icons directory of the application, listed through the resource manifest
+    DEFAULT_ICONS_DIR = "src/icons/device_icons"
+    
+    # Logical manifest directory of the default icons
+    MANIFEST_ICONS_DIR = "device_icons"
+    
+    def __init__(self, icons_dir=DEFAULT_ICONS_DIR):
+        """Initialize the registry with the path to device icons.
+        
+        The icons directory is only located and listed on first use, so
+        creating a registry (e.g. with the device dialog) touches no files.
+        """
+        self._relative_icons_dir = icons_dir
+        self._icons_dir = None
+        self._device_types = None
+    
+    @property
+    def icons_dir(self):
+        """Absolute path of the icons directory, located on first access."""
+        if self._icons_dir is None:
+            self._icons_dir = self._find_icons_directory(self._relative_icons_dir)
+        return self._icons_dir
+    
+    @property
+    def device_types(self):
+        """Device types discovered from the icons directory on first access."""
+        if self._device_types is None:
+            self._device_types = self._discover_device_types()
+        return self._device_types
         
     def _find_icons_directory(self, relative_path):
         """Find the absolute path to the icons directory."""
@@ -29,24 +56,34 @@ class DeviceRegistry:
         os.makedirs(abs_path, exist_ok=True)
         return abs_path
         
-    def _discover_device_types(self):
-        """Discover available device types from icon files."""
-        device_types = []
+    def _icon_files(self):
+        """Return (filename, path) of the files in the icons directory."""
+        if self._relative_icons_dir == self.DEFAULT_ICONS_DIR:
+            # The application's own icons are already in the resource manifest
+            manifest = get_manifest()
+            return [(name.rpartition("/")[2], manifest.get(name))
+                    for name in manifest.list_dir(self.MANIFEST_ICONS_DIR)]
         
         # Ensure the directory exists
         if not os.path.exists(self.icons_dir):
             print(f"Warning: Icons directory {self.icons_dir} not found")
-            return device_types
+            return []
+        return [(filename, os.path.join(self.icons_dir, filename))
+                for filename in os.listdir(self.icons_dir)]
+    
+    def _discover_device_types(self):
+        """Discover available device types from icon files."""
+        device_types = []
         
         # Get all PNG files in the directory
-        for filename in os.listdir(self.icons_dir):
+        for filename, path in self._icon_files():
             if filename.lower().endswith('.png'):
                 # The device type is the filename without extension
                 device_type = os.path.splitext(filename)[0].lower()
                 device_types.append({
                     "type": device_type,
                     "name": device_type.capitalize(),
-                    "icon_path": os.path.join(self.icons_dir, filename)
+                    "icon_path": path
                 })
         
         # Add default types if no icons found
@@ -165,6 +202,8 @@ class DeviceRegistry:
                     print(f"Failed to save icon to {icon_path}")
                 else:
                     print(f"Created placeholder icon: {icon_path}")
+                    if self._relative_icons_dir == self.DEFAULT_ICONS_DIR:
+                        get_manifest().add_file(f"{self.MANIFEST_ICONS_DIR}/{device_type}.png", icon_path)
                 
                 # Update the device type with the new icon path
                 for device in self.device_types:
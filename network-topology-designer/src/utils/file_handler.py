@@ -104,7 +104,7 @@ class FileHandler(QObject):
                         "name": device.name,
                         "x": device.scenePos().x(),
                         "y": device.scenePos().y(),
-                        "properties": getattr(device, "properties", {})
+                        "properties": dict(getattr(device, "properties", {}))
                     }
                 
                 devices_data.append(device_data)
@@ -223,7 +223,7 @@ class FileHandler(QObject):
                     # Add to scene & manager
                     if device and self.device_manager.scene:
                         self.device_manager.scene.addItem(device)
-                        self.device_manager.devices[device.id] = device
+                        self.device_manager.register_device(device)
                 else:
                     # Create device manually
                     device_id = device_data.get("id")
@@ -242,7 +242,7 @@ class FileHandler(QObject):
                     # Add to scene & manager
                     if self.device_manager.scene:
                         self.device_manager.scene.addItem(device)
-                    self.device_manager.devices[device.id] = device
+                    self.device_manager.register_device(device)
         
         except Exception as e:
             print(f"Error importing devices: {str(e)}")
@@ -303,7 +303,7 @@ class FileHandler(QObject):
                     # Add to scene & controller
                     if boundary and self.boundary_controller.scene:
                         self.boundary_controller.scene.addItem(boundary)
-                        self.boundary_controller.boundaries[boundary.id] = boundary
+                        self.boundary_controller.register_boundary(boundary)
                 else:
                     # Create boundary manually
                     boundary_id = boundary_data.get("id", str(id(boundary_data)))
@@ -322,7 +322,7 @@ class FileHandler(QObject):
                     # Add to scene & controller
                     if self.boundary_controller.scene:
                         self.boundary_controller.scene.addItem(boundary)
-                    self.boundary_controller.boundaries[boundary.id] = boundary
+                    self.boundary_controller.register_boundary(boundary)
         
         except Exception as e:
             print(f"Error importing boundaries: {str(e)}")
@@ -0,0 +1,267 @@
+"""
+Force-directed layout with Barnes-Hut repulsion.
+
+Devices repel each other and connections pull their end points together
+(Fruchterman-Reingold forces). Computing every pairwise repulsion is
+O(n^2); instead the nodes are put in a quadtree and a whole cell is treated
+as one body at its center of mass when it is small compared to its
+distance (Barnes-Hut), which makes an iteration O(n log n).
+
+The quadtree is stored level by level in flat numpy arrays: nodes are
+sorted by their Morton (Z-order) code, so the cells of every level are
+contiguous runs of that order, and their counts and centers of mass are
+computed with a single reduceat per level. The tree walk is vectorized
+across all nodes at once: each level holds the (node, cell) pairs still to
+visit, accepted pairs add their force and the rest are expanded into the
+cell's children. Spring forces are vectorized over the edge arrays.
+
+ForceLayout works in-process; layout_worker() runs it in a separate
+process and streams intermediate positions back through a queue, which
+is how LayoutController keeps the UI responsive. numpy is required and is
+imported on first use.
+"""
+import math
+import queue
+import time
+import traceback
+
+# numpy is imported on first use (see _numpy())
+np = None
+
+# Quadtree depth; cells at the deepest level are 1/65536 of the layout size
+MAX_DEPTH = 16
+
+
+def _numpy():
+    """Return the numpy module, importing it on first use."""
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("Automatic layout requires numpy (pip install numpy)")
+        np = numpy
+    return np
+
+
+def _spread_bits(values):
+    """Interleave zeros between the low 16 bits of each value."""
+    values = values & 0xFFFF
+    values = (values | (values << 8)) & 0x00FF00FF
+    values = (values | (values << 4)) & 0x0F0F0F0F
+    values = (values | (values << 2)) & 0x33333333
+    values = (values | (values << 1)) & 0x55555555
+    return values
+
+
+class QuadTree:
+    """Barnes-Hut quadtree stored as one set of flat arrays per level."""
+
+    def __init__(self, positions):
+        """Build the tree over an (n, 2) array of positions."""
+        _numpy()
+        count = len(positions)
+        low = positions.min(axis=0)
+        high = positions.max(axis=0)
+        self.size = float(max(high - low)) or 1.0
+
+        # Morton code of each position on a 2^MAX_DEPTH grid
+        cells_per_side = 1 << MAX_DEPTH
+        grid = ((positions - low) * ((cells_per_side - 1) / self.size)).astype(np.int64)
+        codes = _spread_bits(grid[:, 0]) | (_spread_bits(grid[:, 1]) << 1)
+        order = np.argsort(codes, kind='stable')
+        codes = codes[order]
+        sorted_positions = positions[order]
+
+        # Per level: cell codes, node counts and centers of mass
+        self.levels = []
+        for level in range(MAX_DEPTH + 1):
+            cell_codes = codes >> (2 * (MAX_DEPTH - level))
+            starts = np.flatnonzero(np.r_[True, cell_codes[1:] != cell_codes[:-1]])
+            counts = np.diff(np.r_[starts, count])
+            centers = np.add.reduceat(sorted_positions, starts, axis=0) / counts[:, None]
+            self.levels.append((cell_codes[starts], counts, centers))
+            if counts.max() == 1:
+                # Every cell holds one node; deeper levels would be identical
+                break
+
+        # Range of child cells (in the next level) of every cell
+        self.children = []
+        for (codes_here, _, _), (codes_next, _, _) in zip(self.levels, self.levels[1:]):
+            parents = codes_next >> 2
+            self.children.append((np.searchsorted(parents, codes_here, 'left'),
+                                  np.searchsorted(parents, codes_here, 'right')))
+
+    def repulsion(self, positions, strength, theta=0.8, softening=1e-2):
+        """Return the repulsive force on every node.
+
+        The force between two bodies is strength * mass / distance, directed
+        away from the other body.
+
+        Args:
+            positions: (n, 2) array the tree was built from
+            strength (float): Force constant (k^2 in Fruchterman-Reingold)
+            theta (float): Opening angle; larger is faster and less accurate
+            softening (float): Minimum squared distance, avoids huge forces
+
+        Returns:
+            (n, 2) array of forces
+        """
+        count = len(positions)
+        force_x = np.zeros(count)
+        force_y = np.zeros(count)
+        theta_sq = theta * theta
+
+        # Every node starts at the root cell
+        nodes = np.arange(count)
+        cells = np.zeros(count, dtype=np.int64)
+        last_level = len(self.levels) - 1
+        for level, (_, counts, centers) in enumerate(self.levels):
+            if not len(nodes):
+                break
+            cell_size = self.size / (1 << level)
+            delta = positions[nodes] - centers[cells]
+            dist_sq = np.einsum('ij,ij->i', delta, delta)
+            masses = counts[cells]
+
+            # Far enough (or a single node, or the deepest level): use the cell as one body
+            accept = (masses == 1) | (cell_size * cell_size < theta_sq * dist_sq)
+            if level == last_level:
+                accept[:] = True
+
+            # A node's own leaf is at distance 0 and exerts no force
+            use = accept & (dist_sq > 0)
+            scale = strength * masses[use] / np.maximum(dist_sq[use], softening)
+            force_x += np.bincount(nodes[use], weights=delta[use, 0] * scale, minlength=count)
+            force_y += np.bincount(nodes[use], weights=delta[use, 1] * scale, minlength=count)
+
+            if level == last_level:
+                break
+
+            # Visit the children of the cells that were too close
+            nodes = nodes[~accept]
+            cells = cells[~accept]
+            first, end = self.children[level]
+            first = first[cells]
+            child_counts = end[cells] - first
+            total = int(child_counts.sum())
+            offsets = np.arange(total) - np.repeat(np.cumsum(child_counts) - child_counts, child_counts)
+            nodes = np.repeat(nodes, child_counts)
+            cells = np.repeat(first, child_counts) + offsets
+
+        return np.column_stack((force_x, force_y))
+
+
+class ForceLayout:
+    """Iterative force-directed layout of a graph."""
+
+    def __init__(self, positions, edges, pinned=None, ideal_length=120.0, theta=0.8,
+                 gravity=0.02, iterations=300, seed=0):
+        """Initialize the layout.
+
+        Args:
+            positions: (n, 2) sequence of starting positions
+            edges: (m, 2) sequence of node index pairs
+            pinned: Optional sequence of n booleans; pinned nodes do not move
+            ideal_length (float): Preferred edge length in scene units
+            theta (float): Barnes-Hut opening angle
+            gravity (float): Pull towards the center, keeps components together
+            iterations (int): Iterations the cooling schedule is planned for
+            seed (int): Seed of the jitter that separates coincident nodes
+        """
+        _numpy()
+        self.positions = np.array(positions, dtype=float).reshape(-1, 2)
+        edges = np.array(edges, dtype=np.int64).reshape(-1, 2)
+        # Self loops exert no force
+        self.edges = edges[edges[:, 0] != edges[:, 1]]
+        count = len(self.positions)
+        self.pinned = (np.zeros(count, dtype=bool) if pinned is None
+                       else np.array(pinned, dtype=bool))
+        self.ideal_length = float(ideal_length)
+        self.theta = theta
+        self.gravity = gravity
+        self.iteration = 0
+
+        # Imported devices often share a position; nudge the free ones apart
+        free = ~self.pinned
+        if free.any():
+            rng = np.random.default_rng(seed)
+            self.positions[free] += rng.uniform(-1, 1, (int(free.sum()), 2)) * self.ideal_length * 0.05
+
+        # Cooling: the maximum step shrinks geometrically to a small final value
+        self.temperature = self.ideal_length * max(1.0, math.sqrt(count)) * 0.1
+        final = self.ideal_length * 0.01
+        self.cooling = (final / self.temperature) ** (1.0 / max(1, iterations)) if self.temperature > final else 1.0
+
+    def forces(self):
+        """Return the net force on every node."""
+        positions = self.positions
+        count = len(positions)
+        k = self.ideal_length
+        if count < 2:
+            return np.zeros_like(positions)
+
+        forces = QuadTree(positions).repulsion(positions, k * k, self.theta)
+
+        # Springs: attraction d^2 / k along each edge
+        if len(self.edges):
+            source, target = self.edges[:, 0], self.edges[:, 1]
+            delta = positions[target] - positions[source]
+            pull = delta * (np.sqrt(np.einsum('ij,ij->i', delta, delta)) / k)[:, None]
+            for axis in (0, 1):
+                forces[:, axis] += np.bincount(source, weights=pull[:, axis], minlength=count)
+                forces[:, axis] -= np.bincount(target, weights=pull[:, axis], minlength=count)
+
+        if self.gravity:
+            forces -= (positions - positions.mean(axis=0)) * (self.gravity * k / max(1.0, math.sqrt(count)))
+        return forces
+
+    def step(self):
+        """Run one iteration; returns the largest distance a node moved."""
+        forces = self.forces()
+        forces[self.pinned] = 0
+
+        # Limit each move to the current temperature
+        length = np.sqrt(np.einsum('ij,ij->i', forces, forces))
+        scale = np.minimum(length, self.temperature) / np.maximum(length, 1e-12)
+        moves = forces * scale[:, None]
+        self.positions += moves
+
+        self.temperature *= self.cooling
+        self.iteration += 1
+        return float((length * scale).max()) if len(length) else 0.0
+
+    def run(self, iterations, callback=None):
+        """Run several iterations, calling callback(iteration, positions) after each."""
+        for _ in range(iterations):
+            self.step()
+            if callback is not None and callback(self.iteration, self.positions) is False:
+                break
+        return self.positions
+
+
+def layout_worker(positions, edges, pinned, options, result_queue, stop_event, report_interval=0.1):
+    """Run a ForceLayout in a worker process.
+
+    Puts ('progress', iteration, positions) at most every `report_interval`
+    seconds (dropped while the queue is full), then ('done', iteration,
+    positions), or ('error', 0, message) if the layout failed.
+    """
+    try:
+        iterations = options.get('iterations', 300)
+        layout = ForceLayout(positions, edges, pinned, **options)
+        last_report = time.perf_counter()
+        for _ in range(iterations):
+            if stop_event.is_set():
+                break
+            layout.step()
+            now = time.perf_counter()
+            if now - last_report >= report_interval:
+                last_report = now
+                try:
+                    result_queue.put_nowait(('progress', layout.iteration, layout.positions.copy()))
+                except queue.Full:
+                    pass
+        result_queue.put(('done', layout.iteration, layout.positions))
+    except Exception:
+        result_queue.put(('error', 0, traceback.format_exc()))
@@ -0,0 +1,332 @@
+"""
+Hierarchical (Sugiyama) layout for tiered networks.
+
+Network diagrams read top to bottom: WAN/cloud, firewalls, routers,
+switches, then hosts. The layout works in the usual Sugiyama phases:
+
+1. Layers: each device gets the tier of its type (TYPE_TIERS); within a
+   tier, devices are pushed down by their distance from where the tier is
+   entered, so core, distribution and access switches get their own
+   layers. Devices of other types take the tier of the nearest typed
+   device. One breadth-first search per tier, O(V + E).
+2. Connections that skip layers are split with dummy nodes so every edge
+   joins neighbouring layers.
+3. Ordering: layers are swept down and up, sorting each layer by the
+   barycenter of its neighbours' positions in the previous layer; the
+   order with the fewest crossings (counted in O(E log V)) is kept.
+4. Coordinates: each layer is placed in one left-to-right pass at its
+   neighbours' mean x with minimum spacing, then shifted to best match
+   those targets; one pass down and one up, linear per layer.
+
+layered_layout() runs all phases.
+
+This module has no Qt dependency.
+"""
+from collections import deque
+
+# Top to bottom; types not listed take the tier of the nearest typed device
+TYPE_TIERS = {
+    'cloud': 0,
+    'firewall': 1,
+    'router': 2,
+    'switch': 3,
+    'server': 4,
+    'workstation': 4,
+}
+
+# Size used for devices without one (scene units)
+DEFAULT_SIZE = (60, 60)
+
+
+def _adjacency(count, edges):
+    """Return neighbour lists, ignoring self loops and duplicate connections."""
+    neighbours = [set() for _ in range(count)]
+    for a, b in edges:
+        if a != b:
+            neighbours[a].add(b)
+            neighbours[b].add(a)
+    return [sorted(n) for n in neighbours]
+
+
+def assign_layers(types, edges):
+    """Assign every node a layer index from its type and graph distance.
+
+    Args:
+        types (list): Device type of each node
+        edges (list): (i, j) node index pairs
+
+    Returns:
+        list: Layer index of each node, 0 at the top, with no empty layers
+    """
+    count = len(types)
+    neighbours = _adjacency(count, edges)
+    tiers = [TYPE_TIERS.get(t) for t in types]
+
+    # Untyped nodes take the tier of the nearest typed node
+    queue = deque(i for i in range(count) if tiers[i] is not None)
+    while queue:
+        node = queue.popleft()
+        for other in neighbours[node]:
+            if tiers[other] is None:
+                tiers[other] = tiers[node]
+                queue.append(other)
+    tiers = [0 if tier is None else tier for tier in tiers]
+
+    # Within a tier: distance from the nodes connected to a higher tier
+    depth = [None] * count
+
+    def spread(queue):
+        while queue:
+            node = queue.popleft()
+            for other in neighbours[node]:
+                if depth[other] is None and tiers[other] == tiers[node]:
+                    depth[other] = depth[node] + 1
+                    queue.append(other)
+
+    entries = [node for node in range(count)
+               if any(tiers[other] < tiers[node] for other in neighbours[node])]
+    for node in entries:
+        depth[node] = 0
+    spread(deque(entries))
+    # Groups not entered from above start at their best connected node
+    for start in sorted(range(count), key=lambda node: -len(neighbours[node])):
+        if depth[start] is None:
+            depth[start] = 0
+            spread(deque([start]))
+
+    keys = sorted(set(zip(tiers, depth)))
+    rank = {key: i for i, key in enumerate(keys)}
+    return [rank[key] for key in zip(tiers, depth)]
+
+
+def _split_long_edges(layer_of, edges):
+    """Return (layer of every node including dummies, edges between neighbouring layers)."""
+    layer_of = list(layer_of)
+    proper = set()
+    for a, b in edges:
+        if layer_of[a] == layer_of[b]:
+            # Same-layer connections do not take part in ordering
+            continue
+        if layer_of[a] > layer_of[b]:
+            a, b = b, a
+        previous = a
+        for layer in range(layer_of[a] + 1, layer_of[b]):
+            dummy = len(layer_of)
+            layer_of.append(layer)
+            proper.add((previous, dummy))
+            previous = dummy
+        proper.add((previous, b))
+    return layer_of, sorted(proper)
+
+
+def count_crossings(upper, lower, edges_down):
+    """Count the edge crossings between two neighbouring layers.
+
+    Args:
+        upper (list): Nodes of the upper layer in order
+        lower (list): Nodes of the lower layer in order
+        edges_down (list): Lower neighbours of every node
+
+    Returns:
+        int: Number of crossing edge pairs
+    """
+    position = {node: i for i, node in enumerate(lower)}
+    targets = [position[other] for node in upper for other in sorted(edges_down[node], key=position.get)]
+
+    # Inversions of the target sequence, with a Fenwick tree
+    size = len(lower)
+    tree = [0] * (size + 1)
+    crossings = 0
+    for seen, target in enumerate(targets):
+        # Earlier edges ending right of this one cross it
+        i = target + 1
+        not_greater = 0
+        while i > 0:
+            not_greater += tree[i]
+            i -= i & -i
+        crossings += seen - not_greater
+        i = target + 1
+        while i <= size:
+            tree[i] += 1
+            i += i & -i
+    return crossings
+
+
+def order_layers(layers, up, down, sweeps=8):
+    """Reorder the layers to reduce crossings with the barycenter heuristic.
+
+    Args:
+        layers (list): Node lists, one per layer, in their initial order
+        up (list): Upper-layer neighbours of every node
+        down (list): Lower-layer neighbours of every node
+        sweeps (int): Maximum number of down and up sweeps
+
+    Returns:
+        list: Node lists in the order with the fewest crossings found
+    """
+    layers = [list(layer) for layer in layers]
+
+    def total_crossings():
+        return sum(count_crossings(layers[i], layers[i + 1], down) for i in range(len(layers) - 1))
+
+    def reorder(layer, fixed, neighbours):
+        position = {node: i for i, node in enumerate(fixed)}
+        keys = {}
+        for i, node in enumerate(layer):
+            adjacent = neighbours[node]
+            # Nodes without neighbours there keep their place
+            keys[node] = (sum(position[n] for n in adjacent) / len(adjacent) * len(layer) / max(1, len(fixed))
+                          if adjacent else float(i), i)
+        layer.sort(key=keys.get)
+
+    best = [list(layer) for layer in layers]
+    best_crossings = total_crossings()
+    for sweep in range(sweeps):
+        if best_crossings == 0:
+            break
+        if sweep % 2 == 0:
+            for i in range(1, len(layers)):
+                reorder(layers[i], layers[i - 1], up)
+        else:
+            for i in range(len(layers) - 2, -1, -1):
+                reorder(layers[i], layers[i + 1], down)
+        crossings = total_crossings()
+        if crossings < best_crossings:
+            best = [list(layer) for layer in layers]
+            best_crossings = crossings
+    return best
+
+
+def _place_layer(layer, targets, widths, spacing, x):
+    """Place one layer at its targets, keeping order and minimum gaps.
+
+    Nodes are pushed right as needed in one pass, then the layer is shifted
+    so the nodes with a target are on average centered on their targets.
+    """
+    placed = []
+    offset = 0.0
+    weighted = 0
+    previous = None
+    previous_x = 0.0
+    for node in layer:
+        target = targets[node]
+        if previous is None:
+            position = target if target is not None else 0.0
+        else:
+            gap = (widths[previous] + widths[node]) / 2 + spacing
+            position = previous_x + gap
+            if target is not None:
+                position = max(position, target)
+        if target is not None:
+            offset += target - position
+            weighted += 1
+        placed.append(position)
+        previous, previous_x = node, position
+
+    shift = offset / weighted if weighted else 0.0
+    for node, position in zip(layer, placed):
+        x[node] = position + shift
+
+
+def assign_coordinates(layers, up, down, widths, heights, layer_spacing=120, node_spacing=40):
+    """Return the (x, y) center of every node.
+
+    Args:
+        layers (list): Ordered node lists, one per layer
+        up (list): Upper-layer neighbours of every node
+        down (list): Lower-layer neighbours of every node
+        widths (list): Width of every node (0 for dummies)
+        heights (list): Height of every node (0 for dummies)
+        layer_spacing (float): Vertical gap between layers
+        node_spacing (float): Horizontal gap between devices
+    """
+    count = len(widths)
+    x = [0.0] * count
+
+    def spacing_between(layer):
+        # Dummy nodes only need to keep bends apart
+        return node_spacing if all(widths[node] for node in layer) else node_spacing / 2
+
+    def mean_x(neighbours):
+        return sum(x[n] for n in neighbours) / len(neighbours) if neighbours else None
+
+    # Down: each layer under its parents
+    for i, layer in enumerate(layers):
+        targets = {node: mean_x(up[node]) if i else None for node in layer}
+        _place_layer(layer, targets, widths, spacing_between(layer), x)
+    # Up: parents over their children
+    for layer in reversed(layers[:-1]):
+        targets = {node: mean_x(down[node]) if down[node] else x[node] for node in layer}
+        _place_layer(layer, targets, widths, spacing_between(layer), x)
+
+    y = [0.0] * count
+    top = 0.0
+    previous_height = None
+    for layer in layers:
+        height = max(heights[node] for node in layer)
+        if previous_height is not None:
+            top += (previous_height + height) / 2 + layer_spacing
+        for node in layer:
+            y[node] = top
+        previous_height = height
+    return list(zip(x, y))
+
+
+def layered_layout(types, edges, sizes=None, positions=None, layer_spacing=120,
+                   node_spacing=40, sweeps=8):
+    """Lay out a graph in layers.
+
+    Args:
+        types (list): Device type of each node
+        edges (list): (i, j) node index pairs
+        sizes (list, optional): (width, height) of each node
+        positions (list, optional): Current (x, y) centers; they set the
+            initial order within layers, and the result is placed with its
+            top-left corner where theirs was
+        layer_spacing (float): Vertical gap between layers
+        node_spacing (float): Horizontal gap between devices
+        sweeps (int): Crossing reduction sweeps
+
+    Returns:
+        list: New (x, y) center of each node
+    """
+    count = len(types)
+    if not count:
+        return []
+    sizes = list(sizes) if sizes is not None else [DEFAULT_SIZE] * count
+
+    layer_of, proper = _split_long_edges(assign_layers(types, edges), edges)
+    total = len(layer_of)
+    widths = [w for w, h in sizes] + [0] * (total - count)
+    heights = [h for w, h in sizes] + [0] * (total - count)
+    up = [[] for _ in range(total)]
+    down = [[] for _ in range(total)]
+    for a, b in proper:
+        down[a].append(b)
+        up[b].append(a)
+
+    # Initial order: current left to right, dummies after their parent
+    layers = [[] for _ in range(max(layer_of) + 1)]
+    if positions is not None:
+        initial = [x for x, y in positions] + [0.0] * (total - count)
+        for node in range(count, total):
+            initial[node] = initial[up[node][0]]
+        order = sorted(range(total), key=lambda node: initial[node])
+    else:
+        order = range(total)
+    for node in order:
+        layers[layer_of[node]].append(node)
+
+    layers = order_layers(layers, up, down, sweeps)
+    centers = assign_coordinates(layers, up, down, widths, heights, layer_spacing, node_spacing)[:count]
+
+    # Keep the top-left corner of the original layout
+    left = min(x - w / 2 for (x, y), (w, h) in zip(centers, sizes))
+    top = min(y - h / 2 for (x, y), (w, h) in zip(centers, sizes))
+    if positions is not None:
+        origin_x = min(x - w / 2 for (x, y), (w, h) in zip(positions, sizes))
+        origin_y = min(y - h / 2 for (x, y), (w, h) in zip(positions, sizes))
+    else:
+        origin_x = origin_y = 0.0
+    return [(x - left + origin_x, y - top + origin_y) for x, y in centers]
+
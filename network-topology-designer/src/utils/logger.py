@@ -1,37 +1,185 @@
+"""
+Application logging.
+
+Each subsystem logs through its own child of the "nisto" logger:
+
+    from utils.logger import get_logger
+    log = get_logger('devices')
+
+    log.debug("Created %s at (%s, %s)", device_type, x, y)
+
+Messages use %-style arguments so they are only formatted when a handler
+actually emits them. Code on the mouse-move and bulk-load paths should also
+guard with isEnabledFor() when building the arguments costs something:
+
+    if log.isEnabledFor(DEBUG):
+        log.debug("Mouse press in mode %s at %.1f, %.1f", mode, pos.x(), pos.y())
+
+Importing this module configures nothing and creates no files. Call
+configure_logging() once at startup to attach the console handler, the
+in-memory ring buffer and (optionally) a log file. Per-subsystem levels can
+also be set with the NISTO_LOG environment variable, e.g.
+NISTO_LOG="mouse=DEBUG,devices=INFO".
+"""
+import collections
 import logging
-import sys
 import os
+import sys
 from datetime import datetime
 
-def setup_logger():
-    """Set up and return a logger for the application."""
-    # Create logs directory if it doesn't exist
-    logs_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'logs')
-    os.makedirs(logs_dir, exist_ok=True)
-    
-    # Create a logger
-    logger = logging.getLogger('nisto')
-    logger.setLevel(logging.DEBUG)
-    
-    # Create a file handler
-    log_file = os.path.join(logs_dir, f'nisto_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log')
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setLevel(logging.DEBUG)
-    
-    # Create a console handler
+ROOT_LOGGER = 'nisto'
+
+# Levels re-exported for isEnabledFor() guards
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+WARNING = logging.WARNING
+ERROR = logging.ERROR
+
+# Subsystems used across the application
+SUBSYSTEMS = ('app', 'devices', 'connections', 'mouse', 'resources', 'files', 'boundaries')
+
+DEFAULT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Name of the ring buffer handler on the root logger, used to find it again
+RING_BUFFER_NAME = 'nisto.ring_buffer'
+
+# Keep library imports quiet until the application configures logging
+logging.getLogger(ROOT_LOGGER).addHandler(logging.NullHandler())
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the most recent log records in memory.
+
+    Records are stored unformatted, so emitting costs a deque append; the
+    message is only formatted when lines() is called.
+    """
+
+    def __init__(self, capacity=5000):
+        super().__init__()
+        self.records = collections.deque(maxlen=capacity)
+        self.setFormatter(logging.Formatter(DEFAULT_FORMAT))
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def lines(self, limit=None):
+        """Return the buffered records formatted as strings, oldest first."""
+        records = list(self.records)
+        if limit is not None:
+            records = records[-limit:]
+        return [self.format(record) for record in records]
+
+    def clear(self):
+        """Drop all buffered records."""
+        self.records.clear()
+
+
+def get_logger(subsystem=None):
+    """Return the logger of a subsystem (or the application root logger)."""
+    if not subsystem:
+        return logging.getLogger(ROOT_LOGGER)
+    return logging.getLogger(f"{ROOT_LOGGER}.{subsystem}")
+
+
+def set_level(subsystem, level):
+    """Set the level of one subsystem (None or '' for the whole application).
+
+    Args:
+        subsystem (str): Subsystem name, e.g. 'mouse'
+        level (int or str): Logging level, e.g. logging.DEBUG or 'DEBUG'
+    """
+    if isinstance(level, str):
+        name = level
+        level = logging.getLevelName(name.upper())
+        if not isinstance(level, int):
+            raise ValueError(f"Unknown log level: {name}")
+    get_logger(subsystem).setLevel(level)
+
+
+def parse_levels(spec):
+    """Parse "subsystem=LEVEL,..." into a dict; a bare LEVEL applies to the application."""
+    levels = {}
+    for part in (spec or '').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '=' in part:
+            subsystem, level = part.split('=', 1)
+            levels[subsystem.strip()] = level.strip()
+        else:
+            levels[''] = part
+    return levels
+
+
+def get_ring_buffer():
+    """Return the in-memory handler installed by configure_logging(), or None."""
+    for handler in logging.getLogger(ROOT_LOGGER).handlers:
+        if handler.get_name() == RING_BUFFER_NAME:
+            return handler
+    return None
+
+
+def configure_logging(level=logging.INFO, console_level=None, log_file=None,
+                      levels=None, ring_buffer_size=5000):
+    """Configure application logging; safe to call more than once.
+
+    Args:
+        level: Default level for all subsystems
+        console_level: Level of the console handler (defaults to no filtering)
+        log_file (str or bool, optional): Path of a log file, or True for a
+            timestamped file in the project's logs directory
+        levels (dict, optional): Per-subsystem levels; NISTO_LOG overrides them
+        ring_buffer_size (int): Number of records kept in memory (0 disables it)
+
+    Returns:
+        logging.Logger: The application root logger
+    """
+    root = get_logger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        if not isinstance(handler, (logging.NullHandler, RingBufferHandler)):
+            handler.close()
+    set_level(None, level)
+
+    # Application records are handled here, not by the Python root logger
+    root.propagate = False
+
+    formatter = logging.Formatter(DEFAULT_FORMAT)
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.INFO)
-    
-    # Create a formatter and add it to the handlers
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    file_handler.setFormatter(formatter)
+    # Subsystem loggers decide what is emitted unless a console level is given
+    console_handler.setLevel(console_level if console_level is not None else logging.NOTSET)
     console_handler.setFormatter(formatter)
-    
-    # Add the handlers to the logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-    
-    return logger
-
-# Global logger instance
-logger = setup_logger()
\ No newline at end of file
+    root.addHandler(console_handler)
+
+    if ring_buffer_size:
+        ring_buffer = RingBufferHandler(ring_buffer_size)
+        ring_buffer.set_name(RING_BUFFER_NAME)
+        root.addHandler(ring_buffer)
+
+    if log_file:
+        if log_file is True:
+            logs_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'logs')
+            os.makedirs(logs_dir, exist_ok=True)
+            log_file = os.path.join(logs_dir, f'nisto_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log')
+        file_handler = logging.FileHandler(log_file)
+        file_handler.setFormatter(formatter)
+        root.addHandler(file_handler)
+
+    subsystem_levels = dict(levels or {})
+    subsystem_levels.update(parse_levels(os.environ.get('NISTO_LOG')))
+    for subsystem, subsystem_level in subsystem_levels.items():
+        try:
+            set_level(subsystem, subsystem_level)
+        except ValueError as e:
+            root.warning("Ignoring log level for %r: %s", subsystem, e)
+
+    return root
+
+
+def setup_logger():
+    """Configure logging with a timestamped log file and return the application logger."""
+    return configure_logging(level=logging.DEBUG, console_level=logging.INFO, log_file=True)
+
+
+# Application logger; has no output until configure_logging() is called
+logger = get_logger()
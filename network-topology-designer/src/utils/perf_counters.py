@@ -0,0 +1,122 @@
+"""
+Lightweight counters and timers for hot-path profiling.
+
+Modules publish into the shared `perf` registry:
+
+    from utils.perf_counters import perf
+
+    @perf.timed('connection.update_path')
+    def update_path(self):
+        ...
+
+    perf.increment('scene.items_painted', count)
+
+Recording is off by default. While disabled, a timed function costs one
+extra call and an attribute check, and increment()/add_time() return
+immediately, so instrumentation can stay in place on the mouse-move and
+paint paths. The profiling overlay enables the registry and reads a
+snapshot once per second.
+"""
+import functools
+import time
+
+
+class _Stat:
+    """Number of samples and accumulated/maximum time within one window."""
+
+    __slots__ = ('count', 'total', 'maximum')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+
+class PerfRegistry:
+    """Registry of named counters, timers and gauges."""
+
+    def __init__(self):
+        self.enabled = False
+        self._stats = {}
+        self._gauges = {}
+        self._window_start = time.perf_counter()
+
+    def set_enabled(self, enabled):
+        """Start or stop recording; starting begins a fresh window."""
+        self.enabled = bool(enabled)
+        self.reset()
+
+    def reset(self):
+        """Drop all recorded values."""
+        self._stats.clear()
+        self._gauges.clear()
+        self._window_start = time.perf_counter()
+
+    def increment(self, name, amount=1):
+        """Add to a counter."""
+        if not self.enabled:
+            return
+        stat = self._stats.get(name)
+        if stat is None:
+            stat = self._stats[name] = _Stat()
+        stat.count += amount
+
+    def add_time(self, name, seconds):
+        """Record one timed sample."""
+        if not self.enabled:
+            return
+        stat = self._stats.get(name)
+        if stat is None:
+            stat = self._stats[name] = _Stat()
+        stat.count += 1
+        stat.total += seconds
+        if seconds > stat.maximum:
+            stat.maximum = seconds
+
+    def set_gauge(self, name, value):
+        """Record the latest value of something that is not a rate (e.g. a size)."""
+        if self.enabled:
+            self._gauges[name] = value
+
+    def timed(self, name):
+        """Decorator that records the call count and duration of a function."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.add_time(name, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def snapshot(self, reset=True):
+        """Return the values recorded since the last snapshot.
+
+        Returns:
+            dict: Maps counter/timer names to dicts with 'count', 'per_second',
+                'total_ms', 'avg_ms' and 'max_ms', and gauge names to their value
+        """
+        elapsed = max(time.perf_counter() - self._window_start, 1e-9)
+        result = {}
+        for name, stat in self._stats.items():
+            result[name] = {
+                'count': stat.count,
+                'per_second': stat.count / elapsed,
+                'total_ms': stat.total * 1000,
+                'avg_ms': stat.total * 1000 / stat.count if stat.count else 0.0,
+                'max_ms': stat.maximum * 1000,
+            }
+        result.update(self._gauges)
+
+        if reset:
+            self._stats.clear()
+            self._window_start = time.perf_counter()
+        return result
+
+
+# Shared registry used by the application
+perf = PerfRegistry()
@@ -1,11 +1,17 @@
-import os
-import logging
-from PyQt5.QtGui import QPixmap, QPainter, QColor, QBrush, QPen
+from PyQt5.QtGui import QPixmap, QPainter, QColor, QBrush
 from PyQt5.QtCore import Qt, QRect
 
+from utils.logger import get_logger
+from utils.resource_manifest import get_manifest
+
+log = get_logger('resources')
+
 class ResourceManager:
     """Manages application resources like icons and images."""
     
+    # Loaded (or generated) device icons by (device type, size)
+    _icon_cache = {}
+    
     @staticmethod
     def get_resource_path(resource_type, filename):
         """
@@ -18,57 +24,41 @@ class ResourceManager:
         Returns:
             str: Full path to the resource if found, None otherwise
         """
-        # Calculate base paths
-        current_file = os.path.abspath(__file__)
-        utils_dir = os.path.dirname(current_file)
-        src_dir = os.path.dirname(utils_dir)
-        project_root = os.path.dirname(src_dir)
-        
-        # Define possible locations in priority order
-        possible_paths = [
-            os.path.join(src_dir, "resources", resource_type, filename),
-            os.path.join(project_root, "resources", resource_type, filename),
-            os.path.join("resources", resource_type, filename)
-        ]
+        path = get_manifest().get(f"{resource_type}/{filename}")
+        if path:
+            return path
         
-        # Try each path
-        for path in possible_paths:
-            if os.path.exists(path):
-                logging.debug(f"Resource found: {path}")
-                return path
-                
-        logging.warning(f"Resource not found: {resource_type}/{filename}")
+        log.warning("Resource not found: %s/%s", resource_type, filename)
         return None
     
     @staticmethod
     def load_device_icon(device_type, size=40):
-        """Load an icon for a given device type."""
+        """Load an icon for a given device type.
+        
+        Icons are resolved through the resource manifest and cached, so only
+        the first device of each type touches the disk.
+        """
+        key = (device_type, size)
+        pixmap = ResourceManager._icon_cache.get(key)
+        if pixmap is not None:
+            return pixmap
+        
         try:
-            # Calculate paths
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            src_dir = os.path.dirname(current_dir)
-            project_dir = os.path.dirname(src_dir)
-            
-            # Possible icon paths
-            icon_filename = f"{device_type.lower()}.png"
-            possible_paths = [
-                os.path.join(src_dir, "resources", "device_icons", icon_filename),
-                os.path.join(project_dir, "resources", "device_icons", icon_filename),
-                os.path.join("resources", "device_icons", icon_filename)
-            ]
+            path = get_manifest().get(f"device_icons/{device_type.lower()}.png")
+            if path:
+                log.debug("Loading device icon from: %s", path)
+                pixmap = QPixmap(path).scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
             
-            # Try to load from each path
-            for path in possible_paths:
-                if os.path.exists(path):
-                    print(f"Loading device icon from: {path}")
-                    return QPixmap(path).scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            
-            # Create fallback icon if no file found
-            return ResourceManager.create_fallback_icon(device_type, size)
+            if pixmap is None or pixmap.isNull():
+                # Create fallback icon if no file found
+                pixmap = ResourceManager.create_fallback_icon(device_type, size)
             
         except Exception as e:
-            print(f"Error loading device icon: {e}")
-            return ResourceManager.create_fallback_icon(device_type, size)
+            log.error("Error loading device icon: %s", e)
+            pixmap = ResourceManager.create_fallback_icon(device_type, size)
+        
+        ResourceManager._icon_cache[key] = pixmap
+        return pixmap
     
     @staticmethod
     def create_fallback_icon(device_type, size=40):
@@ -0,0 +1,181 @@
+"""
+Resource manifest: logical resource names mapped to their location.
+
+Resources used to be found by probing several candidate paths with
+os.path.exists on every lookup. The manifest walks the resource roots once
+(or, in a packaged build, reads the manifest written at packaging time) and
+afterwards resolves names like "device_icons/router.png" or
+"port_layouts.json" with a dict lookup.
+
+Names are relative to a resource root and use forward slashes. Roots are
+searched in priority order; the first root providing a name wins. Files from
+a compiled Qt resource bundle can be added with add_qt_resources(), which
+maps names to ":/..." paths that QPixmap/QFile understand.
+
+Write the packaged manifest with:
+    python -m utils.resource_manifest [output path]
+"""
+import json
+import os
+import sys
+
+from utils.logger import get_logger
+
+log = get_logger('resources')
+
+# Resource roots relative to the application base path, highest priority first
+RESOURCE_ROOTS = (
+    "resources",
+    os.path.join("src", "resources"),
+    os.path.join("src", "icons"),
+)
+
+# Manifest written at packaging time, relative to the application base path
+MANIFEST_FILENAME = "resource_manifest.json"
+
+
+def _normalize(name):
+    """Return the canonical form of a logical resource name."""
+    name = name.replace("\\", "/")
+    while name.startswith("./"):
+        name = name[2:]
+    return name.strip("/")
+
+
+class ResourceManifest:
+    """Maps logical resource names to absolute paths."""
+
+    def __init__(self, entries=None):
+        """Initialize the manifest.
+
+        Args:
+            entries (dict, optional): Logical name -> path
+        """
+        self._entries = {}
+        self._directories = {}
+        for name, path in (entries or {}).items():
+            self.add_file(name, path)
+
+    def __contains__(self, name):
+        return _normalize(name) in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, name, default=None):
+        """Return the path of a resource, or `default` if it is not in the manifest."""
+        return self._entries.get(_normalize(name), default)
+
+    def list_dir(self, directory):
+        """Return the names of the resources directly inside a logical directory."""
+        return sorted(self._directories.get(_normalize(directory), ()))
+
+    def add_file(self, name, path, replace=False):
+        """Add one resource; existing names are kept unless `replace` is set."""
+        name = _normalize(name)
+        if name in self._entries and not replace:
+            return
+        self._entries[name] = path
+        directory = name.rpartition("/")[0]
+        self._directories.setdefault(directory, set()).add(name)
+
+    def add_root(self, root):
+        """Add every file below a directory; names already present keep their path."""
+        if not os.path.isdir(root):
+            return
+        for dirpath, dirnames, filenames in os.walk(root):
+            # Skip caches and hidden directories
+            dirnames[:] = [d for d in dirnames if not d.startswith(('.', '__'))]
+            relative_dir = os.path.relpath(dirpath, root)
+            for filename in filenames:
+                name = filename if relative_dir == "." else os.path.join(relative_dir, filename)
+                self.add_file(name, os.path.join(dirpath, filename))
+
+    def add_qt_resources(self, prefix=":/"):
+        """Add the files of the registered Qt resource bundle (e.g. from resources_rc)."""
+        from PyQt5.QtCore import QDirIterator
+
+        iterator = QDirIterator(prefix, QDirIterator.Subdirectories)
+        while iterator.hasNext():
+            path = iterator.next()
+            if iterator.fileInfo().isFile():
+                self.add_file(path[len(prefix):], path)
+
+    def to_dict(self, base_path=None):
+        """Return the entries, with paths relative to `base_path` when given."""
+        if not base_path:
+            return dict(self._entries)
+        return {name: path if path.startswith(":") else os.path.relpath(path, base_path)
+                for name, path in self._entries.items()}
+
+    @classmethod
+    def scan(cls, base_path, roots=RESOURCE_ROOTS):
+        """Build a manifest by walking the resource roots below `base_path`."""
+        manifest = cls()
+        for root in roots:
+            manifest.add_root(os.path.join(base_path, root))
+        return manifest
+
+    @classmethod
+    def load(cls, path, base_path):
+        """Load a manifest written by save(); relative paths are resolved against `base_path`."""
+        with open(path, 'r') as f:
+            entries = json.load(f).get('resources', {})
+        return cls({name: path if path.startswith(":") else os.path.join(base_path, path)
+                    for name, path in entries.items()})
+
+    def save(self, path, base_path):
+        """Write the manifest with paths relative to `base_path`."""
+        with open(path, 'w') as f:
+            json.dump({'resources': self.to_dict(base_path)}, f, indent=2, sort_keys=True)
+
+
+_manifest = None
+
+
+def get_manifest():
+    """Return the application's resource manifest, building it on first use.
+
+    Packaged (frozen) builds read the manifest written at packaging time;
+    source checkouts scan the resource roots so new files are picked up on
+    the next start.
+    """
+    global _manifest
+    if _manifest is None:
+        from utils.resource_path import get_base_path
+
+        base_path = get_base_path()
+        manifest_path = os.path.join(base_path, MANIFEST_FILENAME)
+        manifest = None
+        if getattr(sys, 'frozen', False) and os.path.exists(manifest_path):
+            try:
+                manifest = ResourceManifest.load(manifest_path, base_path)
+            except (OSError, ValueError) as e:
+                log.error("Error reading resource manifest %s: %s", manifest_path, e)
+        if manifest is None:
+            manifest = ResourceManifest.scan(base_path)
+        _manifest = manifest
+    return _manifest
+
+
+def reset_manifest():
+    """Drop the cached manifest so it is rebuilt on next use."""
+    global _manifest
+    _manifest = None
+
+
+def main(argv=None):
+    """Write the manifest for packaging."""
+    from utils.resource_path import get_base_path
+
+    argv = sys.argv[1:] if argv is None else argv
+    base_path = get_base_path()
+    output = argv[0] if argv else os.path.join(base_path, MANIFEST_FILENAME)
+    manifest = ResourceManifest.scan(base_path)
+    manifest.save(output, base_path)
+    print(f"Wrote {len(manifest)} resources to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
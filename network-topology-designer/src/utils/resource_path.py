@@ -24,24 +24,14 @@ def get_resource_path(relative_path):
     Returns:
         str: Absolute path to the resource
     """
-    base_path = get_base_path()
-    
-    # Check if resources are in the main resources dir
-    resources_path = os.path.join(base_path, "resources")
-    full_path = os.path.join(resources_path, relative_path)
-    
-    if os.path.exists(full_path):
-        return full_path
-    
-    # Check if resources are in src/resources
-    src_resources_path = os.path.join(base_path, "src", "resources")
-    src_full_path = os.path.join(src_resources_path, relative_path)
+    from utils.resource_manifest import get_manifest
     
-    if os.path.exists(src_full_path):
-        return src_full_path
+    path = get_manifest().get(relative_path)
+    if path:
+        return path
     
-    # Return the original path as fallback
-    return full_path
+    # Return the path in the main resources dir as fallback
+    return os.path.join(get_base_path(), "resources", relative_path)
 
 def check_resources_exist():
     """
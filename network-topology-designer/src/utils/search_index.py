@@ -0,0 +1,434 @@
+"""
+Incremental search index for locating devices by name, ID, address or property.
+
+The index combines a compressed prefix trie (for "starts with" lookups on every
+indexed term) with a trigram index (for typo-tolerant matches on device names).
+It does not depend on Qt so it can be maintained by the DeviceManager and
+queried from anywhere, including headless tools.
+"""
+import re
+from functools import lru_cache
+
+_TOKEN_SPLIT = re.compile(r"[^0-9a-z]+")
+
+# Separator of the terms stored per entry; "\0word" in them means some term
+# starts with word
+_TERM_SEP = "\0"
+
+
+def _add_posting(postings, key):
+    """Add a key to a posting slot, which holds None, a single key or a set."""
+    if postings is None:
+        return key
+    if isinstance(postings, set):
+        postings.add(key)
+        return postings
+    if postings == key:
+        return postings
+    return {postings, key}
+
+
+def _remove_posting(postings, key):
+    """Remove a key from a posting slot, collapsing it back when possible."""
+    if postings is None:
+        return None
+    if isinstance(postings, set):
+        postings.discard(key)
+        if len(postings) == 1:
+            return next(iter(postings))
+        return postings or None
+    return None if postings == key else postings
+
+
+def _iter_postings(postings):
+    """Iterate over the keys held by a posting slot."""
+    if postings is None:
+        return ()
+    if isinstance(postings, set):
+        return postings
+    return (postings,)
+
+
+def _posting_count(postings):
+    """Return the number of keys held by a posting slot."""
+    if postings is None:
+        return 0
+    if isinstance(postings, set):
+        return len(postings)
+    return 1
+
+
+class _TrieNode:
+    """Node of a compressed (radix) trie; edges are labelled with substrings."""
+
+    __slots__ = ('label', 'children', 'postings')
+
+    def __init__(self, label=""):
+        self.label = label
+        self.children = None
+        self.postings = None
+
+
+class PrefixTrie:
+    """Compressed prefix trie mapping terms to the keys that contain them.
+
+    The node of every stored term is also kept in a dict, so adding a key to
+    a term that is already present (a type default such as "active" is
+    shared by thousands of devices) and exact lookups skip the trie walk.
+    Splitting an edge keeps the lower node, so those references stay valid.
+    """
+
+    def __init__(self):
+        self._root = _TrieNode()
+        self._terms = {}  # term -> node holding its postings
+
+    def insert(self, term, key):
+        """Associate a key with a term."""
+        node = self._terms.get(term)
+        if node is not None:
+            node.postings = _add_posting(node.postings, key)
+            return
+
+        node = self._root
+        rest = term
+        while rest:
+            child = node.children.get(rest[0]) if node.children else None
+            if child is None:
+                leaf = _TrieNode(rest)
+                leaf.postings = key
+                if node.children is None:
+                    node.children = {}
+                node.children[rest[0]] = leaf
+                self._terms[term] = leaf
+                return
+
+            label = child.label
+            if rest.startswith(label):
+                node = child
+                rest = rest[len(label):]
+                continue
+
+            common = 1
+            limit = min(len(label), len(rest))
+            while common < limit and label[common] == rest[common]:
+                common += 1
+
+            if common < len(label):
+                # Split the edge so the shared prefix gets its own node
+                middle = _TrieNode(label[:common])
+                child.label = label[common:]
+                middle.children = {child.label[0]: child}
+                node.children[rest[0]] = middle
+                child = middle
+
+            node = child
+            rest = rest[common:]
+
+        node.postings = _add_posting(node.postings, key)
+        self._terms[term] = node
+
+    def remove(self, term, key):
+        """Remove the association between a key and a term."""
+        if term not in self._terms:
+            return
+        path = []
+        node = self._root
+        rest = term
+        while rest:
+            child = node.children.get(rest[0]) if node.children else None
+            if child is None or not rest.startswith(child.label):
+                return
+            path.append((node, rest[0]))
+            node = child
+            rest = rest[len(child.label):]
+
+        node.postings = _remove_posting(node.postings, key)
+        if node.postings is None:
+            del self._terms[term]
+
+        # Prune branches that no longer lead to any key
+        while path and node.postings is None and not node.children:
+            parent, first_char = path.pop()
+            del parent.children[first_char]
+            if not parent.children:
+                parent.children = None
+            node = parent
+
+    def _find(self, prefix):
+        """Return (node, exact) for the node covering a prefix, or (None, False)."""
+        node = self._root
+        rest = prefix
+        while rest:
+            child = node.children.get(rest[0]) if node.children else None
+            if child is None:
+                return None, False
+            label = child.label
+            if rest.startswith(label):
+                node = child
+                rest = rest[len(label):]
+            elif label.startswith(rest):
+                # The prefix ends part-way along this edge
+                return child, False
+            else:
+                return None, False
+        return node, True
+
+    def exact(self, term):
+        """Return the keys associated with exactly this term."""
+        node = self._terms.get(term)
+        if node is None:
+            return ()
+        return _iter_postings(node.postings)
+
+    def prefix(self, prefix, limit=None):
+        """Yield keys of terms starting with the prefix (with repeats removed)."""
+        node, _ = self._find(prefix)
+        if node is None:
+            return
+        seen = set()
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            for key in _iter_postings(current.postings):
+                if key not in seen:
+                    seen.add(key)
+                    yield key
+                    if limit is not None and len(seen) >= limit:
+                        return
+            if current.children:
+                stack.extend(current.children.values())
+
+
+@lru_cache(maxsize=4096)
+def _terms_of(text):
+    """Return the terms of normalized text: the whole value and its tokens.
+
+    Cached, as most field values (type defaults such as "active" or "ospf")
+    repeat across devices.
+    """
+    if not text:
+        return frozenset()
+    terms = {text}
+    terms.update(token for token in _TOKEN_SPLIT.split(text) if token)
+    return frozenset(terms)
+
+
+@lru_cache(maxsize=4096)
+def _trigrams_of(text):
+    padded = f"  {text} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class DeviceSearchIndex:
+    """Search index over device names, IDs, addresses and other properties.
+
+    Every field value is indexed as a whole and split into alphanumeric tokens,
+    so "core-sw-01" is found by "core-sw", "sw" or "01". Names are additionally
+    broken into trigrams, which lets queries with a typo ("routr") still match.
+    """
+
+    # Fields whose values feed the trigram index for fuzzy matching
+    FUZZY_FIELDS = ('name', 'description')
+
+    # Property keys that never make sense to search on
+    SKIPPED_PROPERTIES = ('icon',)
+
+    def __init__(self, max_candidates=2000):
+        """Initialize an empty index.
+
+        Args:
+            max_candidates (int): Upper bound on the number of fuzzy candidates
+                scored per query, which keeps queries fast on huge topologies.
+        """
+        self.max_candidates = max_candidates
+        self._trie = PrefixTrie()
+        self._trigrams = {}
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @staticmethod
+    def _normalize(value):
+        return str(value).strip().lower().replace(_TERM_SEP, "")
+
+    @classmethod
+    def _terms_for(cls, value):
+        """Return the set of terms indexed for a single field value."""
+        return _terms_of(cls._normalize(value))
+
+    @staticmethod
+    def _trigrams_for(text):
+        """Return the set of trigrams of a term, padded to weight word starts."""
+        return _trigrams_of(text)
+
+    @classmethod
+    def fields_for_device(cls, device):
+        """Collect the searchable field values of a device."""
+        fields = {
+            'name': getattr(device, 'name', ''),
+            'id': getattr(device, 'id', ''),
+        }
+        properties = getattr(device, 'properties', None) or {}
+        for key, value in properties.items():
+            if key in cls.SKIPPED_PROPERTIES or key in fields:
+                continue
+            if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+                fields[key] = value
+        return fields
+
+    def add(self, key, fields):
+        """Index a key under the given field values, replacing any old entry."""
+        if key in self._entries:
+            self.remove(key)
+
+        terms = set()
+        trigrams = set()
+        for field, value in fields.items():
+            field_terms = self._terms_for(value)
+            terms.update(field_terms)
+            if field in self.FUZZY_FIELDS:
+                for term in field_terms:
+                    trigrams.update(self._trigrams_for(term))
+
+        for term in terms:
+            self._trie.insert(term, key)
+        for trigram in trigrams:
+            self._trigrams[trigram] = _add_posting(self._trigrams.get(trigram), key)
+
+        self._entries[key] = (_TERM_SEP + _TERM_SEP.join(terms), tuple(trigrams))
+
+    def update(self, key, fields):
+        """Re-index a key after its field values changed."""
+        self.add(key, fields)
+
+    def remove(self, key):
+        """Remove a key from the index."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+
+        terms, trigrams = entry
+        for term in terms.split(_TERM_SEP)[1:]:
+            self._trie.remove(term, key)
+        for trigram in trigrams:
+            postings = _remove_posting(self._trigrams.get(trigram), key)
+            if postings is None:
+                self._trigrams.pop(trigram, None)
+            else:
+                self._trigrams[trigram] = postings
+        return True
+
+    def clear(self):
+        """Remove every entry from the index."""
+        self._trie = PrefixTrie()
+        self._trigrams = {}
+        self._entries = {}
+
+    def search(self, query, limit=20):
+        """Search the index.
+
+        Results are ranked exact term matches first, then prefix matches and
+        finally fuzzy (trigram) matches on names.
+
+        Args:
+            query (str): Text typed by the user
+            limit (int): Maximum number of keys to return
+
+        Returns:
+            list: Matching keys in rank order
+        """
+        text = self._normalize(query)
+        if not text or limit <= 0:
+            return []
+
+        results = []
+        seen = set()
+
+        def collect(keys):
+            for key in keys:
+                if key not in seen:
+                    seen.add(key)
+                    results.append(key)
+                    if len(results) >= limit:
+                        return True
+            return False
+
+        if collect(self._trie.exact(text)):
+            return results
+        if collect(self._trie.prefix(text, limit=limit + len(results))):
+            return results
+
+        words = [word for word in _TOKEN_SPLIT.split(text) if word]
+        if len(words) > 1 and collect(self._search_words(words)):
+            return results
+
+        collect(self._search_fuzzy(text))
+        return results
+
+    def _search_words(self, words):
+        """Match multi-word queries where every word prefixes some term."""
+        # The prefix scans of all words advance in step and every key is
+        # checked against the other words as it comes, so the most selective
+        # word finds the matches early; once any scan runs out, all matches
+        # have been seen
+        scans = [
+            (self._trie.prefix(word), [_TERM_SEP + other for other in words[:i] + words[i + 1:]])
+            for i, word in enumerate(words)
+        ]
+        for _ in range(self.max_candidates):
+            for scan, others in scans:
+                key = next(scan, None)
+                if key is None:
+                    return
+                terms = self._entries[key][0]
+                if all(other in terms for other in others):
+                    yield key
+
+    def _search_fuzzy(self, text):
+        """Yield keys whose names share enough trigrams with the query."""
+        query_trigrams = self._trigrams_for(text)
+        if not query_trigrams:
+            return
+
+        postings = sorted(
+            (self._trigrams.get(trigram) for trigram in query_trigrams),
+            key=_posting_count,
+        )
+
+        # Allow roughly one typo: a single edit destroys at most three trigrams
+        required = max(1, len(query_trigrams) - 3)
+
+        # Any key sharing `required` trigrams must appear in one of the
+        # (n - required + 1) smallest posting lists, so only those are scanned
+        seed_lists = postings[:len(postings) - required + 1]
+        check_lists = postings[len(seed_lists):]
+
+        scores = {}
+        budget = self.max_candidates
+        for slot in seed_lists:
+            for key in _iter_postings(slot):
+                scores[key] = scores.get(key, 0) + 1
+                budget -= 1
+                if budget <= 0:
+                    break
+            if budget <= 0:
+                break
+
+        ranked = []
+        for key, score in scores.items():
+            for slot in check_lists:
+                if isinstance(slot, set):
+                    if key in slot:
+                        score += 1
+                elif slot == key:
+                    score += 1
+            if score >= required:
+                ranked.append((-score, key))
+
+        ranked.sort()
+        for _, key in ranked:
+            yield key
@@ -0,0 +1,91 @@
+"""
+Spatial hash of points.
+
+Points are bucketed by the grid cell they fall in, so moving a point or
+asking for the points near a position only touches a handful of cells
+instead of scanning every point. DeviceManager keeps one of these with the
+center of every device; the snap controller uses it to find alignment
+candidates while a device is dragged.
+
+This module has no Qt dependency.
+"""
+import math
+
+
+class SpatialHash:
+    """Maps keys to points and finds the keys near a position."""
+
+    def __init__(self, cell_size=200):
+        """Initialize an empty hash.
+
+        Args:
+            cell_size (float): Cell size in scene units; about the typical
+                query radius works well
+        """
+        self.cell_size = float(cell_size)
+        self._cells = {}
+        self._points = {}
+
+    def __len__(self):
+        return len(self._points)
+
+    def __contains__(self, key):
+        return key in self._points
+
+    def _cell(self, x, y):
+        size = self.cell_size
+        return math.floor(x / size), math.floor(y / size)
+
+    def get(self, key):
+        """Return the (x, y) point of a key, or None."""
+        point = self._points.get(key)
+        return point[:2] if point else None
+
+    def insert(self, key, x, y):
+        """Insert or move a key."""
+        cell = self._cell(x, y)
+        old = self._points.get(key)
+        if old is not None:
+            if old[2] == cell:
+                self._points[key] = (x, y, cell)
+                return
+            self._discard(key, old[2])
+        self._points[key] = (x, y, cell)
+        self._cells.setdefault(cell, set()).add(key)
+
+    def remove(self, key):
+        """Remove a key; unknown keys are ignored."""
+        old = self._points.pop(key, None)
+        if old is not None:
+            self._discard(key, old[2])
+
+    def clear(self):
+        """Remove all keys."""
+        self._cells.clear()
+        self._points.clear()
+
+    def _discard(self, key, cell):
+        bucket = self._cells.get(cell)
+        if bucket is not None:
+            bucket.discard(key)
+            if not bucket:
+                del self._cells[cell]
+
+    def query_rect(self, x0, y0, x1, y1):
+        """Yield (key, x, y) for the points inside a rectangle."""
+        cx0, cy0 = self._cell(x0, y0)
+        cx1, cy1 = self._cell(x1, y1)
+        points = self._points
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                for key in self._cells.get((cx, cy), ()):
+                    x, y, _ = points[key]
+                    if x0 <= x <= x1 and y0 <= y <= y1:
+                        yield key, x, y
+
+    def query_radius(self, x, y, radius):
+        """Yield (key, x, y) for the points within `radius` of a position."""
+        radius_sq = radius * radius
+        for key, px, py in self.query_rect(x - radius, y - radius, x + radius, y + radius):
+            if (px - x) ** 2 + (py - y) ** 2 <= radius_sq:
+                yield key, px, py
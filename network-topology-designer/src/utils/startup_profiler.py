@@ -0,0 +1,89 @@
+"""
+Startup timeline for the --profile-startup flag.
+
+When enabled, every module import is timed (like "python -X importtime",
+but without restarting the interpreter) and main.py records milestones such
+as "QApplication created" and "window shown". report() prints the
+milestones, the slowest imports and whether time-to-first-window stayed
+within the startup budget.
+"""
+import builtins
+import sys
+import time
+
+# Target for time-to-first-window, in milliseconds
+STARTUP_BUDGET_MS = 500
+
+
+class StartupProfiler:
+    """Records import times and startup milestones."""
+
+    def __init__(self):
+        self.enabled = False
+        self.start = time.perf_counter()
+        self.marks = []
+        self.imports = []
+        self._depth = 0
+        self._original_import = None
+
+    def enable(self):
+        """Start timing imports; milestones are measured from this call."""
+        if self.enabled:
+            return
+        self.enabled = True
+        self.start = time.perf_counter()
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def disable(self):
+        """Stop timing imports."""
+        if not self.enabled:
+            return
+        builtins.__import__ = self._original_import
+        self.enabled = False
+
+    def mark(self, label):
+        """Record a milestone."""
+        if self.enabled:
+            self.marks.append((label, (time.perf_counter() - self.start) * 1000))
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # Only imports that actually load a module are worth recording
+        if level or name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            self._depth -= 1
+            elapsed = (time.perf_counter() - start) * 1000
+            self.imports.append((name, elapsed, self._depth,
+                                 (start - self.start) * 1000))
+
+    def report(self, top=15, stream=None):
+        """Print the milestone timeline and the slowest top-level imports."""
+        stream = stream or sys.stderr
+        write = stream.write
+
+        write("Startup timeline (ms since start):\n")
+        for label, at in self.marks:
+            write(f"  {at:8.1f}  {label}\n")
+
+        # Nested imports are included in their importer's time
+        top_level = [entry for entry in self.imports if entry[2] == 0]
+        total_import = sum(elapsed for _, elapsed, _, _ in top_level)
+        write(f"Imports: {len(self.imports)} modules, {total_import:.1f} ms in top-level imports\n")
+        write("Slowest imports (cumulative ms, started at):\n")
+        for name, elapsed, _, started in sorted(self.imports, key=lambda entry: -entry[1])[:top]:
+            write(f"  {elapsed:8.1f}  {name}  (at {started:.1f})\n")
+
+        shown = [at for label, at in self.marks if label == "window shown"]
+        if shown:
+            status = "within" if shown[0] <= STARTUP_BUDGET_MS else "OVER"
+            write(f"Time to first window: {shown[0]:.1f} ms ({status} the {STARTUP_BUDGET_MS} ms budget)\n")
+
+
+# Shared profiler used by main.py
+profiler = StartupProfiler()
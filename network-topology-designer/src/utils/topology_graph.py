@@ -0,0 +1,485 @@
+"""
+Graph of the topology for analytics.
+
+TopologyGraph is an undirected multigraph of devices (nodes) and
+connections (edges), updated one device or connection at a time in O(1)
+(removing a device is O(degree)). Queries run on a compressed sparse row
+(CSR) copy of the adjacency, built lazily in O(V + E) after the graph
+changed, and their results are cached until the next change:
+
+- shortest_path(): bidirectional breadth-first search
+- components() / component_of(): connected components
+- degree_stats(): minimum, maximum, mean and median degree
+- diameter(): four BFS sweeps per component (exact for trees), or with
+  exact=True iFUB (Crescenzi et al.), usually far fewer BFS runs than one
+  per node
+- articulation_points() / bridges(): single points of failure, with
+  Tarjan's linear-time DFS (iterative, so deep chains cannot overflow the
+  stack)
+
+Large breadth-first searches are vectorized with numpy when it is
+installed.
+
+Nodes and edges are identified by the caller's keys (device and
+connection IDs). Slots of removed nodes are reused, so the CSR arrays can
+contain empty rows.
+
+This module has no Qt dependency.
+"""
+from array import array
+
+# numpy is imported on first use (see _numpy()); without it the same
+# searches run as plain loops
+np = None
+_numpy_checked = False
+
+# Below this many nodes a plain breadth-first search beats numpy's call overhead
+NUMPY_MIN_NODES = 5000
+
+
+def _numpy():
+    """Return the numpy module, or None when it is not installed."""
+    global np, _numpy_checked
+    if not _numpy_checked:
+        _numpy_checked = True
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            np = None
+    return np
+
+
+class TopologyGraph:
+    """Incrementally maintained undirected multigraph with cached queries."""
+
+    def __init__(self):
+        self._index = {}      # node key -> slot
+        self._keys = []       # slot -> node key, or None if free
+        self._free = []       # free slots
+        self._adjacency = []  # slot -> {neighbour slot: number of edges}
+        self._incident = []   # slot -> set of edge keys
+        self._edges = {}      # edge key -> (slot, slot)
+
+        # Bumped on every change; cached results belong to one version
+        self.version = 0
+        self._cache = {}
+        self._cache_version = 0
+
+    # --- Updates -----------------------------------------------------------
+
+    def _changed(self):
+        self.version += 1
+
+    def clear(self):
+        """Remove all nodes and edges."""
+        self._index.clear()
+        self._keys = []
+        self._free = []
+        self._adjacency = []
+        self._incident = []
+        self._edges.clear()
+        self._changed()
+
+    def add_node(self, key):
+        """Add a node; existing nodes are left alone."""
+        if key in self._index:
+            return
+        if self._free:
+            slot = self._free.pop()
+            self._keys[slot] = key
+        else:
+            slot = len(self._keys)
+            self._keys.append(key)
+            self._adjacency.append({})
+            self._incident.append(set())
+        self._index[key] = slot
+        self._changed()
+
+    def remove_node(self, key):
+        """Remove a node and its edges; unknown keys are ignored."""
+        slot = self._index.pop(key, None)
+        if slot is None:
+            return
+        for edge_key in list(self._incident[slot]):
+            self._discard_edge(edge_key)
+        self._keys[slot] = None
+        self._free.append(slot)
+        self._changed()
+
+    def add_edge(self, key, source, target):
+        """Add an edge between two nodes, adding the nodes if needed.
+
+        Self loops are ignored; an edge key that exists is moved to the new ends.
+        """
+        if key in self._edges:
+            self._discard_edge(key)
+        if source == target:
+            return
+        self.add_node(source)
+        self.add_node(target)
+        a, b = self._index[source], self._index[target]
+        self._edges[key] = (a, b)
+        self._incident[a].add(key)
+        self._incident[b].add(key)
+        self._adjacency[a][b] = self._adjacency[a].get(b, 0) + 1
+        self._adjacency[b][a] = self._adjacency[b].get(a, 0) + 1
+        self._changed()
+
+    def remove_edge(self, key):
+        """Remove an edge; unknown keys are ignored."""
+        if key in self._edges:
+            self._discard_edge(key)
+            self._changed()
+
+    def _discard_edge(self, key):
+        a, b = self._edges.pop(key)
+        self._incident[a].discard(key)
+        self._incident[b].discard(key)
+        for here, there in ((a, b), (b, a)):
+            count = self._adjacency[here][there] - 1
+            if count:
+                self._adjacency[here][there] = count
+            else:
+                del self._adjacency[here][there]
+
+    # --- Basic queries -----------------------------------------------------
+
+    def __contains__(self, key):
+        return key in self._index
+
+    @property
+    def node_count(self):
+        return len(self._index)
+
+    @property
+    def edge_count(self):
+        return len(self._edges)
+
+    def nodes(self):
+        """Return the node keys."""
+        return list(self._index)
+
+    def edge_ends(self, key):
+        """Return the (source, target) node keys of an edge, or None."""
+        ends = self._edges.get(key)
+        return (self._keys[ends[0]], self._keys[ends[1]]) if ends else None
+
+    def edge_count_between(self, source, target):
+        """Return the number of parallel edges between two nodes."""
+        a, b = self._index.get(source), self._index.get(target)
+        if a is None or b is None:
+            return 0
+        return self._adjacency[a].get(b, 0)
+
+    def neighbors(self, key):
+        """Return the keys of the nodes connected to a node."""
+        slot = self._index.get(key)
+        if slot is None:
+            return []
+        return [self._keys[other] for other in self._adjacency[slot]]
+
+    def degree(self, key):
+        """Return the number of edges at a node (parallel edges count separately)."""
+        slot = self._index.get(key)
+        return sum(self._adjacency[slot].values()) if slot is not None else 0
+
+    # --- Cached queries ----------------------------------------------------
+
+    def cached(self, name, compute):
+        """Return compute() for this version of the graph, computing it at most once."""
+        if self._cache_version != self.version:
+            self._cache = {}
+            self._cache_version = self.version
+        if name not in self._cache:
+            self._cache[name] = compute()
+        return self._cache[name]
+
+    def csr(self):
+        """Return (indptr, indices) arrays of the adjacency, one row per slot.
+
+        Parallel edges appear once; free slots have empty rows.
+        """
+        def build():
+            indptr = array('l', [0])
+            indices = array('l')
+            for neighbours in self._adjacency:
+                indices.extend(neighbours)
+                indptr.append(len(indices))
+            return indptr, indices
+        return self.cached('csr', build)
+
+    def _bfs(self, start):
+        """Return (distance per slot, -1 if unreached; slots in visiting order)."""
+        if len(self._keys) >= NUMPY_MIN_NODES and _numpy() is not None:
+            return self._bfs_numpy(start)
+        indptr, indices = self.csr()
+        distance = [-1] * (len(indptr) - 1)
+        distance[start] = 0
+        order = [start]
+        for node in order:
+            next_distance = distance[node] + 1
+            for other in indices[indptr[node]:indptr[node + 1]]:
+                if distance[other] < 0:
+                    distance[other] = next_distance
+                    order.append(other)
+        return distance, order
+
+    def _bfs_numpy(self, start):
+        """Breadth-first search one whole level at a time."""
+        def build():
+            indptr, indices = self.csr()
+            return np.frombuffer(indptr, dtype=indptr.typecode), np.frombuffer(indices, dtype=indices.typecode)
+        indptr, indices = self.cached('csr_numpy', build)
+
+        distance = np.full(len(indptr) - 1, -1, dtype=np.int64)
+        distance[start] = 0
+        frontier = np.array([start])
+        levels = [frontier]
+        level = 0
+        while True:
+            # Neighbours of the whole frontier, gathered from the CSR rows
+            starts = indptr[frontier]
+            counts = indptr[frontier + 1] - starts
+            total = int(counts.sum())
+            if not total:
+                break
+            rows = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(total)
+            neighbours = indices[rows]
+            frontier = np.unique(neighbours[distance[neighbours] < 0])
+            if not len(frontier):
+                break
+            level += 1
+            distance[frontier] = level
+            levels.append(frontier)
+        return distance, np.concatenate(levels)
+
+    def shortest_path(self, source, target):
+        """Return the node keys on a shortest path (fewest hops), or None if unreachable."""
+        a, b = self._index.get(source), self._index.get(target)
+        if a is None or b is None:
+            return None
+        if a == b:
+            return [source]
+        indptr, indices = self.csr()
+
+        # Expand the smaller frontier of two searches until they meet
+        parents = ({a: None}, {b: None})
+        frontiers = ([a], [b])
+        while frontiers[0] and frontiers[1]:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            here, there = parents[side], parents[1 - side]
+            next_frontier = []
+            for node in frontiers[side]:
+                for other in indices[indptr[node]:indptr[node + 1]]:
+                    if other in here:
+                        continue
+                    here[other] = node
+                    if other in there:
+                        return self._join_path(parents, other)
+                    next_frontier.append(other)
+            frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+        return None
+
+    def _join_path(self, parents, meeting):
+        path = []
+        node = meeting
+        while node is not None:
+            path.append(node)
+            node = parents[0][node]
+        path.reverse()
+        node = parents[1][meeting]
+        while node is not None:
+            path.append(node)
+            node = parents[1][node]
+        return [self._keys[slot] for slot in path]
+
+    def _component_labels(self):
+        """Return (component label per slot, -1 for free slots; component slot lists)."""
+        def build():
+            indptr, indices = self.csr()
+            labels = [-1] * (len(indptr) - 1)
+            components = []
+            for start, key in enumerate(self._keys):
+                if key is None or labels[start] >= 0:
+                    continue
+                label = len(components)
+                labels[start] = label
+                members = [start]
+                for node in members:
+                    for other in indices[indptr[node]:indptr[node + 1]]:
+                        if labels[other] < 0:
+                            labels[other] = label
+                            members.append(other)
+                components.append(members)
+            return labels, components
+        return self.cached('components', build)
+
+    def components(self):
+        """Return the connected components as lists of node keys, largest first."""
+        def build():
+            _, components = self._component_labels()
+            keys = self._keys
+            return sorted(([keys[slot] for slot in members] for members in components), key=len, reverse=True)
+        return self.cached('component_keys', build)
+
+    def component_of(self, key):
+        """Return the number of the component containing a node (stable until the graph changes)."""
+        slot = self._index.get(key)
+        if slot is None:
+            return None
+        return self._component_labels()[0][slot]
+
+    def degree_stats(self):
+        """Return a dict with the node count and min, max, mean and median degree."""
+        def build():
+            degrees = sorted(sum(self._adjacency[slot].values()) for slot in self._index.values())
+            count = len(degrees)
+            if not count:
+                return {'nodes': 0, 'min': 0, 'max': 0, 'mean': 0.0, 'median': 0.0}
+            middle = count // 2
+            median = degrees[middle] if count % 2 else (degrees[middle - 1] + degrees[middle]) / 2
+            return {
+                'nodes': count,
+                'min': degrees[0],
+                'max': degrees[-1],
+                'mean': 2 * len(self._edges) / count,
+                'median': median,
+            }
+        return self.cached('degree_stats', build)
+
+    def articulation_points(self):
+        """Return the nodes whose removal disconnects their component."""
+        return self._cut_elements()[0]
+
+    def bridges(self):
+        """Return the keys of the edges whose removal disconnects their component.
+
+        Parallel edges are never bridges.
+        """
+        return self._cut_elements()[1]
+
+    def _cut_elements(self):
+        """Tarjan's articulation points and bridges, with an iterative DFS in O(V + E)."""
+        def build():
+            indptr, indices = self.csr()
+            adjacency = self._adjacency
+            count = len(indptr) - 1
+            discovered = [-1] * count
+            low = [0] * count
+            parent = [-1] * count
+            is_cut = [False] * count
+            bridges = []
+            clock = 0
+
+            for root, key in enumerate(self._keys):
+                if key is None or discovered[root] >= 0:
+                    continue
+                discovered[root] = low[root] = clock
+                clock += 1
+                root_children = 0
+                # (node, next position in its CSR row)
+                stack = [(root, indptr[root])]
+                while stack:
+                    node, position = stack[-1]
+                    if position < indptr[node + 1]:
+                        stack[-1] = (node, position + 1)
+                        other = indices[position]
+                        if discovered[other] < 0:
+                            parent[other] = node
+                            discovered[other] = low[other] = clock
+                            clock += 1
+                            if node == root:
+                                root_children += 1
+                            stack.append((other, indptr[other]))
+                        elif other != parent[node] or adjacency[node][other] > 1:
+                            # Back edge; a parallel edge to the parent counts as one
+                            if discovered[other] < low[node]:
+                                low[node] = discovered[other]
+                        continue
+
+                    # Node finished: report to its parent
+                    stack.pop()
+                    if not stack:
+                        break
+                    above = stack[-1][0]
+                    if low[node] < low[above]:
+                        low[above] = low[node]
+                    if low[node] > discovered[above]:
+                        bridges.append((above, node))
+                    if above != root and low[node] >= discovered[above]:
+                        is_cut[above] = True
+                if root_children > 1:
+                    is_cut[root] = True
+
+            keys = self._keys
+            points = [keys[slot] for slot in range(count) if is_cut[slot]]
+            bridge_keys = []
+            for a, b in bridges:
+                # The one edge between the pair
+                for edge_key in self._incident[a]:
+                    if b in self._edges[edge_key]:
+                        bridge_keys.append(edge_key)
+                        break
+            return points, bridge_keys
+        return self.cached('cut_elements', build)
+
+    def diameter(self, exact=False):
+        """Return the largest shortest-path length within any connected component.
+
+        Args:
+            exact (bool): By default the result comes from four BFS sweeps per
+                component; it is a lower bound that is exact for trees and
+                almost always exact for real networks. With exact=True the
+                iFUB search proves it, which can take many more sweeps on
+                large meshed graphs.
+        """
+        def build():
+            _, components = self._component_labels()
+            return max((self._component_diameter(members, exact) for members in components if len(members) > 1),
+                       default=0)
+        return self.cached('diameter_exact' if exact else 'diameter', build)
+
+    def _component_diameter(self, members, exact):
+        """Diameter of one component (see diameter())."""
+        # Four sweeps: double sweep from the highest degree node, then again
+        # from the middle of the long path found
+        start = max(members, key=lambda slot: len(self._adjacency[slot]))
+        lower, middle = self._double_sweep(start)
+        sweep, center = self._double_sweep(middle)
+        lower = max(lower, sweep)
+
+        # Trees have no shortcuts: the double sweep is exact
+        edges = sum(len(self._adjacency[slot]) for slot in members) // 2
+        if not exact or edges == len(members) - 1:
+            return lower
+
+        # iFUB from the center: eccentricities of the farthest level raise the
+        # lower bound; paths between nodes no farther than `level` are at
+        # most 2 * level long
+        distance, order = self._bfs(center)
+        level = int(distance[order[-1]])
+        lower = max(lower, level)
+        upper = 2 * level
+        index = len(order) - 1
+        while upper > lower:
+            while index >= 0 and distance[order[index]] == level:
+                lower = max(lower, self._eccentricity(order[index]))
+                index -= 1
+            upper = 2 * (level - 1)
+            level -= 1
+        return lower
+
+    def _double_sweep(self, start):
+        """Return (length, middle slot) of a long shortest path found with two BFS runs."""
+        distance, order = self._bfs(start)
+        distance, order = self._bfs(int(order[-1]))
+        node = int(order[-1])
+        length = int(distance[node])
+        for _ in range(length // 2):
+            node = next(other for other in self._adjacency[node] if distance[other] == distance[node] - 1)
+        return length, node
+
+    def _eccentricity(self, slot):
+        distance, order = self._bfs(int(slot))
+        return int(distance[order[-1]])
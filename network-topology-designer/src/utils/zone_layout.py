@@ -0,0 +1,139 @@
+"""
+Boundary-aware layout.
+
+Devices stay in their boundary zones: the devices directly inside each
+boundary are laid out on their own (layered layout, connections to other
+zones ignored), then every boundary is resized around its devices and
+nested boundaries, and the boundaries are packed into rows inside their
+parent, bottom up. Devices outside every boundary form one more block,
+packed with the top-level boundaries.
+
+Zones are independent, so their layouts run in parallel in a process pool
+when there is enough work; the cost then follows the size of the largest
+site rather than the whole diagram.
+
+This module has no Qt dependency.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.arrange import pack_shelves
+from utils.layered_layout import layered_layout
+
+# Below this many devices in total, starting worker processes costs more than it saves
+PARALLEL_MIN_DEVICES = 2000
+
+# Space around a boundary's contents; the top leaves room for its labels
+PADDING = 30
+HEADER = 60
+
+# Smallest boundary, so the labels stay readable
+MIN_BOUNDARY_SIZE = (160, 100)
+
+# Key of a zone's own devices among its packed blocks
+_MEMBERS = object()
+
+
+def _layout_members(job):
+    """Lay out the devices of one zone; returns their centers, top-left at (0, 0)."""
+    types, edges, sizes, options = job
+    return layered_layout(types, edges, sizes=sizes, **options)
+
+
+def layout_members(jobs, parallel=None, max_workers=None):
+    """Lay out several zones, in worker processes if worthwhile.
+
+    Args:
+        jobs (list): (types, edges, sizes, layered_layout options) per zone
+        parallel (bool, optional): Force or prevent the process pool; by
+            default it is used for at least PARALLEL_MIN_DEVICES devices
+        max_workers (int, optional): Pool size; one per CPU by default
+
+    Returns:
+        list: Member centers of each zone
+    """
+    if parallel is None:
+        parallel = len(jobs) > 1 and sum(len(job[0]) for job in jobs) >= PARALLEL_MIN_DEVICES
+    if not parallel:
+        return [_layout_members(job) for job in jobs]
+
+    workers = max_workers or min(len(jobs), os.cpu_count() or 1)
+    # Spawned (not forked) so the workers do not inherit Qt's state
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        return list(executor.map(_layout_members, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+
+def _extent(centers, sizes):
+    """Return (width, height) of boxes laid out from (0, 0)."""
+    right = max(x + w / 2 for (x, y), (w, h) in zip(centers, sizes))
+    bottom = max(y + h / 2 for (x, y), (w, h) in zip(centers, sizes))
+    return right, bottom
+
+
+def zone_layout(zones, children, origin=(0, 0), spacing=60, parallel=None, **options):
+    """Lay out devices zone by zone and pack the boundaries.
+
+    Args:
+        zones (dict): Zone (boundary) ID -> (types, edges, sizes) of the
+            devices directly inside it, with edges as index pairs into that
+            zone's lists; the None zone holds devices outside every boundary
+        children (dict): Boundary ID -> IDs of the boundaries directly inside
+            it, in their preferred order; children[None] are the top-level ones
+        origin (tuple): Top-left corner of the result
+        spacing (float): Gap between packed boundaries
+        parallel (bool, optional): See layout_members()
+        **options: layered_layout() options for the zones
+
+    Returns:
+        tuple: (zone ID -> member centers, boundary ID -> (x0, y0, x1, y1))
+    """
+    zone_ids = [zone_id for zone_id, (types, _, _) in zones.items() if types]
+    jobs = [zones[zone_id] + (options,) for zone_id in zone_ids]
+    relative = dict(zip(zone_ids, layout_members(jobs, parallel)))
+
+    # Bottom up: size of every zone and where its contents go inside it
+    sizes = {}
+    content = {}
+
+    def measure(zone_id):
+        blocks = []
+        if zone_id in relative:
+            blocks.append((_MEMBERS, _extent(relative[zone_id], zones[zone_id][2])))
+        for child in children.get(zone_id, ()):
+            measure(child)
+            blocks.append((child, sizes[child]))
+
+        offsets = {}
+        width = height = 0
+        if blocks:
+            centers = pack_shelves([(w / 2, h / 2, w, h) for _, (w, h) in blocks], spacing)
+            for (key, (w, h)), (x, y) in zip(blocks, centers):
+                offsets[key] = (x - w / 2, y - h / 2)
+                width = max(width, x + w / 2)
+                height = max(height, y + h / 2)
+        content[zone_id] = offsets
+        if zone_id is not None:
+            sizes[zone_id] = (max(width + 2 * PADDING, MIN_BOUNDARY_SIZE[0]),
+                              max(height + HEADER + PADDING, MIN_BOUNDARY_SIZE[1]))
+
+    measure(None)
+
+    # Top down: absolute positions
+    centers = {}
+    rects = {}
+
+    def place(zone_id, x, y):
+        if zone_id is not None:
+            w, h = sizes[zone_id]
+            rects[zone_id] = (x, y, x + w, y + h)
+            x, y = x + PADDING, y + HEADER
+        for key, (dx, dy) in content[zone_id].items():
+            if key is _MEMBERS:
+                centers[zone_id] = [(x + dx + cx, y + dy + cy) for cx, cy in relative[zone_id]]
+            else:
+                place(key, x + dx, y + dy)
+
+    place(None, origin[0], origin[1])
+    return centers, rects
@@ -0,0 +1,102 @@
+import math
+
+from PyQt5.QtWidgets import QGraphicsItem, QGraphicsLineItem, QGraphicsSimpleTextItem
+from PyQt5.QtCore import Qt, QRectF, QPointF, QLineF
+from PyQt5.QtGui import QPen, QBrush, QColor, QFont
+
+
+class BoundaryProxyItem(QGraphicsItem):
+    """Single node standing in for a collapsed boundary and everything inside it."""
+
+    WIDTH = 140
+    HEIGHT = 56
+
+    def __init__(self, boundary, device_count, on_expand=None):
+        """Initialize the proxy for `boundary`.
+
+        Args:
+            boundary: The collapsed BoundaryItem
+            device_count (int): Number of devices hidden inside it
+            on_expand (callable, optional): Called with the boundary on double-click
+        """
+        super().__init__()
+        self.boundary = boundary
+        self.device_count = device_count
+        self.on_expand = on_expand
+        self.edges = []
+
+        self.color = QColor(boundary.color)
+        self.color.setAlpha(220)
+
+        self.setFlag(QGraphicsItem.ItemIsSelectable, True)
+        self.setFlag(QGraphicsItem.ItemIsMovable, True)
+        self.setFlag(QGraphicsItem.ItemSendsGeometryChanges, True)
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+        self.setZValue(1)
+        self.setToolTip(f"{boundary.name}: {device_count} devices (double-click to expand)")
+
+    def boundingRect(self):
+        return QRectF(-self.WIDTH / 2 - 2, -self.HEIGHT / 2 - 2, self.WIDTH + 4, self.HEIGHT + 4)
+
+    def paint(self, painter, option, widget=None):
+        rect = QRectF(-self.WIDTH / 2, -self.HEIGHT / 2, self.WIDTH, self.HEIGHT)
+        pen = QPen(Qt.blue if self.isSelected() else self.color.darker(150), 2)
+        if self.isSelected():
+            pen.setStyle(Qt.DashLine)
+        painter.setPen(pen)
+        painter.setBrush(QBrush(self.color))
+        painter.drawRoundedRect(rect, 10, 10)
+
+        painter.setPen(Qt.black)
+        font = QFont()
+        font.setBold(True)
+        painter.setFont(font)
+        painter.drawText(rect.adjusted(6, 4, -6, -rect.height() / 2), Qt.AlignCenter, self.boundary.name)
+        font.setBold(False)
+        font.setPointSize(8)
+        painter.setFont(font)
+        painter.drawText(rect.adjusted(6, rect.height() / 2, -6, -4), Qt.AlignCenter,
+                         f"{self.device_count} devices (collapsed)")
+
+    def itemChange(self, change, value):
+        if change == QGraphicsItem.ItemPositionHasChanged:
+            for edge in self.edges:
+                edge.update_position()
+        return super().itemChange(change, value)
+
+    def mouseDoubleClickEvent(self, event):
+        if self.on_expand:
+            self.on_expand(self.boundary)
+            event.accept()
+            return
+        super().mouseDoubleClickEvent(event)
+
+
+class BundledEdgeItem(QGraphicsLineItem):
+    """One line standing in for all links between a collapsed boundary and another node."""
+
+    def __init__(self, source, target, count):
+        """Initialize the edge between two items (proxies or devices) carrying `count` links."""
+        super().__init__()
+        self.source = source
+        self.target = target
+        self.count = count
+
+        width = min(2 + 1.5 * math.log2(count), 10) if count > 1 else 2
+        pen = QPen(QColor(60, 60, 140), width, Qt.SolidLine, Qt.RoundCap)
+        self.setPen(pen)
+        self.setZValue(-1)
+        self.setToolTip(f"{count} links")
+
+        self.label = QGraphicsSimpleTextItem(str(count), self) if count > 1 else None
+        self.update_position()
+
+    def update_position(self):
+        """Follow the end points."""
+        start = self.source.sceneBoundingRect().center()
+        end = self.target.sceneBoundingRect().center()
+        self.setLine(QLineF(start, end))
+        if self.label:
+            mid = (start + end) / 2
+            rect = self.label.boundingRect()
+            self.label.setPos(mid - QPointF(rect.width() / 2, rect.height() / 2))
@@ -0,0 +1,87 @@
+import time
+
+from PyQt5.QtWidgets import QLabel
+from PyQt5.QtCore import Qt, QEvent, QTimer
+
+
+class FpsOverlay(QLabel):
+    """Small label over a graphics view that shows how many frames the viewport paints per second."""
+
+    UPDATE_INTERVAL_MS = 1000
+
+    def __init__(self, view, config=None):
+        """Initialize the overlay on top of `view`.
+
+        Args:
+            view: QGraphicsView whose viewport paints are counted
+            config: Optional ViewPerformanceConfig whose description is shown
+        """
+        # Parent to the view, not the viewport, so updating the label does not
+        # repaint the scene underneath it
+        super().__init__(view)
+        self.view = view
+        self.config = config
+
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setAutoFillBackground(True)
+        self.setStyleSheet("background-color: rgb(30, 30, 30); color: rgb(120, 255, 120);"
+                           "font-family: monospace; padding: 2px 6px;")
+        self.move(8, 8)
+
+        self._frames = 0
+        self._last_time = time.perf_counter()
+        self._watched_viewport = None
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.UPDATE_INTERVAL_MS)
+        self._timer.timeout.connect(self._update_text)
+
+        self.hide()
+
+    def set_enabled(self, enabled):
+        """Show or hide the overlay and start or stop counting frames."""
+        if enabled:
+            self._watch_viewport()
+            self._frames = 0
+            self._last_time = time.perf_counter()
+            self._update_text()
+            self._timer.start()
+            self.show()
+            self.raise_()
+        else:
+            self._timer.stop()
+            self.hide()
+
+    def _watch_viewport(self):
+        """Count paint events of the current viewport (it changes when OpenGL is toggled)."""
+        viewport = self.view.viewport()
+        if viewport is self._watched_viewport:
+            return
+        if self._watched_viewport is not None:
+            try:
+                self._watched_viewport.removeEventFilter(self)
+            except RuntimeError:
+                pass  # Old viewport was already deleted
+        viewport.installEventFilter(self)
+        self._watched_viewport = viewport
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            self._frames += 1
+        return False
+
+    def _update_text(self):
+        """Refresh the displayed frame rate."""
+        self._watch_viewport()
+
+        now = time.perf_counter()
+        elapsed = now - self._last_time
+        fps = self._frames / elapsed if elapsed > 0 else 0.0
+        self._frames = 0
+        self._last_time = now
+
+        text = f"{fps:5.1f} FPS  |  {len(self.view.scene().items())} items"
+        if self.config:
+            text += f"  |  {self.config.describe()}"
+        self.setText(text)
+        self.adjustSize()
@@ -0,0 +1,112 @@
+import time
+
+from PyQt5.QtWidgets import QLabel, QGraphicsScene
+from PyQt5.QtCore import Qt, QEvent, QTimer
+
+from utils.perf_counters import perf
+
+
+class PerfOverlay(QLabel):
+    """Label over a graphics view that shows hot-path timings from the perf registry."""
+
+    UPDATE_INTERVAL_MS = 1000
+
+    # (registry name, label) of the timed functions listed in the overlay
+    TIMERS = (
+        ('connection.update_path', "update_path"),
+        ('dispatcher.moves_received', "mouse moves received"),
+        ('dispatcher.dispatch', "EventDispatcher handlers"),
+    )
+
+    def __init__(self, view):
+        """Initialize the overlay on top of `view`."""
+        super().__init__(view)
+        self.view = view
+
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setAutoFillBackground(True)
+        self.setStyleSheet("background-color: rgb(30, 30, 30); color: rgb(255, 210, 120);"
+                           "font-family: monospace; padding: 2px 6px;")
+        # Below the FPS overlay
+        self.move(8, 40)
+
+        self._watched_viewport = None
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.UPDATE_INTERVAL_MS)
+        self._timer.timeout.connect(self._update_text)
+
+        self.hide()
+
+    def set_enabled(self, enabled):
+        """Show or hide the overlay; recording is only enabled while it is shown."""
+        perf.set_enabled(enabled)
+        if enabled:
+            self._watch_viewport()
+            self.setText("Collecting...")
+            self.adjustSize()
+            self._timer.start()
+            self.show()
+            self.raise_()
+        else:
+            self._timer.stop()
+            self.hide()
+
+    def _watch_viewport(self):
+        """Time paint events of the current viewport (it changes when OpenGL is toggled)."""
+        viewport = self.view.viewport()
+        if viewport is self._watched_viewport:
+            return
+        if self._watched_viewport is not None:
+            try:
+                self._watched_viewport.removeEventFilter(self)
+            except RuntimeError:
+                pass  # Old viewport was already deleted
+        viewport.installEventFilter(self)
+        self._watched_viewport = viewport
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and obj is self._watched_viewport and perf.enabled:
+            # Paint the frame here so all of it is timed. The scene cannot mark
+            # the start: with CacheBackground its drawBackground is skipped
+            start = time.perf_counter()
+            self.view.viewportEvent(event)
+            perf.add_time('scene.paint', time.perf_counter() - start)
+            return True
+        return False
+
+    def _update_text(self):
+        """Show the values recorded during the last interval."""
+        self._watch_viewport()
+        stats = perf.snapshot()
+        lines = []
+
+        paint = stats.get('scene.paint')
+        if paint:
+            painted = stats.get('scene.items_painted', {}).get('count', 0)
+            lines.append(f"paint        {paint['avg_ms']:7.2f} ms/frame  max {paint['max_ms']:7.2f} ms"
+                         f"  {painted / paint['count']:7.0f} items/frame")
+        else:
+            lines.append("paint        no frames painted")
+
+        for name, label in self.TIMERS:
+            stat = stats.get(name)
+            if stat:
+                lines.append(f"{label:26} {stat['per_second']:7.0f}/s  avg {stat['avg_ms']:6.3f} ms"
+                             f"  {stat['total_ms']:7.1f} ms total")
+            else:
+                lines.append(f"{label:26}       0/s")
+
+        lines.append(self._describe_index())
+        self.setText("\n".join(lines))
+        self.adjustSize()
+
+    def _describe_index(self):
+        """Describe the scene's item index."""
+        scene = self.view.scene()
+        if not scene:
+            return "scene index  no scene"
+        count = len(scene.items())
+        if scene.itemIndexMethod() == QGraphicsScene.BspTreeIndex:
+            return f"scene index  BSP depth {scene.bspTreeDepth()}, {count} items"
+        return f"scene index  none, {count} items"
@@ -0,0 +1,234 @@
+from PyQt5.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem
+from PyQt5.QtCore import Qt, QRectF, QPointF
+from PyQt5.QtGui import QPen, QBrush, QColor, QPolygonF, QPainterPath
+
+
+class PortIndicatorPainter:
+    """Caches and draws the port indicators of one device.
+
+    Ports are drawn as round points with a single drawPoints() call per
+    connection state instead of one QGraphicsEllipseItem per port. When the
+    view is zoomed out so far that ports would overlap, each port group is
+    drawn as one bar instead, so a 96-port chassis costs about the same as
+    a router. Used by PortIndicatorItem and by devices that paint themselves.
+    """
+
+    FREE_COLOR = QColor(100, 200, 100)
+    CONNECTED_COLOR = QColor(200, 100, 100)
+    OUTLINE_COLOR = QColor(0, 0, 0, 160)
+
+    # Indicator diameter in scene units
+    DIAMETER = 8.0
+
+    # Draw groups instead of ports when ports are closer than this on screen (pixels)
+    MIN_PIXEL_SPACING = 6.0
+
+    def __init__(self, device):
+        self.device = device
+        self._cache_key = None
+        self._free_points = QPolygonF()
+        self._connected_points = QPolygonF()
+        self._group_rects = []
+        self._min_spacing = float('inf')
+        self.bounds = QRectF()
+
+    def invalidate(self):
+        """Force the point lists to be rebuilt on next use."""
+        self._cache_key = None
+
+    def refresh(self, on_geometry_change=None):
+        """Rebuild the point lists when the layout, size or port state changed.
+
+        Args:
+            on_geometry_change (callable, optional): Called right before the
+                bounds change, e.g. the owning item's prepareGeometryChange
+        """
+        ports = self.device.ports
+        layout = ports.layout
+        width, height = self.device.width, self.device.height
+        key = (id(layout), width, height, bytes(ports.connected))
+        if key == self._cache_key:
+            return False
+
+        offsets, _ = layout.offsets(width, height)
+        free_points = QPolygonF()
+        connected_points = QPolygonF()
+        for (dx, dy), connected in zip(offsets, ports.connected):
+            if connected:
+                connected_points.append(QPointF(dx, dy))
+            else:
+                free_points.append(QPointF(dx, dy))
+
+        # Group bars, with the share of free ports used to color them
+        group_rects = []
+        min_spacing = float('inf')
+        for _, start, end in layout.groups:
+            group_offsets = offsets[start:end]
+            if not group_offsets:
+                continue
+            xs = [dx for dx, _ in group_offsets]
+            ys = [dy for _, dy in group_offsets]
+            rect = QRectF(min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys))
+            free = sum(1 for connected in ports.connected[start:end] if not connected)
+            group_rects.append((rect, free / (end - start)))
+
+            for (x1, y1), (x2, y2) in zip(group_offsets, group_offsets[1:]):
+                spacing = max(abs(x2 - x1), abs(y2 - y1))
+                if spacing > 0:
+                    min_spacing = min(min_spacing, spacing)
+
+        radius = self.DIAMETER / 2 + 1
+        bounds = QRectF()
+        for rect, _ in group_rects:
+            bounds = bounds.united(rect.adjusted(-radius, -radius, radius, radius))
+
+        self._cache_key = key
+        self._free_points = free_points
+        self._connected_points = connected_points
+        self._group_rects = group_rects
+        self._min_spacing = min_spacing
+
+        if bounds != self.bounds:
+            if on_geometry_change:
+                on_geometry_change()
+            self.bounds = bounds
+
+    def paint(self, painter):
+        """Draw the indicators in device coordinates.
+
+        The owner is expected to have called refresh() after layout changes;
+        connection state changes are picked up here.
+        """
+        self.refresh()
+
+        lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        if self._min_spacing * lod < self.MIN_PIXEL_SPACING:
+            # Zoomed out: one bar per port group
+            painter.setPen(QPen(self.OUTLINE_COLOR, 0))
+            for rect, free_share in self._group_rects:
+                color = self.FREE_COLOR if free_share > 0 else self.CONNECTED_COLOR
+                painter.setBrush(QBrush(color))
+                bar = rect.adjusted(-self.DIAMETER / 2, -self.DIAMETER / 2,
+                                    self.DIAMETER / 2, self.DIAMETER / 2)
+                painter.drawRoundedRect(bar, self.DIAMETER / 2, self.DIAMETER / 2)
+            return
+
+        # Round, wide pens turn each point into a filled dot
+        pen = QPen(self.FREE_COLOR, self.DIAMETER, Qt.SolidLine, Qt.RoundCap)
+        if len(self._free_points):
+            painter.setPen(pen)
+            painter.drawPoints(self._free_points)
+        if len(self._connected_points):
+            pen.setColor(self.CONNECTED_COLOR)
+            painter.setPen(pen)
+            painter.drawPoints(self._connected_points)
+
+
+class PortIndicatorItem(QGraphicsItem):
+    """Child item that draws all port indicators of a device in one paint call."""
+
+    def __init__(self, device):
+        """Initialize the indicator as a child of the device."""
+        super().__init__(device)
+        self.device = device
+        self.painter_cache = PortIndicatorPainter(device)
+
+        # Indicators are purely visual and must not steal clicks from the device
+        self.setAcceptedMouseButtons(Qt.NoButton)
+        self.setAcceptHoverEvents(False)
+        self.setZValue(1000)
+        self.setVisible(False)
+
+    def refresh(self):
+        """Schedule a repaint after ports were connected or the layout changed."""
+        self.painter_cache.invalidate()
+        self.painter_cache.refresh(self.prepareGeometryChange)
+        self.update()
+
+    def boundingRect(self):
+        return self.painter_cache.bounds
+
+    def paint(self, painter, option, widget=None):
+        self.painter_cache.paint(painter)
+
+
+class PortIndicatorOverlay(QGraphicsItem):
+    """One scene item drawing the port indicators of the devices near the cursor.
+
+    Used while a connection is being created: instead of turning on the
+    indicators of every device in the scene, the overlay asks the scene index
+    for the devices within RADIUS of the cursor and paints their ports in its
+    own paint() call. Painters are kept only for the devices currently near
+    the cursor, so the cost does not grow with the size of the diagram.
+    """
+
+    # Devices whose bounding rect comes this close to the cursor get indicators (scene units)
+    RADIUS = 200.0
+
+    def __init__(self, exclude=None, radius=None):
+        """Initialize the overlay.
+
+        Args:
+            exclude: Device that never gets indicators (e.g. the connection source)
+            radius (float, optional): Search radius in scene units
+        """
+        super().__init__()
+        self.exclude = exclude
+        self.radius = radius if radius is not None else self.RADIUS
+        self._painters = {}
+        self._devices = []
+        self._bounds = QRectF()
+
+        # Purely visual: no clicks, and an empty shape keeps it out of itemAt()
+        self.setAcceptedMouseButtons(Qt.NoButton)
+        self.setAcceptHoverEvents(False)
+        self.setZValue(1000)
+
+    def devices(self):
+        """Return the devices currently showing indicators."""
+        return list(self._devices)
+
+    def set_cursor(self, scene_pos):
+        """Move the search area to a scene position and pick the nearby devices."""
+        scene = self.scene()
+        if scene is None:
+            return
+
+        radius = self.radius
+        area = QRectF(scene_pos.x() - radius, scene_pos.y() - radius, 2 * radius, 2 * radius)
+        devices = []
+        for item in scene.items(area, Qt.IntersectsItemBoundingRect):
+            if item is self.exclude or not hasattr(item, 'set_port_indicators_visible'):
+                continue
+            if item.isVisible() and getattr(item, 'ports', None) is not None:
+                devices.append(item)
+
+        # Keep painters (and their cached point lists) only for nearby devices
+        painters = {}
+        bounds = QRectF()
+        for device in devices:
+            painter_cache = self._painters.get(device) or PortIndicatorPainter(device)
+            painter_cache.refresh()
+            painters[device] = painter_cache
+            bounds = bounds.united(device.sceneTransform().mapRect(painter_cache.bounds))
+
+        self._painters = painters
+        self._devices = devices
+        if bounds != self._bounds:
+            self.prepareGeometryChange()
+            self._bounds = bounds
+        self.update()
+
+    def boundingRect(self):
+        return self._bounds
+
+    def shape(self):
+        return QPainterPath()
+
+    def paint(self, painter, option, widget=None):
+        # The overlay sits at the scene origin, so device transforms apply directly
+        base = painter.worldTransform()
+        for device in self._devices:
+            painter.setWorldTransform(device.sceneTransform() * base)
+            self._painters[device].paint(painter)
+        painter.setWorldTransform(base)
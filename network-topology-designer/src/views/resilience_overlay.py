@@ -0,0 +1,77 @@
+from PyQt5.QtWidgets import QGraphicsItem
+from PyQt5.QtCore import Qt, QRectF, QLineF
+from PyQt5.QtGui import QPen, QBrush, QColor, QPainterPath
+
+
+class ResilienceOverlay(QGraphicsItem):
+    """One scene item highlighting single points of failure.
+
+    Articulation point devices get a halo and bridge connections a wide
+    band underneath. Everything is drawn in a single paint() call from the
+    current device positions, so the highlight costs one item however many
+    devices and links are marked.
+    """
+
+    HALO_COLOR = QColor(220, 30, 30, 90)
+    HALO_OUTLINE = QColor(220, 30, 30, 200)
+    BRIDGE_COLOR = QColor(220, 30, 30, 120)
+
+    # Halo margin around a device and bridge band width (scene units)
+    HALO_MARGIN = 10.0
+    BRIDGE_WIDTH = 10.0
+
+    def __init__(self):
+        super().__init__()
+        self._devices = []
+        self._connections = []
+        self._bounds = QRectF()
+
+        # Purely visual: no clicks, and an empty shape keeps it out of itemAt()
+        self.setAcceptedMouseButtons(Qt.NoButton)
+        self.setAcceptHoverEvents(False)
+        # Above the connections, below the devices
+        self.setZValue(-0.5)
+
+    def set_targets(self, devices, connections):
+        """Highlight these articulation point devices and bridge connections."""
+        self._devices = list(devices)
+        self._connections = [connection for connection in connections
+                             if getattr(connection, 'source_device', None) is not None
+                             and getattr(connection, 'target_device', None) is not None]
+        self.refresh()
+
+    def refresh(self):
+        """Follow the highlighted items after they moved."""
+        margin = self.HALO_MARGIN + 2
+        bounds = QRectF()
+        for device in self._devices:
+            bounds = bounds.united(device.sceneBoundingRect().adjusted(-margin, -margin, margin, margin))
+        for line in self._bridge_lines():
+            rect = QRectF(line.p1(), line.p2()).normalized()
+            half = self.BRIDGE_WIDTH / 2
+            bounds = bounds.united(rect.adjusted(-half, -half, half, half))
+
+        if bounds != self._bounds:
+            self.prepareGeometryChange()
+            self._bounds = bounds
+        self.update()
+
+    def _bridge_lines(self):
+        return [QLineF(connection.source_device.scenePos(), connection.target_device.scenePos())
+                for connection in self._connections]
+
+    def boundingRect(self):
+        return self._bounds
+
+    def shape(self):
+        return QPainterPath()
+
+    def paint(self, painter, option, widget=None):
+        painter.setPen(QPen(self.BRIDGE_COLOR, self.BRIDGE_WIDTH, Qt.SolidLine, Qt.RoundCap))
+        painter.drawLines(self._bridge_lines())
+
+        margin = self.HALO_MARGIN
+        painter.setPen(QPen(self.HALO_OUTLINE, 0))
+        painter.setBrush(QBrush(self.HALO_COLOR))
+        for device in self._devices:
+            painter.drawEllipse(device.sceneBoundingRect().adjusted(-margin, -margin, margin, margin))
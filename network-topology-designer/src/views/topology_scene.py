@@ -1,6 +1,7 @@
 from PyQt5.QtWidgets import QGraphicsScene
-from PyQt5.QtCore import pyqtSignal, Qt
+from PyQt5.QtCore import pyqtSignal, Qt, QRectF
 from PyQt5.QtGui import QPen, QColor
+from utils.perf_counters import perf
 
 class TopologyScene(QGraphicsScene):
     """Custom scene for the network topology."""
@@ -10,33 +11,97 @@ class TopologyScene(QGraphicsScene):
     mouse_move_signal = pyqtSignal(object)
     mouse_release_signal = pyqtSignal(object)
     
+    # Emitted with an item whose scene geometry changed: added, removed,
+    # moved or resized. Used to invalidate cached spatial queries.
+    geometry_changed = pyqtSignal(object)
+    
+    # Initial scene rect; it grows as items are added or moved beyond it
+    INITIAL_RECT = QRectF(-2000, -2000, 4000, 4000)
+    
+    # Extra room added around an item that falls outside the scene rect
+    GROWTH_MARGIN = 1000
+    
     def __init__(self):
         super().__init__()
-        self.setSceneRect(-2000, -2000, 4000, 4000)
+        self.setSceneRect(self.INITIAL_RECT)
+        
+        # EventDispatcher receiving mouse events directly (see attach())
+        self.event_dispatcher = None
+        
+        # SnapController used by devices while they are dragged
+        self.snap_controller = None
         print("TopologyScene initialized")
     
+    def addItem(self, item):
+        """Add an item, growing the scene rect if it lies outside it."""
+        super().addItem(item)
+        self.notify_geometry_changed(item)
+    
+    def removeItem(self, item):
+        """Remove an item and report the change to cached spatial queries."""
+        super().removeItem(item)
+        self.geometry_changed.emit(item)
+    
+    def notify_geometry_changed(self, item):
+        """Called by items after they moved or resized."""
+        self.ensure_rect_contains(item.sceneBoundingRect())
+        self.geometry_changed.emit(item)
+    
+    def ensure_rect_contains(self, rect):
+        """Grow the scene rect (never shrink it) so that it contains `rect`."""
+        scene_rect = self.sceneRect()
+        if scene_rect.contains(rect):
+            return
+        
+        margin = self.GROWTH_MARGIN
+        self.setSceneRect(scene_rect.united(rect.adjusted(-margin, -margin, margin, margin)))
+    
     def mousePressEvent(self, event):
         """Handle mouse press events."""
-        # Emit our custom signal
-        self.mouse_press_signal.emit(event)
+        if self.event_dispatcher is not None:
+            self.event_dispatcher.mouse_press(event)
+        # Only pay for the signal when something is connected to it
+        if self.receivers(self.mouse_press_signal):
+            self.mouse_press_signal.emit(event)
         # Let the parent class handle the event too
         super().mousePressEvent(event)
     
     def mouseMoveEvent(self, event):
         """Handle mouse move events."""
-        # Emit our custom signal
-        self.mouse_move_signal.emit(event)
+        if self.event_dispatcher is not None:
+            self.event_dispatcher.mouse_move(event)
+        # Only pay for the signal when something is connected to it
+        if self.receivers(self.mouse_move_signal):
+            self.mouse_move_signal.emit(event)
         # Let the parent class handle the event too
         super().mouseMoveEvent(event)
     
     def mouseReleaseEvent(self, event):
         """Handle mouse release events."""
-        # Emit our custom signal
-        self.mouse_release_signal.emit(event)
+        if self.event_dispatcher is not None:
+            self.event_dispatcher.mouse_release(event)
+        # Only pay for the signal when something is connected to it
+        if self.receivers(self.mouse_release_signal):
+            self.mouse_release_signal.emit(event)
         # Let the parent class handle the event too
         super().mouseReleaseEvent(event)
         
+        # The drag is over, so are its alignment guides
+        if self.snap_controller is not None:
+            self.snap_controller.end_drag()
+        
     def drawBackground(self, painter, rect):
         """Override to prevent grid drawing."""
         # Just fill with background color
-        painter.fillRect(rect, self.backgroundBrush())
\ No newline at end of file
+        painter.fillRect(rect, self.backgroundBrush())
+    
+    def drawForeground(self, painter, rect):
+        """Draw snap guides; count the items painted while profiling.
+        
+        The frame itself is timed by the PerfOverlay around the viewport's paint event.
+        """
+        if self.snap_controller is not None:
+            self.snap_controller.paint_guides(painter)
+        
+        if perf.enabled:
+            perf.increment('scene.items_painted', len(self.items(rect)))
\ No newline at end of file